@@ -0,0 +1,91 @@
+"""
+เทียบ route_message (regex รวมตัวเดียว) กับลูป TOPIC_PATTERNS แบบเดิม บนชุดข้อความภาษาไทย
+
+    python -m benchmarks.bench_topic_router
+"""
+import logging
+import re
+import timeit
+from typing import Optional
+
+from modules.nlp.message_matcher import TOPIC_PATTERNS, route_message
+
+# ข้อความตัวอย่าง: ส่วนใหญ่เป็นแชททั่วไป (ไม่ match อะไร) ปนคำถาม feature
+CORPUS = [
+    "สวัสดีครับพี่หลาม วันนี้เป็นไงบ้าง",
+    "ช่วยอธิบายเรื่อง machine learning แบบง่าย ๆ ให้หน่อยได้ไหม",
+    "เมื่อวานไปกินชาบูมา อร่อยมาก แต่แพงไปหน่อย พี่หลามชอบกินอะไร",
+    "ทำไมท้องฟ้าถึงเป็นสีฟ้า",
+    "เขียนโค้ด python สำหรับอ่านไฟล์ csv ให้หน่อย",
+    "แนะนำหนังสยองขวัญสนุก ๆ ให้หน่อย ขอแบบไม่ตุ้งแช่เยอะ",
+    "เบื่อมากเลย งานเยอะ ไม่อยากทำอะไรแล้ว",
+    "ราคาทองวันนี้เท่าไหร่",
+    "ทองขึ้นหรือทองลง",
+    "อยากรู้ราคาน้ำมันวันนี้",
+    "ดีเซลลิตรละเท่าไหร่",
+    "หวยออกยัง",
+    "ช่วยตรวจหวยให้หน่อย",
+    "อัตราแลกเปลี่ยนเงินดอลลาร์",
+    "อากาศที่ เชียงใหม่",
+    "พยากรณ์อากาศจังหวัด ขอนแก่น",
+    "ข่าววันนี้มีอะไรบ้าง",
+    "ข่าวต่างประเทศล่าสุด",
+    "ขอสรุปข่าวหน่อย",
+    "ดูดวงหน่อย",
+    "ความรัก",
+    "การเงิน",
+    "ดูรูป: แมวส้ม",
+    "ขอรูปทะเลสวย ๆ",
+    "วันนี้วันอะไร",
+    "ตอนนี้กี่โมงแล้ว",
+    "ช่วยสรุปหนังสือ atomic habits ให้หน่อย ยาว ๆ เลยนะ " * 3,
+]
+
+def legacy_route(text: str) -> Optional[str]:
+    """ลำดับการตัดสินใจแบบเดิมใน match_topic + on_message"""
+    text = text.strip().lower()
+    for topic, patterns in TOPIC_PATTERNS.items():
+        for pattern in patterns:
+            if pattern.search(text):
+                logging.getLogger("pheelarm").info(f"✅ หัวข้อที่ match: '{topic}' ด้วย pattern '{pattern.pattern}'")
+                return topic
+    logging.getLogger("pheelarm").info("❌ ไม่พบหัวข้อที่ match กับข้อความ")
+    if text in ["ความรัก", "การงาน", "การเงิน", "สุขภาพ"]:
+        return "tarot_reading"
+    if any(kw in text for kw in ["วันนี้วันอะไร", "วันอะไรวันนี้"]):
+        return "date"
+    if any(kw in text for kw in ["กี่โมง", "เวลากี่โมง"]):
+        return "time"
+    return None
+
+def legacy_args(text: str, topic: Optional[str]) -> dict:
+    lowered = text.strip().lower()
+    if topic == "image":
+        return {"query": re.sub(r"^(ดูรูป|ค้นรูป|หารูป|ขอรูป)[:,\s]*", "", lowered)}
+    if topic == "weather":
+        match = re.search(r"(ที่|จังหวัด|เมือง)\s+(.+)", lowered)
+        return {"city": match.group(2).strip()} if match else {}
+    if topic == "tarot_reading":
+        return {"tarot_topic": lowered}
+    return {}
+
+def main(number: int = 2000) -> None:
+    # ปิด handler กันเวลาไปวัด I/O ของ stderr แต่ยังจ่ายค่า format log แบบเดิม
+    logging.getLogger("pheelarm").handlers = [logging.NullHandler()]
+    logging.getLogger().handlers = [logging.NullHandler()]
+
+    for text in CORPUS:
+        route = route_message(text)
+        expected = legacy_route(text)
+        assert route.topic == expected, f"{text!r}: {route.topic} != {expected}"
+        assert route.args == legacy_args(text, expected), f"{text!r}: {route.args}"
+
+    legacy = timeit.timeit(lambda: [legacy_args(t, legacy_route(t)) for t in CORPUS], number=number)
+    compiled = timeit.timeit(lambda: [route_message(t) for t in CORPUS], number=number)
+    per_msg = 1e6 / (number * len(CORPUS))
+    print(f"messages: {len(CORPUS)} x {number}")
+    print(f"legacy loop   : {legacy * per_msg:8.2f} µs/msg")
+    print(f"route_message : {compiled * per_msg:8.2f} µs/msg  ({legacy / compiled:.1f}x)")
+
+if __name__ == "__main__":
+    main()
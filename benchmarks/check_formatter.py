@@ -0,0 +1,59 @@
+"""
+ตรวจ formatter กับชุดคำตอบตัวอย่าง (golden output) แล้ววัดความเร็ว
+
+    python -m benchmarks.check_formatter
+
+expected ในแต่ละเคสคือผลของ pipeline เดิม (finalize_openai_text + prepare_reply)
+ยกเว้นเคสที่มี "note" ซึ่งของเดิมทำข้อความพัง (code block, ตาราง, ย่อหน้า) และตั้งใจแก้
+นอกจากเทียบผลแล้วยังเช็กว่า format ซ้ำได้ผลเดิม และ feed ทีละชิ้นแบบ stream ได้ผลเท่ากัน
+"""
+import json
+import random
+import sys
+import timeit
+from pathlib import Path
+
+from modules.utils.cleaner import ReplyFormatter, format_reply
+
+FIXTURE = Path(__file__).parent / "fixtures" / "format_golden.json"
+
+def _stream(text: str, strip_links: bool, rng: random.Random) -> str:
+    formatter = ReplyFormatter(strip_links)
+    index = 0
+    while index < len(text):
+        size = rng.randint(1, 12)
+        formatter.feed(text[index:index + size])
+        formatter.preview()
+        index += size
+    return formatter.finish()
+
+def check(cases) -> int:
+    rng = random.Random(0)
+    failures = 0
+    for case in cases:
+        text, strip_links, expected = case["input"], case["strip_links"], case["expected"]
+        output = format_reply(text, strip_links)
+        problems = []
+        if output != expected:
+            problems.append(f"output\n--- expected\n{expected}\n--- got\n{output}")
+        if format_reply(output, strip_links) != output:
+            problems.append("ไม่ idempotent")
+        if any(_stream(text, strip_links, rng) != output for _ in range(20)):
+            problems.append("stream ได้ผลไม่เท่ากับ format ทีเดียว")
+        if problems:
+            failures += 1
+            print(f"❌ {case['name']}: " + "\n".join(problems))
+    return failures
+
+def main():
+    cases = json.loads(FIXTURE.read_text(encoding="utf-8"))
+    failures = check(cases)
+    print(f"✅ ผ่าน {len(cases) - failures}/{len(cases)} เคส")
+
+    number = 200
+    seconds = timeit.timeit(lambda: [format_reply(c["input"], c["strip_links"]) for c in cases], number=number)
+    print(f"⏱️ format_reply: {seconds / (number * len(cases)) * 1e6:.1f} µs/ข้อความ")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,540 @@
+"""
+load test ของ on_message ทั้ง pipeline โดยไม่แตะบริการจริง
+
+    python -m benchmarks.load_test --messages 400 --concurrency 40
+    python -m benchmarks.load_test --openai-latency 1.5 --json after.json --compare before.json
+
+ของที่ใช้แทนบริการจริง:
+- Discord: message/channel ปลอม บันทึกเวลาที่ผู้ใช้เห็นข้อความแรก (reply หรือ reaction)
+- Redis: fakeredis ในหน่วยความจำ
+- OpenAI: HTTP server ในเครื่อง (aiohttp) ตั้ง latency/ความเร็ว stream/อัตรา error ได้
+- feature API ทุกตัวใน modules/features: ตอบข้อมูลสำเร็จรูปผ่าน httpx.MockTransport (init_http_client)
+
+รายงาน throughput, latency p50/p95/p99 แยกตามประเภทข้อความ และจำนวน call ไปแต่ละ upstream
+บันทึกผลเป็น JSON แล้วเทียบกับรอบก่อนได้ (--json / --compare)
+
+ต้องติดตั้ง fakeredis เพิ่ม: pip install -r requirements-dev.txt (aiohttp มากับ discord.py แล้ว)
+tiktoken ต้องโหลดไฟล์ encoding จากเน็ตครั้งแรก — เครื่องที่ไม่มีเน็ตให้ตั้ง TIKTOKEN_CACHE_DIR ไปที่ cache ที่โหลดไว้
+ถ้าโหลดไม่ได้จะนับ token แบบประมาณ (~3 ตัวอักษรต่อ token) แทน ตัวเลข latency ยังเทียบกันได้แต่ไม่ตรงกับของจริงเป๊ะ
+ค่า default ปิด rate limit ต่อห้องของ outbound ไว้ เพราะทุกข้อความอยู่ห้องเดียว (CHANNEL_ID) จะวัดได้แค่การรอคิว Discord
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# ⚠️ ต้องตั้งก่อน import modules ของบอท (config/Settings อ่านตอน import) — ค่าปลอมทั้งหมด ไม่มีอะไรออกไปข้างนอก
+os.environ.update(
+    DISCORD_TOKEN="load-test",
+    OPENAI_API_KEY="sk-load-test",
+    OPENWEATHER_API_KEY="load-test",
+    GOOGLE_API_KEY="load-test",
+    GOOGLE_CSE_ID="load-test",
+    SCHEDULER_ENABLED="false",
+)
+
+import fakeredis.aioredis
+import httpx
+from aiohttp import web
+
+# 💬 ข้อความตัวอย่างแยกตามประเภท (ตรวจตอนเริ่มว่า route ไปหัวข้อที่คาดไว้จริง)
+MESSAGE_MIX: Dict[str, List[str]] = {
+    "chat": [
+        "สวัสดีครับพี่หลาม วันนี้เป็นไงบ้าง",
+        "ช่วยอธิบายเรื่อง machine learning แบบง่าย ๆ ให้หน่อยได้ไหม",
+        "แมวกินช็อกโกแลตได้ไหม",
+        "เขียนโค้ด python สำหรับอ่านไฟล์ csv ให้หน่อย",
+        "แนะนำหนังสยองขวัญสนุก ๆ ให้หน่อย ขอแบบไม่ตุ้งแช่เยอะ",
+        "เบื่อมากเลย งานเยอะ ไม่อยากทำอะไรแล้ว",
+        "เมื่อกี้พี่หลามบอกว่าอะไรนะ ขยายความหน่อย",
+        "ช่วยสรุปหนังสือ atomic habits ให้หน่อย",
+        "ทำไมต้องดื่มน้ำวันละแปดแก้ว",
+        "อยากเริ่มวิ่งตอนเช้า ควรเริ่มยังไงดี",
+    ],
+    "gold": ["ราคาทองวันนี้เท่าไหร่", "ทองขึ้นหรือทองลง", "ราคาทองคำแท่งวันนี้"],
+    "news": ["ข่าววันนี้มีอะไรบ้าง", "ข่าวล่าสุด", "ข่าวต่างประเทศล่าสุด"],
+    "tarot": ["ความรัก", "การงาน", "การเงิน 5 ใบ", "สุขภาพ 10 ใบ"],
+    "image": ["ดูรูป: แมวส้ม", "ขอรูปทะเลสวย ๆ", "หารูปภูเขาไฟฟูจิ"],
+}
+EXPECTED_ROUTES = {
+    "chat": {None},
+    "gold": {"gold"},
+    "news": {"news", "global_news"},
+    "tarot": {"tarot_reading"},
+    "image": {"image"},
+}
+DEFAULT_WEIGHTS = {"chat": 50, "gold": 15, "news": 10, "tarot": 15, "image": 10}
+QUIET_SECONDS = 1.0
+
+CHAT_ANSWER = (
+    "ได้เลย! เรื่องนี้สรุปสั้น ๆ แบบนี้นะ\n\n"
+    "**ประเด็นหลัก**\n"
+    "* เริ่มจากพื้นฐานก่อน ค่อย ๆ ทำความเข้าใจทีละขั้น\n"
+    "* ลองลงมือทำจริงวันละนิด จะเห็นผลเร็วกว่าอ่านอย่างเดียว\n"
+    "* ถ้าติดตรงไหนถามพี่หลามต่อได้เลย\n\n"
+    "สุดท้ายแล้วความสม่ำเสมอสำคัญกว่าความเร็ว ค่อย ๆ ไปด้วยกันนะ 😊"
+)
+
+# ---------------------------------------------------------------------------
+# 🤖 OpenAI ปลอม
+# ---------------------------------------------------------------------------
+
+class MockOpenAI:
+    """/v1/chat/completions แบบ stream และไม่ stream ตอบหลังรอ latency (สุ่ม ±jitter)"""
+
+    def __init__(self, latency: float, jitter: float, chunk_interval: float, error_rate: float, rng: random.Random):
+        self.latency = latency
+        self.jitter = jitter
+        self.chunk_interval = chunk_interval
+        self.error_rate = error_rate
+        self.rng = rng
+        self.calls: Counter = Counter()
+        self._runner: Optional[web.AppRunner] = None
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self._completions)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/v1"
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+
+    def _content(self, body: Dict) -> str:
+        if body.get("response_format", {}).get("type") == "json_object":
+            # สรุปข่าวแบบ batch: ตอบครบทุก [n] ที่ส่งมา
+            count = body["messages"][-1]["content"].count("\n[")
+            return json.dumps(
+                {"summaries": [{"id": i, "summary": f"สรุปข่าวที่ {i} แบบสั้น ๆ เข้าใจง่าย"} for i in range(1, count + 1)]},
+                ensure_ascii=False,
+            )
+        return CHAT_ANSWER
+
+    async def _completions(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        stream = bool(body.get("stream"))
+        self.calls["requests"] += 1
+        self.calls["stream" if stream else "non_stream"] += 1
+        self.calls[f"model:{body.get('model')}"] += 1
+
+        await asyncio.sleep(max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter)))
+        if self.rng.random() < self.error_rate:
+            self.calls["errors_injected"] += 1
+            return web.json_response({"error": {"message": "mock overload", "type": "server_error"}}, status=500)
+
+        content = self._content(body)
+        usage = {"prompt_tokens": 200, "completion_tokens": len(content) // 3, "total_tokens": 200 + len(content) // 3}
+        base = {"id": f"chatcmpl-{self.calls['requests']}", "created": int(time.time()), "model": body.get("model")}
+        if not stream:
+            return web.json_response({
+                **base,
+                "object": "chat.completion",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": usage,
+            })
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+
+        async def event(payload) -> None:
+            data = payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False)
+            await response.write(f"data: {data}\n\n".encode())
+
+        pieces = [content[i:i + 12] for i in range(0, len(content), 12)]
+        for index, piece in enumerate(pieces):
+            delta = {"role": "assistant", "content": piece} if index == 0 else {"content": piece}
+            await event({**base, "object": "chat.completion.chunk",
+                         "choices": [{"index": 0, "delta": delta, "finish_reason": None}]})
+            await asyncio.sleep(self.chunk_interval)
+        await event({**base, "object": "chat.completion.chunk",
+                     "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        if body.get("stream_options", {}).get("include_usage"):
+            await event({**base, "object": "chat.completion.chunk", "choices": [], "usage": usage})
+        await event("[DONE]")
+        await response.write_eof()
+        return response
+
+# ---------------------------------------------------------------------------
+# 🌐 feature API ปลอม (ต่อเข้า http client กลางของบอท)
+# ---------------------------------------------------------------------------
+
+NEWS_RSS = (
+    '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+    + "".join(
+        f"<item><title>ข่าวทดสอบที่ {i}</title><link>https://news.example.com/{i}</link>"
+        f"<description>&lt;p&gt;รายละเอียดข่าวทดสอบที่ {i}&lt;/p&gt;</description></item>"
+        for i in range(1, 6)
+    )
+    + "</channel></rss>"
+)
+
+FEATURE_RESPONSES = {
+    "api.chnwt.dev": {"status": "success", "response": {
+        "date": "18 ตุลาคม 2569", "update_time": "09:30",
+        "price": {"gold": {"buy": "41,500", "sell": "42,100"}, "gold_bar": {"buy": "41,400", "sell": "41,600"}},
+    }},
+    "oil-price.bangchak.co.th": [{"OilList": json.dumps([
+        {"OilName": "แก๊สโซฮอล์ 95 S EVO", "PriceToday": "35.45"},
+        {"OilName": "แก๊สโซฮอล์ 91 S EVO", "PriceToday": "35.08"},
+        {"OilName": "ไฮดีเซล S", "PriceToday": "32.94"},
+    ], ensure_ascii=False)}],
+    "lotto.api.rayriffy.com": {"response": {
+        "date": "16 ตุลาคม 2569",
+        "prizes": [{"id": "prizeFirst", "number": ["123456"]}],
+        "runningNumbers": [
+            {"id": "runningNumberFrontThree", "number": ["123", "456"]},
+            {"id": "runningNumberBackThree", "number": ["789", "012"]},
+            {"id": "runningNumberBackTwo", "number": ["34"]},
+        ],
+    }},
+    "open.er-api.com": {"result": "success", "rates": {"USD": 0.0298, "EUR": 0.0274, "JPY": 4.41, "CNY": 0.2135}},
+    "api.openweathermap.org": {
+        "weather": [{"description": "ฝนฟ้าคะนองเล็กน้อย"}], "main": {"temp": 31.4, "humidity": 72}, "wind": {"speed": 3.2},
+    },
+}
+
+class FeatureStubs:
+    """handler ของ httpx.MockTransport: ตอบตาม host หลังรอ latency และนับ call"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls: Counter = Counter()
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        await asyncio.sleep(self.latency)
+        if host == "news.google.com":
+            self.calls[host] += 1
+            return httpx.Response(200, text=NEWS_RSS, headers={"Content-Type": "application/rss+xml"})
+        if host == "www.googleapis.com":
+            kind = "image" if request.url.params.get("searchType") == "image" else "web"
+            self.calls[f"{host}:{kind}"] += 1
+            query = request.url.params.get("q", "")
+            items = [
+                {"title": f"{query} #{i}", "snippet": f"ข้อมูลเกี่ยวกับ {query}",
+                 "link": f"https://img.example.com/{i}.jpg" if kind == "image" else f"https://example.com/{i}"}
+                for i in range(1, 4)
+            ]
+            return httpx.Response(200, json={"items": items})
+        if host in FEATURE_RESPONSES:
+            self.calls[host] += 1
+            return httpx.Response(200, json=FEATURE_RESPONSES[host])
+        self.calls[f"unknown:{host}"] += 1
+        return httpx.Response(404, json={"error": "no stub"})
+
+# ---------------------------------------------------------------------------
+# 💬 Discord ปลอม
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Timing:
+    label: str
+    started: float
+    first_visible: Optional[float] = None
+    finished: Optional[float] = None
+    error: Optional[str] = None
+
+class Recorder:
+    def __init__(self):
+        self.timings: Dict[int, Timing] = {}
+        self.discord: Counter = Counter()
+
+    def visible(self, message_id: int) -> None:
+        timing = self.timings.get(message_id)
+        if timing and timing.first_visible is None:
+            timing.first_visible = time.perf_counter()
+
+class _Typing:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+@dataclass
+class FakeUser:
+    id: int
+    bot: bool = False
+
+@dataclass
+class FakeMessage:
+    id: int
+    content: str
+    author: FakeUser
+    channel: "FakeChannel"
+    reactions: List[str] = field(default_factory=list)
+
+    async def reply(self, content: str, **kwargs) -> "FakeMessage":
+        return await self.channel.send(content, reference=self)
+
+    async def edit(self, content: str, **kwargs) -> "FakeMessage":
+        await self.channel.api_call("edits")
+        self.content = content
+        return self
+
+    async def delete(self) -> None:
+        await self.channel.api_call("deletes")
+
+    async def add_reaction(self, emoji: str) -> None:
+        await self.channel.api_call("reactions")
+        self.reactions.append(emoji)
+        self.channel.recorder.visible(self.id)
+
+class FakeChannel:
+    def __init__(self, channel_id: int, recorder: Recorder, latency: float, ids):
+        self.id = channel_id
+        self.recorder = recorder
+        self.latency = latency
+        self._ids = ids
+        self.bot_user = FakeUser(0, bot=True)
+
+    async def api_call(self, kind: str) -> None:
+        self.recorder.discord[kind] += 1
+        await asyncio.sleep(self.latency)
+
+    async def send(self, content: str, reference: Optional[FakeMessage] = None, **kwargs) -> FakeMessage:
+        await self.api_call("sends")
+        if reference is not None:
+            self.recorder.visible(reference.id)
+        return FakeMessage(next(self._ids), content, self.bot_user, self)
+
+    def typing(self) -> _Typing:
+        self.recorder.discord["typing"] += 1
+        return _Typing()
+
+class ApproxEncoding:
+    """แทน encoding ของ tiktoken ตอนไม่มีเน็ต: ~3 ตัวอักษรต่อ token เหมือน usage ของ MockOpenAI"""
+
+    def encode(self, text: str) -> range:
+        return range((len(text) + 2) // 3)
+
+# ---------------------------------------------------------------------------
+# 📊 รายงาน
+# ---------------------------------------------------------------------------
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+def summarize(timings: List[Timing]) -> Dict[str, Dict]:
+    by_label: Dict[str, List[Timing]] = defaultdict(list)
+    for timing in timings:
+        by_label[timing.label].append(timing)
+        by_label["ALL"].append(timing)
+
+    topics = {}
+    for label, items in by_label.items():
+        first = [t.first_visible - t.started for t in items if t.first_visible is not None]
+        done = [t.finished - t.started for t in items if t.finished is not None]
+        topics[label] = {
+            "n": len(items),
+            "errors": sum(t.error is not None for t in items),
+            "no_reply": sum(t.first_visible is None for t in items),
+            **{f"first_p{p}": percentile(first, p) for p in (50, 95, 99)},
+            **{f"done_p{p}": percentile(done, p) for p in (50, 95, 99)},
+        }
+    return topics
+
+def _ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value * 1000:.0f}"
+
+def print_report(result: Dict) -> None:
+    print(
+        f"\n📊 {result['messages']} ข้อความ ใน {result['wall_seconds']:.2f}s "
+        f"→ {result['throughput']:.1f} msg/s (concurrency {result['config']['concurrency']})"
+    )
+    print("   latency (ms): first = ผู้ใช้เห็นข้อความแรก, done = on_message จบ")
+    print(f"   {'topic':<7}{'n':>6}{'err':>5}{'none':>6}"
+          f"{'first p50':>11}{'p95':>7}{'p99':>7}{'done p50':>10}{'p95':>7}{'p99':>7}")
+    for label in sorted(result["topics"], key=lambda name: (name == "ALL", name)):
+        row = result["topics"][label]
+        print(
+            f"   {label:<7}{row['n']:>6}{row['errors']:>5}{row['no_reply']:>6}"
+            f"{_ms(row['first_p50']):>11}{_ms(row['first_p95']):>7}{_ms(row['first_p99']):>7}"
+            f"{_ms(row['done_p50']):>10}{_ms(row['done_p95']):>7}{_ms(row['done_p99']):>7}"
+        )
+    for name, counts in result["upstream"].items():
+        print(f"🔌 {name}: " + ", ".join(f"{key}={value}" for key, value in sorted(counts.items())))
+
+def print_comparison(result: Dict, baseline: Dict) -> None:
+    print(f"\n🆚 เทียบกับ baseline ({baseline['config'].get('label') or 'ไม่มีชื่อ'})")
+    print(f"   throughput: {baseline['throughput']:.1f} → {result['throughput']:.1f} msg/s")
+    for label, row in sorted(result["topics"].items()):
+        old = baseline["topics"].get(label)
+        if not old:
+            continue
+        cells = []
+        for key in ("first_p95", "done_p95"):
+            before, after = old.get(key), row.get(key)
+            if before and after:
+                cells.append(f"{key} {_ms(before)}→{_ms(after)}ms ({(after - before) / before:+.0%})")
+        print(f"   {label:<7}" + "  ".join(cells))
+    for name, counts in result["upstream"].items():
+        old = baseline["upstream"].get(name, {})
+        changed = {key: (old.get(key, 0), value) for key, value in counts.items() if old.get(key, 0) != value}
+        if changed:
+            print(f"   {name}: " + ", ".join(f"{key} {a}→{b}" for key, (a, b) in sorted(changed.items())))
+
+# ---------------------------------------------------------------------------
+# 🏃 ตัวรัน
+# ---------------------------------------------------------------------------
+
+def parse_mix(text: Optional[str]) -> Dict[str, int]:
+    if not text:
+        return dict(DEFAULT_WEIGHTS)
+    weights = {}
+    for part in text.split(","):
+        label, _, weight = part.partition("=")
+        if label not in MESSAGE_MIX:
+            raise SystemExit(f"❌ ไม่รู้จักประเภทข้อความ '{label}' (มี {', '.join(MESSAGE_MIX)})")
+        weights[label] = int(weight)
+    return weights
+
+def build_workload(count: int, weights: Dict[str, int], users: int, rng: random.Random):
+    labels = rng.choices(list(weights), weights=list(weights.values()), k=count)
+    return [(label, rng.choice(MESSAGE_MIX[label]), rng.randrange(1, users + 1)) for label in labels]
+
+async def run(args) -> Dict:
+    rng = random.Random(args.seed)
+
+    from modules.core.http_client import init_http_client, close_http_client
+    from modules.core.openai_client import client as openai_client, openai_scheduler
+    from modules.nlp.message_matcher import route_message
+    from modules.utils.discord_utils import outbound
+    from modules.utils import token_counter
+    import main as bot_main
+
+    if not args.verbose:
+        # logger ของบอทตั้ง basicConfig ตอน import → ต้องลดระดับหลัง import
+        logging.getLogger().setLevel(logging.ERROR)
+        logging.getLogger("pheelarm").setLevel(logging.ERROR)
+
+    # tiktoken โหลดไฟล์ encoding จากเน็ตครั้งแรกแล้ว cache ไว้ — โหลดไม่ได้ใช้ตัวนับแบบประมาณแทน ไม่งั้นทุกข้อความพังตั้งแต่นับ token
+    try:
+        token_counter.get_encoding()
+    except Exception as e:
+        print(f"⚠️ โหลด encoding ของ tiktoken ไม่ได้ ({e}) นับ token แบบประมาณแทน — ตั้ง TIKTOKEN_CACHE_DIR เพื่อใช้ของจริง", file=sys.stderr)
+        token_counter.get_encoding = lambda model="gpt-4o-mini": ApproxEncoding()
+
+    for label, texts in MESSAGE_MIX.items():
+        for text in texts:
+            topic = route_message(text).topic
+            assert topic in EXPECTED_ROUTES[label], f"{text!r} ({label}) ไป route '{topic}'"
+
+    openai_mock = MockOpenAI(args.openai_latency, args.openai_jitter, args.stream_interval, args.openai_error_rate, rng)
+    openai_client.base_url = await openai_mock.start()
+    features = FeatureStubs(args.feature_latency)
+    await close_http_client()
+    await init_http_client(httpx.MockTransport(features))
+    bot_main.redis_instance = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    if not args.discord_pacing:
+        outbound.messages_per_window = sys.maxsize
+
+    recorder = Recorder()
+    ids = itertools.count(10_000)
+    channel = FakeChannel(bot_main.CHANNEL_ID, recorder, args.discord_latency, ids)
+    workload = build_workload(args.messages, parse_mix(args.mix), args.users, rng)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(label: str, text: str, user_id: int) -> None:
+        async with semaphore:
+            message = FakeMessage(next(ids), text, FakeUser(user_id), channel)
+            timing = Timing(label, time.perf_counter())
+            recorder.timings[message.id] = timing
+            try:
+                await bot_main.on_message(message)
+            except Exception as e:
+                timing.error = f"{type(e).__name__}: {e}"
+            timing.finished = time.perf_counter()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(*item) for item in workload))
+    wall = time.perf_counter() - started
+
+    # งานเบื้องหลัง (เช่น สรุปไพ่จาก GPT แล้ว edit, พับความจำ) ทำต่อหลังตอบไปแล้ว
+    # รอจนไม่มี call ใหม่ไป upstream ติดกัน QUIET_SECONDS และคิว OpenAI ว่าง ก่อนนับ call (ไม่เกิน --settle)
+    deadline = time.perf_counter() + args.settle
+    last, quiet_since = None, time.perf_counter()
+    while time.perf_counter() < deadline:
+        snapshot = (sum(openai_mock.calls.values()), sum(recorder.discord.values()), openai_scheduler.status()["queue_depth"])
+        if snapshot != last:
+            last, quiet_since = snapshot, time.perf_counter()
+        elif snapshot[2] == 0 and time.perf_counter() - quiet_since >= QUIET_SECONDS:
+            break
+        await asyncio.sleep(0.1)
+
+    errors = Counter(t.error for t in recorder.timings.values() if t.error)
+    for error, count in errors.most_common(5):
+        print(f"❌ {count}× {error}")
+
+    result = {
+        "config": vars(args),
+        "messages": len(workload),
+        "wall_seconds": wall,
+        "throughput": len(workload) / wall,
+        "topics": summarize(list(recorder.timings.values())),
+        "upstream": {
+            "openai": dict(openai_mock.calls),
+            "features": dict(features.calls),
+            "discord": dict(recorder.discord),
+            "outbound": outbound.status(),
+            "openai_scheduler": {k: v for k, v in openai_scheduler.status().items() if isinstance(v, int)},
+        },
+    }
+
+    await outbound.stop()
+    await openai_scheduler.stop()
+    await close_http_client()
+    await openai_client.close()
+    await openai_mock.stop()
+    return result
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="load test on_message ด้วยบริการจำลองทั้งหมด")
+    parser.add_argument("--messages", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=30, help="ข้อความที่กำลังประมวลผลพร้อมกันสูงสุด")
+    parser.add_argument("--users", type=int, default=40)
+    parser.add_argument("--mix", help="สัดส่วนข้อความ เช่น chat=50,gold=15,news=10,tarot=15,image=10")
+    parser.add_argument("--openai-latency", type=float, default=0.4, help="วินาทีก่อน token แรก")
+    parser.add_argument("--openai-jitter", type=float, default=0.1)
+    parser.add_argument("--stream-interval", type=float, default=0.005, help="วินาทีระหว่าง chunk ของ stream")
+    parser.add_argument("--openai-error-rate", type=float, default=0.0)
+    parser.add_argument("--feature-latency", type=float, default=0.15)
+    parser.add_argument("--discord-latency", type=float, default=0.03)
+    parser.add_argument("--discord-pacing", action="store_true", help="เปิด rate limit ต่อห้องตามค่าจริง (ช้ามาก)")
+    parser.add_argument("--settle", type=float, default=30.0, help="รองานเบื้องหลังหลังข้อความสุดท้ายได้นานสุดกี่วินาที")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--label", help="ชื่อรอบนี้ (เก็บไว้ใน JSON)")
+    parser.add_argument("--json", type=Path, help="บันทึกผลเป็น JSON")
+    parser.add_argument("--compare", type=Path, help="JSON ของรอบก่อนที่จะเทียบ")
+    parser.add_argument("--verbose", action="store_true", help="แสดง log ของบอท")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    result["config"] = {key: str(value) if isinstance(value, Path) else value for key, value in result["config"].items()}
+    print_report(result)
+    if args.compare:
+        print_comparison(result, json.loads(args.compare.read_text(encoding="utf-8")))
+    if args.json:
+        args.json.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"💾 บันทึกผลที่ {args.json}")
+
+if __name__ == "__main__":
+    main()
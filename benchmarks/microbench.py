@@ -0,0 +1,243 @@
+"""
+microbenchmark ของโค้ดที่กิน CPU ทุกข้อความ เทียบกับ baseline แล้ว fail เมื่อช้าลง/ใช้หน่วยความจำเพิ่มเกิน threshold
+
+    python -m benchmarks.microbench --save              # วัดแล้วเก็บเป็น baseline ของเครื่องนี้
+    python -m benchmarks.microbench                     # วัดแล้วเทียบ baseline (exit 1 ถ้ามีตัวที่ถอย)
+    python -m benchmarks.microbench --threshold 0.1 --only format_reply
+
+ข้อความตัวอย่างอยู่ใน fixtures/microbench_texts.json (แชทสั้น, คำตอบยาว, code block, list)
+แต่ละตัววัดเวลาด้วย timeit (ค่าต่ำสุดจากหลายรอบ) และวัดหน่วยความจำต่อการเรียกหนึ่งครั้งด้วย tracemalloc:
+peak = หน่วยความจำที่จองเพิ่มสูงสุดระหว่างเรียก, blocks = block ที่ยังค้างหลังเรียกเสร็จ (cache โต/รั่ว)
+
+- smart_reply ไม่มี regex ของตัวเองแล้ว (ใช้ format_reply) จึงวัด format_reply แบบ strip_links ตามคำตอบ GPT
+- send_long_reply ถูกแทนด้วย outbound queue ซึ่งตัดข้อความด้วย split_message
+- ตัวที่ต้องใช้ tiktoken (count_tokens, build_chat_context_smart) จะข้ามถ้าโหลด encoding ไม่ได้
+baseline ผูกกับเครื่องที่วัด ให้ --save ใหม่ทุกครั้งที่เปลี่ยนเครื่องหรือเวอร์ชัน Python
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import sys
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# ⚠️ ต้องตั้งก่อน import modules ของบอท (config/Settings อ่านตอน import) — ค่าปลอม ไม่มีการเรียกออกไปข้างนอก
+for _name in ("DISCORD_TOKEN", "OPENAI_API_KEY", "OPENWEATHER_API_KEY", "GOOGLE_API_KEY", "GOOGLE_CSE_ID"):
+    os.environ.setdefault(_name, "microbench")
+
+import fakeredis.aioredis
+
+from modules.memory.chat_memory import build_chat_context_smart, encode_chat_entry
+from modules.nlp.message_matcher import match_topic, route_message
+from modules.utils.cleaner import ReplyFormatter, clean_output_text, format_reply
+from modules.utils.discord_utils import split_message
+from modules.utils.query_utils import needs_web_search
+from modules.utils.token_counter import count_tokens, get_encoding
+
+FIXTURE = Path(__file__).parent / "fixtures" / "microbench_texts.json"
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "microbench.json"
+SYSTEM_PROMPT = (
+    "คุณคือ 'พี่หลาม' เป็นบอทผู้ช่วยที่พูดจาเป็นกันเองเหมือนมนุษย์ไทย "
+    "ใช้ภาษาพูดธรรมดา ไม่เป็นทางการมาก ตอบคำถามด้วยความจริงใจ เข้าใจง่าย"
+)
+PEAK_SLACK = 1024  # byte — peak เล็ก ๆ แกว่งได้ตาม allocator ไม่นับเป็นการถอย
+RETRIES = 2        # ตัวที่ดูเหมือนถอยวัดซ้ำก่อนตัดสิน (กันเครื่องกระตุกชั่วคราว)
+_OWN_TRACES = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+
+@dataclass
+class Bench:
+    name: str
+    fn: Callable[[], object]
+    items: int = 1          # จำนวนข้อความที่ fn ทำต่อรอบ (รายงานเป็นต่อข้อความ)
+    needs_tiktoken: bool = False
+
+@dataclass
+class Result:
+    us_per_call: float
+    peak_bytes: int
+    blocks: int
+
+def _run_sync(coro):
+    """เรียก coroutine ที่ไม่มีการรอ I/O จริงจนจบโดยไม่ผ่าน event loop"""
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coro.close()
+    raise RuntimeError("coroutine ยังรอ I/O อยู่ ใช้ _run_sync ไม่ได้")
+
+def _stream_format(text: str, size: int = 12) -> str:
+    """จำลอง StreamingReply: feed ทีละชิ้นเล็ก ๆ แล้ว finish"""
+    formatter = ReplyFormatter(strip_links=True)
+    for index in range(0, len(text), size):
+        formatter.feed(text[index:index + size])
+    return formatter.finish()
+
+def _tiktoken_ready() -> bool:
+    try:
+        get_encoding("gpt-4o-mini")
+        return True
+    except Exception:
+        return False
+
+def build_suite(texts: dict, loop: asyncio.AbstractEventLoop) -> List[Bench]:
+    chat = texts["short_chat"]
+    answers = {kind: texts[kind] for kind in ("long_answer", "code_answer", "list_answer")}
+    # ข้อความยาวหลายพันตัวอักษร มี code block ให้ split_message ต้องปิด/เปิด fence ข้ามชิ้น
+    long_reply = "\n\n".join([*answers.values()] * 4)
+
+    redis_instance = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    user_id = 1
+    history = [
+        {**turn, "question_tokens": len(turn["question"]) // 3, "response_tokens": len(turn["response"]) // 3}
+        for turn in texts["history"]
+    ]
+    loop.run_until_complete(redis_instance.rpush(f"chat:{user_id}", *[encode_chat_entry(turn) for turn in history]))
+    context = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        *[
+            message
+            for turn in texts["history"]
+            for message in ({"role": "user", "content": turn["question"]}, {"role": "assistant", "content": turn["response"]})
+        ],
+        {"role": "user", "content": chat[2]},
+    ]
+
+    suite = [
+        Bench("clean_output_text/short_chat", lambda: [clean_output_text(text) for text in chat], len(chat)),
+        Bench("match_topic/short_chat", lambda: [match_topic(text.lower()) for text in chat], len(chat)),
+        Bench("route_message/short_chat", lambda: [route_message(text.lower()) for text in chat], len(chat)),
+        Bench("needs_web_search/short_chat", lambda: [_run_sync(needs_web_search(text)) for text in chat], len(chat)),
+        Bench("count_tokens/context", lambda: count_tokens(context), needs_tiktoken=True),
+        Bench(
+            "build_chat_context_smart/trim",
+            lambda: loop.run_until_complete(
+                build_chat_context_smart(redis_instance, user_id, chat[2], system_prompt=SYSTEM_PROMPT)
+            ),
+            needs_tiktoken=True,
+        ),
+        Bench("split_message/long_reply", lambda: split_message(long_reply)),
+        Bench("stream_format/long_answer", lambda: _stream_format(answers["long_answer"])),
+    ]
+    for kind, text in answers.items():
+        suite.append(Bench(f"clean_output_text/{kind}", lambda text=text: clean_output_text(text)))
+        suite.append(Bench(f"format_reply/{kind}", lambda text=text: format_reply(text, strip_links=True)))
+    return suite
+
+def measure(bench: Bench, repeat: int) -> Result:
+    timer = timeit.Timer(bench.fn)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    # ✅ วัดหน่วยความจำหลัง warmup (cache/regex compile ไม่นับ) เรียกครั้งเดียวใต้ tracemalloc
+    bench.fn()
+    tracemalloc.start()
+    try:
+        before_size, _ = tracemalloc.get_traced_memory()
+        before = tracemalloc.take_snapshot()
+        bench.fn()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    after, before = after.filter_traces(_OWN_TRACES), before.filter_traces(_OWN_TRACES)
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    return Result(best * 1e6 / bench.items, max(peak - before_size, 0) // bench.items, blocks)
+
+def compare(result: Result, baseline: Optional[dict], threshold: float) -> List[str]:
+    """คืนรายการที่ถอยเกิน threshold (ว่าง = ผ่าน)"""
+    if not baseline:
+        return []
+    problems = []
+    if result.us_per_call > baseline["us_per_call"] * (1 + threshold):
+        problems.append(f"time {baseline['us_per_call']:.2f} → {result.us_per_call:.2f} µs")
+    if result.peak_bytes > baseline["peak_bytes"] * (1 + threshold) + PEAK_SLACK:
+        problems.append(f"peak {baseline['peak_bytes']} → {result.peak_bytes} B")
+    return problems
+
+def _delta(result: Result, baseline: Optional[dict]) -> str:
+    if not baseline:
+        return "new"
+    return f"{(result.us_per_call / baseline['us_per_call'] - 1) * 100:+.1f}%"
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="microbenchmark + ตรวจการถอยเทียบ baseline")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="เขียนผลรอบนี้ทับ baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="ช้าลง/peak เพิ่มเกินสัดส่วนนี้ถือว่าถอย (0.25 = 25%%)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", help="วัดเฉพาะตัวที่ชื่อมีคำนี้")
+    args = parser.parse_args()
+
+    # ปิด log ไม่ให้เวลาไปวัด I/O ของ stderr (basicConfig ตั้ง handler ตอน import logger แล้ว)
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger("pheelarm").setLevel(logging.WARNING)
+
+    texts = json.loads(FIXTURE.read_text(encoding="utf-8"))
+    loop = asyncio.new_event_loop()
+    suite = [bench for bench in build_suite(texts, loop) if not args.only or args.only in bench.name]
+    if any(bench.needs_tiktoken for bench in suite) and not _tiktoken_ready():
+        print("⚠️ โหลด encoding ของ tiktoken ไม่ได้ (ต้องต่อเน็ตครั้งแรก) ข้ามตัวที่นับ token", file=sys.stderr)
+        suite = [bench for bench in suite if not bench.needs_tiktoken]
+
+    stored = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else {}
+    baselines: Dict[str, dict] = stored.get("results", {})
+    if stored and stored.get("python") != platform.python_version():
+        print(f"⚠️ baseline วัดด้วย Python {stored.get('python')} ผลอาจเทียบกันตรง ๆ ไม่ได้", file=sys.stderr)
+
+    results: Dict[str, Result] = {}
+    regressions: Dict[str, List[str]] = {}
+    print(f"{'benchmark':<34} {'µs/call':>10} {'Δ':>8} {'peak B':>9} {'blocks':>7}")
+    for bench in suite:
+        result = results[bench.name] = measure(bench, args.repeat)
+        baseline = baselines.get(bench.name)
+        problems = compare(result, baseline, args.threshold)
+        for _ in range(RETRIES if problems else 0):
+            retry = measure(bench, args.repeat)
+            if retry.us_per_call < result.us_per_call:
+                result = results[bench.name] = retry
+            problems = compare(result, baseline, args.threshold)
+            if not problems:
+                break
+        if problems:
+            regressions[bench.name] = problems
+        status = "❌" if problems else ""
+        print(
+            f"{bench.name:<34} {result.us_per_call:>10.2f} {_delta(result, baseline):>8} "
+            f"{result.peak_bytes:>9} {result.blocks:>7} {status}"
+        )
+    loop.close()
+
+    if args.save:
+        payload = {
+            "saved_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            # ตัวที่ไม่ได้วัดรอบนี้ (--only / ไม่มี tiktoken) เก็บค่าเดิมไว้
+            "results": {**baselines, **{name: vars(result) for name, result in results.items()}},
+        }
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"💾 บันทึก baseline {len(results)} ตัวที่ {args.baseline}")
+        return 0
+
+    if not baselines:
+        print("ℹ️ ยังไม่มี baseline รัน --save ก่อนเพื่อใช้เทียบ")
+        return 0
+    if regressions:
+        print(f"\n❌ ถอยเกิน {args.threshold:.0%}:")
+        for name, problems in regressions.items():
+            print(f"  {name}: {', '.join(problems)}")
+        return 1
+    print(f"\n✅ ไม่มีตัวไหนถอยเกิน {args.threshold:.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,9 +3,8 @@ import os
 import json
 import asyncio
 import random
-import re
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Set
 from concurrent.futures import ThreadPoolExecutor
 
 # 🔹 Third-Party Packages
@@ -31,21 +30,30 @@ from modules.features.weather_forecast import get_weather
 from modules.features.daily_news import get_daily_news
 from modules.features.global_news import get_global_news
 from modules.features.google_search import search_google, search_image
-from modules.tarot.tarot_reading import draw_cards_and_interpret_by_topic
-from modules.nlp.message_matcher import match_topic
-from modules.memory.chat_memory import store_chat, build_chat_context_smart, get_chat_history
+from modules.tarot.tarot_reading import get_tarot_reply, enrich_in_background
+from modules.nlp.message_matcher import route_message
+from modules.memory.chat_memory import remember_turn, build_chat_context_smart
+from modules.memory.chat_archive import ChatArchive
 from modules.utils.token_counter import count_tokens
-from modules.utils.cleaner import clean_output_text, search_tool, format_response_markdown, clean_url
+from modules.utils.cleaner import clean_output_text, format_response_markdown, format_reply, clean_url
 from modules.utils.thai_to_eng_city import convert_thai_to_english_city
 from modules.utils.thai_datetime import get_thai_datetime_now, format_thai_datetime
 from modules.utils.query_utils import (
     is_greeting, is_about_bot, is_question,
     matches_important_query, remove_force_prefix,
-    needs_web_search
+    needs_web_search, is_context_free_question
 )
 from modules.core.logger import logger
-from modules.core.openai_client import client as openai_client
-from modules.utils.query_utils import get_openai_response
+from modules.core.http_client import init_http_client, close_http_client
+from modules.core.feature_cache import get_cached_feature
+from modules.core.config import SCHEDULER_ENABLED, CHAT_MEMORY_MODE, STREAMING_REPLIES, RESPONSE_CACHE_ENABLED
+from modules.core.singleflight import single_flight
+from modules.features.refresh_jobs import build_refresh_scheduler
+from modules.core.openai_client import client as openai_client, openai_scheduler
+from modules.utils.query_utils import get_openai_response, stream_openai_response, STREAM_RESET
+from modules.utils.discord_utils import StreamingReply, outbound
+from modules.utils.text_normalize import normalize_query
+from modules.nlp.response_cache import response_cache, is_cacheable_answer
 
 # ✅ Load environment variables
 load_dotenv()
@@ -66,11 +74,13 @@ class Settings(BaseSettings):
 settings = Settings()
 
 CHANNEL_ID = 1350812185001066538
+NO_ANSWER_REPLY = "⚠️ พี่หลามงงเลย ตอบไม่ได้จริง ๆ จ้า"
 intents = discord.Intents.default()
 intents.message_content = True
 bot = commands.Bot(command_prefix="$", intents=intents)
 openai.api_key = settings.OPENAI_API_KEY
 redis_instance = None
+chat_archive: Optional[ChatArchive] = None
 
 async def setup_connection():
     global redis_instance
@@ -138,42 +148,13 @@ async def process_message(user_id: int, text: str) -> str:
     return clean_output_text(base_prompt)
 
 async def smart_reply(message: discord.Message, content: str):
-    # ✅ เตรียมข้อความก่อน ไม่ await แทรกบ่อย
-    content = clean_output_text(content)
+    # ✅ คำตอบ feature เหมือนกันในห้องเดียวกันช่วงสั้น ๆ ส่งครั้งเดียว
+    await send_reply(message, format_reply(content), merge=True)
 
-    # ลบ markdown แบบ [text](url) → text <url>
-    content = re.sub(r'\[([^\]]+)\]\((https?://[^\)]+)\)', r'\1 <\2>', content)
+async def send_reply(message: discord.Message, content: str, merge: bool = False) -> List[discord.Message]:
+    """ส่งข้อความที่เตรียมแล้ว (ไม่ clean ซ้ำ) ผ่านคิวของห้อง ยาวเกินจะตัดเป็นหลายข้อความให้เอง"""
+    return await outbound.send(message.channel, content, reference=message, merge=merge)
 
-    # ลบลิงก์เปล่า ๆ ที่ยังไม่ถูกครอบ < >
-    content = re.sub(r'(?<!<)(https?://\S+)(?!>)', r'<\1>', content)
-
-    # ลบ ** เดี่ยว ๆ ที่หลุดมาจาก fallback
-    content = re.sub(r'(?<!\*)\*\*(?!\*)', '', content)
-
-    if len(content) > 2000:
-        await send_long_reply(message, content)
-    else:
-        try:
-            await message.reply(content)
-        except discord.HTTPException:
-            await message.channel.send(content)
-
-async def send_long_reply(message: discord.Message, content: str):
-    # แยกข้อความด้วยสองย่อหน้า จะได้ส่งได้เนียนกว่า
-    chunks = re.split(r'(?<=\n\n)', content)
-    current_chunk = ""
-
-    for paragraph in chunks:
-        if len(current_chunk) + len(paragraph) < 2000:
-            current_chunk += paragraph
-        else:
-            if current_chunk:
-                await message.channel.send(current_chunk.strip())
-            current_chunk = paragraph
-
-    if current_chunk.strip():
-        await message.channel.send(current_chunk.strip())
-        
 @bot.event
 async def on_ready():
     await setup_connection()
@@ -189,56 +170,76 @@ async def on_message(message: discord.Message):
     text = message.content.strip()
     lowered = text.lower()
 
-    topic = match_topic(lowered)
+    route = route_message(lowered)
+    topic = route.topic
     
     # ✅ handle topic ปกติ (ไม่เกี่ยวกับ GPT)
     if topic == "image":
-        query = re.sub(r"^(ดูรูป|ค้นรูป|หารูป|ขอรูป)[:,\s]*", "", lowered)
+        query = route.args.get("query")
         if not query:
             prev_query = await redis_instance.get(f"last_image_query:{message.author.id}")
             query = prev_query
         if query:
             await redis_instance.set(f"last_image_query:{message.author.id}", query, ex=300)
-            image_url = await search_image(query, settings)
+            image_url = await search_image(query, settings, redis_instance)
             return await smart_reply(message, image_url or f"😿 ไม่พบรูปเกี่ยวกับ “{query}”")
         return await smart_reply(message, "📷 พิมพ์ว่า `ดูรูป: แมว` ลองดูสิ")
 
     elif topic == "lotto":
-        return await smart_reply(message, await get_lottery_results())
+        return await smart_reply(message, await get_cached_feature(redis_instance, "lotto", get_lottery_results))
 
     elif topic == "exchange":
-        return await smart_reply(message, await get_exchange_rate())
+        return await smart_reply(message, await get_cached_feature(redis_instance, "exchange", get_exchange_rate))
 
     elif topic == "gold":
-        return await smart_reply(message, await get_gold_price_today())
+        return await smart_reply(message, await get_cached_feature(redis_instance, "gold", get_gold_price_today))
 
     elif topic == "oil":
-        return await smart_reply(message, await get_oil_price_today())
+        return await smart_reply(message, await get_cached_feature(redis_instance, "oil", get_oil_price_today))
 
     elif topic == "news":
-        return await smart_reply(message, await get_daily_news())
+        return await smart_reply(message, await get_cached_feature(
+            redis_instance, "news", lambda: get_daily_news(redis_instance=redis_instance)
+        ))
 
     elif topic == "global_news":
-        return await smart_reply(message, await get_global_news())
+        return await smart_reply(message, await get_cached_feature(
+            redis_instance, "global_news", lambda: get_global_news(redis_instance=redis_instance)
+        ))
 
     elif topic == "weather":
-        match = re.search(r"(ที่|จังหวัด|เมือง)\s+(.+)", lowered)
-        city = match.group(2).strip() if match else None
+        city = route.args.get("city")
         if city:
             eng_city = convert_thai_to_english_city(city)
-            return await smart_reply(message, await get_weather(eng_city))
+            weather = await get_cached_feature(
+                redis_instance, "weather", lambda: get_weather(eng_city), key_suffix=eng_city.lower()
+            )
+            return await smart_reply(message, weather)
         return await smart_reply(message, "📍 พิมพ์ว่า `อากาศที่ เชียงใหม่`")
 
     elif topic == "tarot":
-        return await smart_reply(message, "🔮 อยากดูดวงเรื่องอะไรดี? พิมพ์: ความรัก, การงาน, การเงิน, สุขภาพ")
+        return await smart_reply(
+            message,
+            "🔮 อยากดูดวงเรื่องอะไรดี? พิมพ์: ความรัก, การงาน, การเงิน, สุขภาพ\n"
+            "อยากเปิดมากกว่า 3 ใบ ต่อท้ายด้วยจำนวนใบ เช่น การงาน 5 ใบ หรือ ความรัก 10 ใบ"
+        )
 
-    elif lowered in ["ความรัก", "การงาน", "การเงิน", "สุขภาพ"]:
-        return await smart_reply(message, await draw_cards_and_interpret_by_topic(lowered))
+    elif topic == "tarot_reading":
+        # ⚡ แปลไพ่ + สรุปจาก template ในเครื่อง ตอบทันที แล้วค่อย edit เป็นสรุปจาก GPT เมื่อมาถึง
+        # (โหมด daily เปิดซ้ำวันเดียวกันได้ข้อความเดิมจาก cache ไม่เรียก GPT)
+        cards = route.args.get("tarot_cards")
+        text, reading = await get_tarot_reply(
+            redis_instance, message.author.id, route.args["tarot_topic"], int(cards) if cards else None
+        )
+        sent = await send_reply(message, text)
+        if reading is not None:
+            enrich_in_background(reading, sent, redis_instance)
+        return
 
-    elif any(kw in lowered for kw in ["วันนี้วันอะไร", "วันอะไรวันนี้"]):
+    elif topic == "date":
         return await smart_reply(message, f"📅 วันนี้คือ {get_thai_datetime_now()}")
 
-    elif any(kw in lowered for kw in ["กี่โมง", "เวลากี่โมง"]):
+    elif topic == "time":
         return await smart_reply(message, f"🕒 ขณะนี้คือ {get_thai_datetime_now()}")
 
     # 🧠 Mode GPT (Optimize GPT ตรงนี้)
@@ -248,48 +249,146 @@ async def on_message(message: discord.Message):
     now = datetime.now(pytz.timezone(timezone))
     system_prompt += f"\n\n⏰ timezone: {timezone}\n🕒 {format_thai_datetime(now)}"
 
-    messages = await build_chat_context_smart(
-        redis_instance,
-        message.author.id,
-        text,
-        system_prompt=system_prompt,
-        model=model,
-        max_tokens_context=1200,
-        initial_limit=4
-    )
-
-    async with message.channel.typing():
-        task_reply = asyncio.create_task(
-            get_openai_response(
-                messages,
-                settings=settings,
-                model=model,
-                use_web_fallback=True,
-                fallback_model="gpt-4o-mini-search-preview"
-            )
+    # ⚡ คำถามทั่วไปที่ไม่อิงบทสนทนา/เวลา → ใช้คำตอบร่วมกันได้ (cache + รวมคำถามซ้ำที่มาพร้อมกัน)
+    if RESPONSE_CACHE_ENABLED and is_context_free_question(text):
+        reply = await answer_shared_question(message, text, system_prompt, model)
+    else:
+        messages = await build_chat_context_smart(
+            redis_instance,
+            message.author.id,
+            text,
+            system_prompt=system_prompt,
+            model=model,
+            max_tokens_context=1200,
+            initial_limit=4,
+            memory_mode=CHAT_MEMORY_MODE,
+            archive=chat_archive
         )
+        reply = await generate_reply(message, messages, model)
 
-        # ขณะรอ GPT ตอบ ทำอย่างอื่นได้ (ถ้ามี)
-        reply = await task_reply
+    if reply:
+        await remember_turn(redis_instance, message.author.id, {
+            "question": text,
+            "response": reply
+        }, model=model, memory_mode=CHAT_MEMORY_MODE, archive=chat_archive)
 
-        if not reply:
-            return await smart_reply(message, "⚠️ พี่หลามงงเลย ตอบไม่ได้จริง ๆ จ้า")
+async def generate_reply(
+    message: discord.Message, messages: List[dict], model: str, live_sources: Optional[Set[str]] = None
+) -> Optional[str]:
+    """ให้ GPT ตอบแล้วส่งเข้าห้อง คืนข้อความที่แสดง (None ถ้าตอบไม่ได้) — live_sources ดู get_openai_response"""
+    if STREAMING_REPLIES:
+        return await stream_gpt_reply(message, messages, model, live_sources)
 
-        cleaned = clean_output_text(reply)
-        await smart_reply(message, cleaned)
+    async with message.channel.typing():
+        reply = await get_openai_response(
+            messages,
+            settings=settings,
+            model=model,
+            use_web_fallback=True,
+            fallback_model="gpt-4o-mini-search-preview",
+            redis_instance=redis_instance,
+            live_sources=live_sources,
+        )
 
-        await store_chat(redis_instance, message.author.id, {
-            "question": text,
-            "response": reply
-        })
+    if not reply:
+        await smart_reply(message, NO_ANSWER_REPLY)
+        return None
+
+    # ✅ get_openai_response format มาให้แล้ว ส่งได้เลย
+    await send_reply(message, reply)
+    return reply
+
+async def answer_shared_question(message: discord.Message, text: str, system_prompt: str, model: str) -> Optional[str]:
+    """
+    คำถามที่ไม่ขึ้นกับบทสนทนา: ลองหาใน response cache ก่อน (คำถามคล้ายกันพอ)
+    ไม่เจอค่อยถาม GPT โดยไม่แนบประวัติแชท คำถามเดียวกันที่เข้ามาพร้อมกันรอคำตอบเดียวกัน
+    """
+    cached = response_cache.lookup(text)
+    if cached is not None:
+        await send_reply(message, cached)
+        return cached
+
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": text},
+    ]
+
+    async def generate():
+        live_sources: Set[str] = set()
+        reply = await generate_reply(message, messages, model, live_sources)
+        # คำตอบจากผลค้น Google / tool ข้อมูลสด ไม่เก็บ (cache อยู่นานหลายชั่วโมงและแชร์ข้ามคน)
+        if reply and not live_sources and is_cacheable_answer(reply):
+            response_cache.store(text, reply)
+        elif live_sources:
+            logger.debug(f"🗃️ ไม่ cache คำตอบที่ใช้ข้อมูลสด ({', '.join(sorted(live_sources))})")
+        return message.id, reply
+
+    owner_id, reply = await single_flight(f"gpt_answer:{normalize_query(text)}", generate)
+    if owner_id != message.id:
+        # ✅ คำถามนี้ถูกถามพร้อมกันจากอีกข้อความ → ได้คำตอบเดียวกันมาส่งต่อ (ตอบไม่ได้ก็ต้องบอกทุกคนที่รอ)
+        if reply:
+            await send_reply(message, reply)
+        else:
+            await smart_reply(message, NO_ANSWER_REPLY)
+    return reply
+
+async def stream_gpt_reply(
+    message: discord.Message, messages: List[dict], model: str, live_sources: Optional[Set[str]] = None
+) -> str:
+    """โพสต์คำตอบ GPT ทันทีที่เริ่มมีข้อความ แล้ว edit ตามที่ stream มา คืนข้อความสุดท้ายที่แสดง"""
+    streaming = StreamingReply(message, strip_links=True)
+    async with message.channel.typing():
+        async for delta in stream_openai_response(
+            messages,
+            settings=settings,
+            model=model,
+            use_web_fallback=True,
+            fallback_model="gpt-4o-mini-search-preview",
+            redis_instance=redis_instance,
+            live_sources=live_sources,
+        ):
+            if delta is STREAM_RESET:
+                streaming.reset()
+            else:
+                await streaming.feed(delta)
+
+        if not streaming.raw.strip():
+            await streaming.feed(NO_ANSWER_REPLY)
+        reply = await streaming.finish()
+
+    if streaming.first_visible_after is not None:
+        logger.info(f"⚡ stream: ข้อความแรกขึ้นใน {streaming.first_visible_after:.2f}s ({len(streaming.sent)} ข้อความ)")
+    return reply
 
 # ✅ Entry point
 async def main():
+    global chat_archive
     await setup_connection()
     if redis_instance:
         if bot.pool is None:
             logger.warning("⚠️ PostgreSQL ไม่เชื่อมต่อ แต่ Redis ติดตั้งแล้ว จะเริ่มบอทแบบใช้เฉพาะ Redis")
-        await bot.start(settings.DISCORD_TOKEN)
+        else:
+            try:
+                chat_archive = ChatArchive(bot.pool)
+                await chat_archive.ensure_schema()
+                chat_archive.start()
+            except Exception as e:
+                logger.error(f"❌ เปิด chat archive ไม่ได้ ใช้ Redis อย่างเดียว: {e}")
+                chat_archive = None
+        await init_http_client()
+        scheduler = build_refresh_scheduler(redis_instance, archive=chat_archive) if SCHEDULER_ENABLED else None
+        if scheduler:
+            scheduler.start()
+        try:
+            await bot.start(settings.DISCORD_TOKEN)
+        finally:
+            if scheduler:
+                await scheduler.stop()
+            if chat_archive:
+                await chat_archive.stop()
+            await openai_scheduler.stop()
+            await outbound.stop()
+            await close_http_client()
     else:
         logger.error("❌ ไม่สามารถเริ่มบอทได้ เพราะเชื่อมต่อ Redis ไม่สำเร็จ")
 
@@ -1 +1,94 @@
+import os
+
 LOG_CHANNEL_ID = 123456789012345678
+
+# 🌐 Shared HTTP transport (ใช้ร่วมกันทุก feature)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "50"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+HTTP_DEFAULT_TIMEOUT = float(os.getenv("HTTP_DEFAULT_TIMEOUT", "10"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() in ("1", "true", "yes")
+
+# 🗃️ Feature result cache (วินาที) — ค่าหมดอายุแยกตาม feature
+FEATURE_CACHE_TTLS = {
+    "gold": int(os.getenv("FEATURE_TTL_GOLD", "600")),
+    "oil": int(os.getenv("FEATURE_TTL_OIL", str(6 * 3600))),
+    "exchange": int(os.getenv("FEATURE_TTL_EXCHANGE", "3600")),
+    "weather": int(os.getenv("FEATURE_TTL_WEATHER", "1800")),
+    "news": int(os.getenv("FEATURE_TTL_NEWS", "1800")),
+    "global_news": int(os.getenv("FEATURE_TTL_NEWS", "1800")),
+}
+# ช่วงเวลาที่ยังเสิร์ฟข้อมูลเก่าได้ระหว่างรอ refresh เบื้องหลัง
+FEATURE_CACHE_STALE_SECONDS = int(os.getenv("FEATURE_CACHE_STALE_SECONDS", str(24 * 3600)))
+
+# ⏰ Background refresh scheduler (วินาที)
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").lower() in ("1", "true", "yes")
+REFRESH_GOLD_SECONDS = int(os.getenv("REFRESH_GOLD_SECONDS", "300"))
+REFRESH_OIL_SECONDS = int(os.getenv("REFRESH_OIL_SECONDS", "3600"))
+REFRESH_NEWS_SECONDS = int(os.getenv("REFRESH_NEWS_SECONDS", "1200"))
+REFRESH_LOTTO_LIVE_SECONDS = int(os.getenv("REFRESH_LOTTO_LIVE_SECONDS", "300"))
+
+# 📰 cache สรุปข่าวรายบทความ (key = ลิงก์ + hash ของหัวข้อ/เนื้อหา)
+NEWS_SUMMARY_TTL = int(os.getenv("NEWS_SUMMARY_TTL", str(12 * 3600)))
+
+# 💬 Chat history ใน Redis (จำกัดทั้งจำนวนและขนาดต่อผู้ใช้)
+CHAT_HISTORY_MAX_ITEMS = int(os.getenv("CHAT_HISTORY_MAX_ITEMS", "20"))
+CHAT_HISTORY_MAX_BYTES = int(os.getenv("CHAT_HISTORY_MAX_BYTES", str(32 * 1024)))
+CHAT_HISTORY_TTL = int(os.getenv("CHAT_HISTORY_TTL", "86400"))
+CHAT_COMPRESS_MIN_BYTES = int(os.getenv("CHAT_COMPRESS_MIN_BYTES", "512"))
+
+# 🧠 โหมดความจำ: "trim" = ตัดข้อความเก่าทิ้ง, "summary" = พับข้อความเก่าเป็นสรุปต่อเนื่อง
+CHAT_MEMORY_MODE = os.getenv("CHAT_MEMORY_MODE", "trim")
+CHAT_SUMMARY_RECENT_TURNS = int(os.getenv("CHAT_SUMMARY_RECENT_TURNS", "3"))
+CHAT_SUMMARY_FOLD_BATCH = int(os.getenv("CHAT_SUMMARY_FOLD_BATCH", "4"))  # พับเข้าสรุปเมื่อค้างครบกี่รอบ
+CHAT_SUMMARY_MAX_TOKENS = int(os.getenv("CHAT_SUMMARY_MAX_TOKENS", "250"))
+
+# 🗄️ Cold tier: เขียนประวัติแชทลง PostgreSQL แบบ write-behind เป็น batch
+CHAT_ARCHIVE_BATCH_SIZE = int(os.getenv("CHAT_ARCHIVE_BATCH_SIZE", "100"))
+CHAT_ARCHIVE_FLUSH_SECONDS = float(os.getenv("CHAT_ARCHIVE_FLUSH_SECONDS", "2"))
+CHAT_ARCHIVE_MAX_QUEUE = int(os.getenv("CHAT_ARCHIVE_MAX_QUEUE", "10000"))
+
+# ⚡ Streaming: ทยอยโพสต์คำตอบ GPT แล้ว edit ต่อ (Discord จำกัด 2000 ตัวอักษร/ข้อความ)
+STREAMING_REPLIES = os.getenv("STREAMING_REPLIES", "true").lower() in ("1", "true", "yes")
+STREAM_FIRST_CHUNK_CHARS = int(os.getenv("STREAM_FIRST_CHUNK_CHARS", "24"))
+STREAM_EDIT_INTERVAL = float(os.getenv("STREAM_EDIT_INTERVAL", "1.0"))
+STREAM_MESSAGE_LIMIT = int(os.getenv("STREAM_MESSAGE_LIMIT", "1900"))
+
+# 🔎 Google Custom Search: cache ผลค้นหา + โควต้ารายวัน (รีเซ็ตเที่ยงคืนเวลาแปซิฟิก)
+SEARCH_CACHE_TTL_WEB = int(os.getenv("SEARCH_CACHE_TTL_WEB", "3600"))
+SEARCH_CACHE_TTL_IMAGE = int(os.getenv("SEARCH_CACHE_TTL_IMAGE", str(7 * 86400)))
+SEARCH_CACHE_STALE_SECONDS = int(os.getenv("SEARCH_CACHE_STALE_SECONDS", str(3 * 86400)))
+GOOGLE_DAILY_QUOTA = int(os.getenv("GOOGLE_DAILY_QUOTA", "100"))
+GOOGLE_QUOTA_RESERVE = int(os.getenv("GOOGLE_QUOTA_RESERVE", "10"))  # เหลือเท่านี้แล้วใช้ cache อย่างเดียว
+
+# 🛡️ OpenAI resilience: retry แบบ backoff + circuit breaker
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "3"))
+OPENAI_BACKOFF_BASE = float(os.getenv("OPENAI_BACKOFF_BASE", "0.5"))
+OPENAI_BACKOFF_MAX = float(os.getenv("OPENAI_BACKOFF_MAX", "8"))
+OPENAI_RETRY_AFTER_MAX = float(os.getenv("OPENAI_RETRY_AFTER_MAX", "20"))  # Retry-After นานกว่านี้ไม่รอ
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+
+# 🚦 OpenAI request scheduler: งบ RPM/TPM ทั้ง process + คิวจำกัดขนาด
+OPENAI_RPM = int(os.getenv("OPENAI_RPM", "500"))
+OPENAI_TPM = int(os.getenv("OPENAI_TPM", "200000"))
+OPENAI_MAX_QUEUE = int(os.getenv("OPENAI_MAX_QUEUE", "100"))
+OPENAI_DEGRADE_WAIT_SECONDS = float(os.getenv("OPENAI_DEGRADE_WAIT_SECONDS", "5"))  # รอนานกว่านี้ → ลด max_tokens/context
+OPENAI_SHED_WAIT_SECONDS = float(os.getenv("OPENAI_SHED_WAIT_SECONDS", "20"))      # รอนานกว่านี้ → ตอบว่ายุ่งอยู่
+OPENAI_DEGRADED_MAX_TOKENS = int(os.getenv("OPENAI_DEGRADED_MAX_TOKENS", "600"))
+OPENAI_DEGRADED_CONTEXT_MESSAGES = int(os.getenv("OPENAI_DEGRADED_CONTEXT_MESSAGES", "4"))
+
+# ♻️ Response cache: คำถามทั่วไปที่ถามซ้ำ (คำต่างกันเล็กน้อย) ใช้คำตอบเดิม
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1000"))
+RESPONSE_CACHE_THRESHOLD = float(os.getenv("RESPONSE_CACHE_THRESHOLD", "0.8"))  # Jaccard ของ shingle ขั้นต่ำ
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", str(6 * 3600)))
+
+# 📤 Outbound queue: ส่งข้อความเข้า Discord ทีละห้องตามลำดับ เว้นจังหวะตาม rate limit (~5 ข้อความ/5 วินาที/ห้อง)
+DISCORD_MESSAGE_LIMIT = int(os.getenv("DISCORD_MESSAGE_LIMIT", "2000"))
+DISCORD_CHANNEL_MESSAGES = int(os.getenv("DISCORD_CHANNEL_MESSAGES", "5"))
+DISCORD_CHANNEL_WINDOW = float(os.getenv("DISCORD_CHANNEL_WINDOW", "5"))
+OUTBOUND_MERGE_WINDOW = float(os.getenv("OUTBOUND_MERGE_WINDOW", "10"))  # คำตอบ feature ซ้ำกันในช่วงนี้ส่งครั้งเดียว
+
+# 🔮 ไพ่ยิปซี: "daily" = ไพ่ของแต่ละคนต่อหัวข้อคงที่ทั้งวัน (seed จากผู้ใช้+หัวข้อ+วันที่) cache ถึงเที่ยงคืน, "random" = สุ่มใหม่ทุกครั้ง
+TAROT_MODE = os.getenv("TAROT_MODE", "daily").lower()
@@ -0,0 +1,165 @@
+import json
+import time
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional
+
+import pytz
+from redis.asyncio import Redis
+
+from modules.core.config import FEATURE_CACHE_TTLS, FEATURE_CACHE_STALE_SECONDS
+from modules.core.logger import logger
+
+CACHE_PREFIX = "feature_cache"
+REFRESH_LOCK_SECONDS = 60
+
+# หวยออกวันที่ 1 และ 16 ผลครบราว ๆ 16:00 น.
+LOTTO_DRAW_DAYS = (1, 16)
+LOTTO_DRAW_HOUR = 16
+LOTTO_LIVE_WINDOW = timedelta(hours=2)  # ช่วงที่ผลกำลังทยอยออก cache สั้น ๆ
+LOTTO_LIVE_TTL = 300
+
+_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hit": 0, "miss": 0, "stale": 0, "refresh": 0, "refresh_error": 0})
+_refreshing: set = set()
+_background_tasks: set = set()
+
+def next_draw_time(now: datetime) -> datetime:
+    """เวลางวดหวยถัดไป (now ต้องเป็น datetime ที่มี timezone กรุงเทพ)"""
+    tz = now.tzinfo
+    candidates = []
+    for month_offset in (0, 1):
+        year = now.year + (now.month + month_offset - 1) // 12
+        month = (now.month + month_offset - 1) % 12 + 1
+        for day in LOTTO_DRAW_DAYS:
+            candidates.append(tz.localize(datetime(year, month, day, LOTTO_DRAW_HOUR)))
+    return min(dt for dt in candidates if dt > now)
+
+def lotto_ttl(now: Optional[datetime] = None) -> int:
+    """cache ผลหวยไว้จนถึงงวดถัดไป ยกเว้นช่วงที่ผลกำลังออกให้ refresh บ่อย"""
+    tz = pytz.timezone("Asia/Bangkok")
+    now = now.astimezone(tz) if now else datetime.now(tz)
+
+    if now.day in LOTTO_DRAW_DAYS:
+        draw_time = tz.localize(datetime(now.year, now.month, now.day, LOTTO_DRAW_HOUR))
+        if draw_time - timedelta(minutes=30) <= now < draw_time + LOTTO_LIVE_WINDOW:
+            return LOTTO_LIVE_TTL
+
+    return max(int((next_draw_time(now) - now).total_seconds()), LOTTO_LIVE_TTL)
+
+def feature_ttl(name: str) -> int:
+    if name == "lotto":
+        return lotto_ttl()
+    return FEATURE_CACHE_TTLS.get(name, 600)
+
+def is_error_result(value: Optional[str]) -> bool:
+    """feature ทุกตัวคืนข้อความขึ้นต้นด้วย ❌ ตอนดึงข้อมูลไม่ได้ — ห้าม cache"""
+    return not value or value.startswith("❌")
+
+def _cache_key(name: str, key_suffix: Optional[str]) -> str:
+    return f"{CACHE_PREFIX}:{name}:{key_suffix}" if key_suffix else f"{CACHE_PREFIX}:{name}"
+
+async def _store(redis_instance: Redis, key: str, value: str, ttl: int) -> None:
+    entry = json.dumps({"v": value, "t": time.time(), "ttl": ttl}, ensure_ascii=False)
+    await redis_instance.set(key, entry, ex=ttl + FEATURE_CACHE_STALE_SECONDS)
+
+async def refresh_feature(
+    redis_instance: Redis,
+    name: str,
+    fetch: Callable[[], Awaitable[str]],
+    *,
+    key_suffix: Optional[str] = None,
+) -> Optional[str]:
+    """ดึงข้อมูลใหม่แล้วเขียนทับ cache (ผลที่ error จะไม่ทับของเดิม)"""
+    value = await fetch()
+    if is_error_result(value):
+        _stats[name]["refresh_error"] += 1
+        logger.warning(f"⚠️ refresh '{name}' ไม่สำเร็จ เก็บค่าเดิมไว้: {value}")
+        return None
+
+    if redis_instance is not None:
+        await _store(redis_instance, _cache_key(name, key_suffix), value, feature_ttl(name))
+    _stats[name]["refresh"] += 1
+    return value
+
+async def _refresh_in_background(redis_instance: Redis, name: str, fetch, key_suffix: Optional[str]) -> None:
+    key = _cache_key(name, key_suffix)
+    lock_key = f"{key}:refreshing"
+    try:
+        # กันไม่ให้หลาย process refresh key เดียวกันพร้อมกัน
+        if not await redis_instance.set(lock_key, "1", nx=True, ex=REFRESH_LOCK_SECONDS):
+            return
+        try:
+            await refresh_feature(redis_instance, name, fetch, key_suffix=key_suffix)
+        finally:
+            await redis_instance.delete(lock_key)
+    except Exception as e:
+        _stats[name]["refresh_error"] += 1
+        logger.error(f"❌ background refresh '{name}' ล้มเหลว: {e}")
+    finally:
+        _refreshing.discard(key)
+
+def _schedule_refresh(redis_instance: Redis, name: str, fetch, key_suffix: Optional[str]) -> None:
+    key = _cache_key(name, key_suffix)
+    if key in _refreshing:
+        return
+    _refreshing.add(key)
+    task = asyncio.create_task(_refresh_in_background(redis_instance, name, fetch, key_suffix))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+async def get_cached_feature(
+    redis_instance: Optional[Redis],
+    name: str,
+    fetch: Callable[[], Awaitable[str]],
+    *,
+    key_suffix: Optional[str] = None,
+) -> str:
+    """
+    คืนผลลัพธ์ของ feature จาก Redis ถ้ายังสด, ถ้าเก่าแล้วคืนค่าเดิมทันที
+    แล้ว refresh เบื้องหลังหนึ่งครั้ง (stale-while-revalidate), ถ้าไม่มีเลยค่อยดึงสด
+    """
+    if redis_instance is None:
+        return await fetch()
+
+    key = _cache_key(name, key_suffix)
+    try:
+        raw = await redis_instance.get(key)
+    except Exception as e:
+        logger.warning(f"⚠️ อ่าน feature cache '{key}' ไม่ได้: {e}")
+        raw = None
+
+    if raw:
+        entry = json.loads(raw)
+        age = time.time() - entry["t"]
+        if age < entry["ttl"]:
+            _stats[name]["hit"] += 1
+            return entry["v"]
+
+        _stats[name]["stale"] += 1
+        logger.debug(f"♻️ '{key}' เก่าแล้ว ({age:.0f}s) เสิร์ฟของเดิมก่อนแล้ว refresh เบื้องหลัง")
+        _schedule_refresh(redis_instance, name, fetch, key_suffix)
+        return entry["v"]
+
+    _stats[name]["miss"] += 1
+    value = await fetch()
+    if not is_error_result(value):
+        try:
+            await _store(redis_instance, key, value, feature_ttl(name))
+        except Exception as e:
+            logger.warning(f"⚠️ เขียน feature cache '{key}' ไม่ได้: {e}")
+    return value
+
+def get_cache_stats() -> Dict[str, Dict[str, int]]:
+    """ตัวนับ hit/miss/stale ต่อ feature + จำนวนครั้งที่ไม่ต้องยิง upstream"""
+    report = {}
+    for name, counters in _stats.items():
+        report[name] = dict(counters, upstream_saved=counters["hit"] + counters["stale"])
+    return report
+
+def log_cache_stats() -> None:
+    for name, counters in get_cache_stats().items():
+        logger.info(
+            f"📊 cache[{name}] hit={counters['hit']} stale={counters['stale']} "
+            f"miss={counters['miss']} saved={counters['upstream_saved']}"
+        )
@@ -0,0 +1,101 @@
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit, urlencode
+
+import httpx
+
+from modules.core.config import (
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_DEFAULT_TIMEOUT,
+    HTTP2_ENABLED,
+)
+from modules.core.logger import logger
+from modules.core.singleflight import single_flight
+
+# ⏱️ timeout แยกตาม host (connect สั้น, read ตามความช้าของแต่ละ API)
+HOST_TIMEOUTS = {
+    "api.chnwt.dev": httpx.Timeout(8.0, connect=3.0),
+    "oil-price.bangchak.co.th": httpx.Timeout(10.0, connect=3.0),
+    "lotto.api.rayriffy.com": httpx.Timeout(10.0, connect=3.0),
+    "open.er-api.com": httpx.Timeout(6.0, connect=3.0),
+    "api.openweathermap.org": httpx.Timeout(6.0, connect=3.0),
+    "news.google.com": httpx.Timeout(10.0, connect=3.0),
+    "www.googleapis.com": httpx.Timeout(6.0, connect=3.0),
+}
+
+_client: Optional[httpx.AsyncClient] = None
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def host_timeout(url: str) -> httpx.Timeout:
+    """คืน timeout ของ host นั้น ๆ ถ้าไม่ได้กำหนดไว้ใช้ค่า default"""
+    host = urlsplit(url).hostname or ""
+    return HOST_TIMEOUTS.get(host, httpx.Timeout(HTTP_DEFAULT_TIMEOUT))
+
+def _build_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    http2 = HTTP2_ENABLED and _http2_available()
+    if HTTP2_ENABLED and not http2:
+        logger.warning("⚠️ HTTP2_ENABLED แต่ไม่มีแพ็กเกจ h2 จะใช้ HTTP/1.1 แทน")
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(HTTP_DEFAULT_TIMEOUT),
+        follow_redirects=True,
+        transport=transport,
+    )
+
+async def init_http_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    """สร้าง client กลางตอนเริ่มบอท (เรียกซ้ำได้ จะคืนตัวเดิม)"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client(transport)
+        logger.info("✅ HTTP client pool ready")
+    return _client
+
+def get_http_client() -> httpx.AsyncClient:
+    """client ที่ใช้ร่วมกันทุก feature (สร้างให้อัตโนมัติถ้ายังไม่ได้ init)"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+async def close_http_client() -> None:
+    """ปิด connection pool ตอน shutdown"""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+        logger.info("🛑 HTTP client pool closed")
+    _client = None
+
+def _flight_key(method: str, url: str, params: Optional[Dict[str, Any]]) -> str:
+    if params:
+        return f"{method}:{url}?{urlencode(sorted(params.items()))}"
+    return f"{method}:{url}"
+
+async def _get(url: str, params: Optional[Dict[str, Any]]) -> httpx.Response:
+    response = await get_http_client().get(url, params=params, timeout=host_timeout(url))
+    response.raise_for_status()
+    return response
+
+async def fetch_json(url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    """GET แล้ว parse JSON — request ที่ซ้ำกันพร้อมกันจะยิงจริงครั้งเดียว (ห้ามแก้ผลที่ได้)"""
+    async def _run():
+        return (await _get(url, params)).json()
+    return await single_flight(_flight_key("json", url, params), _run)
+
+async def fetch_text(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """GET แล้วคืน body เป็น text — ใช้กับ RSS, รวม request ซ้ำเหมือน fetch_json"""
+    async def _run():
+        return (await _get(url, params)).text
+    return await single_flight(_flight_key("text", url, params), _run)
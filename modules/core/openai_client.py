@@ -1,3 +1,85 @@
+from typing import Dict, List
+
 from openai import AsyncOpenAI
 
-client = AsyncOpenAI()
+from modules.core.config import (
+    OPENAI_MAX_RETRIES,
+    OPENAI_DEGRADED_MAX_TOKENS,
+    OPENAI_DEGRADED_CONTEXT_MESSAGES,
+)
+from modules.core.logger import logger
+from modules.core.openai_scheduler import (
+    OpenAIScheduler,
+    OverloadedError,
+    PRIORITY_INTERACTIVE,
+    PRESSURE_DEGRADED,
+    PRESSURE_OVERLOADED,
+)
+from modules.core.resilience import CircuitBreaker, call_with_resilience
+from modules.utils.token_counter import count_text_tokens, TOKENS_PER_MESSAGE, REPLY_PRIMING
+
+# retry ทำใน resilience layer แล้ว ปิด retry ในตัว SDK กันลองซ้อนกัน
+client = AsyncOpenAI(max_retries=0)
+openai_breaker = CircuitBreaker("openai")
+openai_scheduler = OpenAIScheduler()
+
+# ข้อความสำรองตอน OpenAI ล่มหรือ circuit เปิด
+CIRCUIT_OPEN_REPLY = "⚠️ ตอนนี้สมองพี่หลามติดต่อไม่ได้ชั่วคราว ลองใหม่อีกสักครู่นะ"
+# ข้อความตอนคิวแน่นจนรับไม่ไหว
+BUSY_REPLY = "⏳ ตอนนี้คนถามพี่หลามเยอะมาก ขอพักหายใจแป๊บ ลองถามใหม่อีกสักครู่นะ"
+
+def estimate_request_tokens(messages: List[Dict], max_tokens: int) -> int:
+    """ประมาณ token ที่ request นี้จะกินงบ TPM (prompt + max_tokens แบบที่ OpenAI นับ)"""
+    prompt = REPLY_PRIMING
+    for message in messages:
+        prompt += TOKENS_PER_MESSAGE
+        content = message.get("content")
+        if isinstance(content, str):
+            prompt += count_text_tokens(content)
+    return prompt + max_tokens
+
+def _degrade(kwargs: Dict) -> Dict:
+    """คิวเริ่มแน่น: ตัด context เหลือ system + ข้อความท้าย ๆ และลด max_tokens"""
+    messages = kwargs["messages"]
+    system = [m for m in messages[:1] if m.get("role") == "system"]
+    body = messages[len(system):]
+    start = max(len(body) - OPENAI_DEGRADED_CONTEXT_MESSAGES, 0)
+    # ต้องมีคำถามล่าสุดของผู้ใช้เสมอ (follow-up ของ tool ที่มีผลหลายตัวอาจยาวเกินท้าย ๆ ที่ตัดไว้)
+    users = [i for i, m in enumerate(body) if m.get("role") == "user"]
+    if users:
+        start = min(start, users[-1])
+    # ตัดกลางชุด tool → ถอยไปเริ่มที่ assistant ที่มี tool_calls ไม่ให้ผลของ tool ไม่มีที่มา
+    while start > 0 and body[start].get("role") == "tool":
+        start -= 1
+    return dict(
+        kwargs,
+        messages=system + body[start:],
+        max_tokens=min(kwargs.get("max_tokens", OPENAI_DEGRADED_MAX_TOKENS), OPENAI_DEGRADED_MAX_TOKENS),
+    )
+
+async def create_chat_completion(*, max_retries: int = OPENAI_MAX_RETRIES, priority: int = PRIORITY_INTERACTIVE, **kwargs):
+    """
+    chat.completions.create ผ่าน scheduler (งบ RPM/TPM + priority) และ retry/backoff + circuit breaker
+    ร่วมกันทุกที่ที่เรียก OpenAI — คิวแน่นจะลดขนาด request, แน่นเกินจะโยน OverloadedError
+    """
+    pressure = openai_scheduler.pressure(priority)
+    if pressure == PRESSURE_OVERLOADED:
+        openai_scheduler.stats["shed"] += 1
+        raise OverloadedError(f"คิว OpenAI แน่นเกินไป (รอ ~{openai_scheduler.estimated_wait(priority):.0f}s)")
+    if pressure == PRESSURE_DEGRADED:
+        openai_scheduler.record_degraded()
+        kwargs = _degrade(kwargs)
+        logger.info(f"🚦 คิว OpenAI เริ่มแน่น ลด request เหลือ max_tokens={kwargs['max_tokens']}")
+
+    tokens = estimate_request_tokens(kwargs["messages"], kwargs.get("max_tokens", 1000))
+
+    async def attempt():
+        await openai_scheduler.acquire(tokens, priority)
+        return await client.chat.completions.create(**kwargs)
+
+    return await call_with_resilience(
+        attempt,
+        breaker=openai_breaker,
+        max_retries=max_retries,
+        name=f"openai:{kwargs.get('model', '')}",
+    )
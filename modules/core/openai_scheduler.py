@@ -0,0 +1,193 @@
+import time
+import heapq
+import asyncio
+import itertools
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from modules.core.config import (
+    OPENAI_RPM,
+    OPENAI_TPM,
+    OPENAI_MAX_QUEUE,
+    OPENAI_DEGRADE_WAIT_SECONDS,
+    OPENAI_SHED_WAIT_SECONDS,
+)
+from modules.core.logger import logger
+
+# ยิ่งเลขน้อยยิ่งได้ก่อน
+PRIORITY_INTERACTIVE = 0   # ผู้ใช้รอคำตอบอยู่
+PRIORITY_BACKGROUND = 1    # สรุปข่าว / พับความจำ ฯลฯ รอได้
+
+PRESSURE_NORMAL = "normal"
+PRESSURE_DEGRADED = "degraded"
+PRESSURE_OVERLOADED = "overloaded"
+
+class OverloadedError(Exception):
+    """คิว OpenAI เต็มหรือต้องรอนานเกินไป — ให้ตอบแบบสำรองแทน"""
+
+class TokenBucket:
+    """เติม rate หน่วยต่อวินาที สูงสุด capacity ยอมให้ติดลบได้ (ยืมงบรอบหน้า) สำหรับ request ที่ใหญ่กว่า capacity"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        self._refill()
+        # request ใหญ่กว่าถังได้เมื่อถังเต็ม (แล้วติดหนี้ไป)
+        needed = min(amount, self.capacity) - self.tokens
+        return max(needed / self.rate, 0.0)
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.tokens -= amount
+
+@dataclass(order=True)
+class _Ticket:
+    priority: int
+    seq: int
+    tokens: int = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+class OpenAIScheduler:
+    """
+    ทุก request ไป OpenAI ต้องขอคิวที่นี่ก่อน: ปล่อยตามงบ RPM/TPM (token bucket)
+    คิวเรียงตาม priority → ข้อความผู้ใช้แซงงานเบื้องหลังเสมอ, คิวเต็มแล้วตัดงานเบื้องหลังทิ้งก่อน
+    """
+
+    def __init__(self, rpm: int = OPENAI_RPM, tpm: int = OPENAI_TPM, max_queue: int = OPENAI_MAX_QUEUE):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_queue = max_queue
+        self._queue: List[_Ticket] = []
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._waits: deque = deque(maxlen=500)
+        self.stats = {"granted": 0, "shed": 0, "evicted": 0, "degraded": 0}
+
+    # ---------- ฝั่งผู้เรียก ----------
+
+    def estimated_wait(self, priority: int = PRIORITY_BACKGROUND) -> float:
+        """เวลาที่ request ใหม่น่าจะต้องรอ (นับเฉพาะงานที่ได้คิวก่อน priority นี้)"""
+        self.requests._refill()
+        self.tokens._refill()
+        ahead = [ticket for ticket in self._queue if ticket.priority <= priority]
+        by_requests = (len(ahead) + 1 - self.requests.tokens) / self.requests.rate
+        by_tokens = (sum(ticket.tokens for ticket in ahead) - self.tokens.tokens) / self.tokens.rate
+        return max(by_requests, by_tokens, 0.0)
+
+    def pressure(self, priority: int = PRIORITY_BACKGROUND) -> str:
+        ahead = sum(1 for ticket in self._queue if ticket.priority <= priority)
+        wait = self.estimated_wait(priority)
+        if ahead >= self.max_queue or wait >= OPENAI_SHED_WAIT_SECONDS:
+            return PRESSURE_OVERLOADED
+        if wait >= OPENAI_DEGRADE_WAIT_SECONDS:
+            return PRESSURE_DEGRADED
+        return PRESSURE_NORMAL
+
+    async def acquire(self, tokens: int, priority: int = PRIORITY_INTERACTIVE) -> float:
+        """รอจนได้สิทธิ์ยิง คืนเวลาที่รอ (วินาที) — คิวเต็มจะโยน OverloadedError"""
+        self._ensure_dispatcher()
+        if len(self._queue) >= self.max_queue and not self._evict_for(priority):
+            self.stats["shed"] += 1
+            raise OverloadedError("คิว OpenAI เต็ม")
+
+        ticket = _Ticket(priority, next(self._seq), tokens, time.monotonic(), asyncio.get_running_loop().create_future())
+        heapq.heappush(self._queue, ticket)
+        self._wakeup.set()
+        try:
+            return await ticket.future
+        except asyncio.CancelledError:
+            # คนรอเลิกรอแล้ว ให้ dispatcher ข้ามไป
+            ticket.future.cancel()
+            raise
+
+    def record_degraded(self) -> None:
+        self.stats["degraded"] += 1
+
+    # ---------- ภายใน ----------
+
+    def _evict_for(self, priority: int) -> bool:
+        """คิวเต็ม: ตัดงานที่ priority ต่ำกว่าตัวล่าสุดออกหนึ่งงาน"""
+        victims = [ticket for ticket in self._queue if ticket.priority > priority and not ticket.future.done()]
+        if not victims:
+            return False
+        victim = max(victims)
+        self._queue.remove(victim)
+        heapq.heapify(self._queue)
+        victim.future.set_exception(OverloadedError("ถูกตัดออกจากคิวให้งานที่สำคัญกว่า"))
+        self.stats["evicted"] += 1
+        return True
+
+    def _ensure_dispatcher(self) -> None:
+        if self._dispatcher is None or self._dispatcher.done():
+            self._wakeup = asyncio.Event()
+            self._dispatcher = asyncio.create_task(self._dispatch(), name="openai-scheduler")
+
+    async def _dispatch(self) -> None:
+        while True:
+            while self._queue and self._queue[0].future.done():
+                heapq.heappop(self._queue)  # ถูก cancel ไปแล้ว
+            if not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            head = self._queue[0]
+            delay = max(self.requests.wait_time(1), self.tokens.wait_time(head.tokens))
+            if delay > 0:
+                # ตื่นก่อนถ้ามีงาน priority สูงกว่าเข้ามา
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._queue)
+            if head.future.done():
+                continue
+            self.requests.take(1)
+            self.tokens.take(head.tokens)
+            waited = time.monotonic() - head.enqueued_at
+            self._waits.append(waited)
+            self.stats["granted"] += 1
+            head.future.set_result(waited)
+
+    async def stop(self) -> None:
+        if self._dispatcher:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+            self._dispatcher = None
+
+    def status(self) -> Dict[str, Any]:
+        waits = sorted(self._waits)
+        return dict(
+            self.stats,
+            queue_depth=len(self._queue),
+            queue_interactive=sum(1 for t in self._queue if t.priority == PRIORITY_INTERACTIVE),
+            queue_background=sum(1 for t in self._queue if t.priority != PRIORITY_INTERACTIVE),
+            wait_avg=round(sum(waits) / len(waits), 3) if waits else 0.0,
+            wait_p95=round(waits[min(int(len(waits) * 0.95), len(waits) - 1)], 3) if waits else 0.0,
+            wait_max=round(waits[-1], 3) if waits else 0.0,
+            pressure=self.pressure(),
+        )
+
+    def log_status(self) -> None:
+        status = self.status()
+        logger.info(
+            f"🚦 openai queue depth={status['queue_depth']} (interactive={status['queue_interactive']} "
+            f"background={status['queue_background']}) wait avg={status['wait_avg']}s p95={status['wait_p95']}s "
+            f"max={status['wait_max']}s granted={status['granted']} shed={status['shed']} "
+            f"evicted={status['evicted']} degraded={status['degraded']} pressure={status['pressure']}"
+        )
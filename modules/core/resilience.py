@@ -0,0 +1,148 @@
+import time
+import random
+import asyncio
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import openai
+
+from modules.core.config import (
+    OPENAI_MAX_RETRIES,
+    OPENAI_BACKOFF_BASE,
+    OPENAI_BACKOFF_MAX,
+    OPENAI_RETRY_AFTER_MAX,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_SECONDS,
+)
+from modules.core.logger import logger
+
+class CircuitOpenError(Exception):
+    """upstream ยังไม่พร้อม — ไม่ต้องยิงจริง ให้ตอบข้อความสำรองทันที"""
+
+class CircuitBreaker:
+    """
+    closed → ยิงปกติ, ล้มติดกันครบ threshold → open (ปฏิเสธทันทีจนครบ reset_seconds)
+    → half_open ปล่อยให้ลองหนึ่ง request ถ้าผ่านกลับ closed ถ้าพังกลับ open
+    """
+
+    def __init__(self, name: str, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD, reset_seconds: float = CIRCUIT_RESET_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self.stats = {"success": 0, "failure": 0, "rejected": 0, "opened": 0}
+
+    def allow(self) -> bool:
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.reset_seconds:
+                self.stats["rejected"] += 1
+                return False
+            self.state = "half_open"
+            self._probing = False
+        if self.state == "half_open":
+            if self._probing:
+                self.stats["rejected"] += 1
+                return False
+            self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        self.stats["success"] += 1
+        if self.state != "closed":
+            logger.info(f"✅ circuit '{self.name}' กลับมาปกติ")
+        self.state = "closed"
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.stats["failure"] += 1
+        self.failures += 1
+        self._probing = False
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.stats["opened"] += 1
+                logger.warning(f"🔌 circuit '{self.name}' เปิด: ล้ม {self.failures} ครั้งติด พัก {self.reset_seconds:.0f}s")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """จบ request โดยไม่ตัดสินสุขภาพ upstream (เช่น request ผิดเอง) ปล่อยให้ probe ตัวถัดไปลองได้"""
+        self._probing = False
+
+    def status(self) -> Dict[str, Any]:
+        return dict(self.stats, state=self.state, consecutive_failures=self.failures)
+
+def is_retryable(exc: BaseException) -> bool:
+    """429 / 5xx / timeout / connection = ลองใหม่ได้, 4xx อื่น ๆ (request ผิด, key ผิด, โควต้าหมด) = ไม่ต้องลอง"""
+    if isinstance(exc, openai.RateLimitError):
+        body = exc.body if isinstance(exc.body, dict) else {}
+        return body.get("code") != "insufficient_quota"
+    if isinstance(exc, (openai.APITimeoutError, openai.APIConnectionError, openai.InternalServerError, openai.ConflictError)):
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code >= 500
+    return isinstance(exc, (asyncio.TimeoutError, ConnectionError))
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """อ่าน retry-after-ms / retry-after (วินาทีหรือวันที่ HTTP) จาก response ของ server"""
+    response = getattr(exc, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return None
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """exponential backoff แบบ full jitter (กันทุก request ยิงซ้ำพร้อมกัน) แต่ไม่เร็วกว่าที่ server ขอ"""
+    delay = random.uniform(0, min(OPENAI_BACKOFF_MAX, OPENAI_BACKOFF_BASE * 2 ** attempt))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+async def call_with_resilience(
+    fn: Callable[[], Awaitable[Any]],
+    *,
+    breaker: CircuitBreaker,
+    max_retries: int = OPENAI_MAX_RETRIES,
+    name: str = "call",
+) -> Any:
+    """เรียก fn พร้อม retry เฉพาะ error ที่ลองใหม่ได้ และเช็ก circuit ก่อนทุกครั้ง"""
+    for attempt in range(max_retries):
+        if not breaker.allow():
+            raise CircuitOpenError(f"circuit '{breaker.name}' เปิดอยู่")
+        try:
+            result = await fn()
+        except Exception as e:
+            if not is_retryable(e):
+                # request ผิดเอง ไม่ได้แปลว่า upstream ป่วย → ไม่นับเข้า circuit
+                breaker.release()
+                logger.error(f"❌ {name}: error ที่ลองใหม่ไม่ได้ ({type(e).__name__}): {e}")
+                raise
+            breaker.record_failure()
+            retry_after = retry_after_seconds(e)
+            if attempt + 1 >= max_retries or (retry_after or 0) > OPENAI_RETRY_AFTER_MAX:
+                logger.error(f"❌ {name}: ล้มเหลวหลังลอง {attempt + 1} ครั้ง ({type(e).__name__}): {e}")
+                raise
+            delay = backoff_delay(attempt, retry_after)
+            logger.warning(f"⏳ {name}: {type(e).__name__} ลองใหม่ใน {delay:.1f}s (ครั้งที่ {attempt + 2}/{max_retries})")
+            await asyncio.sleep(delay)
+        except BaseException:
+            # ถูกยกเลิก (CancelledError) ระหว่างรอคิว/รอ API → ไม่รู้ผล ปล่อย probe คืน ไม่งั้น half_open ค้างตลอด
+            breaker.release()
+            raise
+        else:
+            breaker.record_success()
+            return result
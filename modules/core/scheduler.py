@@ -0,0 +1,112 @@
+import time
+import random
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from modules.core.logger import logger
+
+MAX_JITTER_SECONDS = 60  # job ที่นอนยาว (เช่น รองวดหวย) ไม่ควรเลื่อนเกินนาทีเดียว
+
+@dataclass
+class Job:
+    name: str
+    func: Callable[[], Awaitable[Any]]
+    next_delay: Callable[[], float]  # วินาทีจนถึงรอบถัดไป (คำนวณใหม่ทุกรอบ)
+    timeout: float
+    jitter: float = 0.1              # สุ่มเลื่อน ±10% กันทุก job ยิงพร้อมกัน
+    run_at_start: bool = True
+    last_run: Optional[float] = None
+    last_duration: Optional[float] = None
+    last_error: Optional[str] = None
+    runs: int = 0
+    failures: int = 0
+    next_run: Optional[float] = field(default=None, repr=False)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "last_run": self.last_run,
+            "last_duration": self.last_duration,
+            "last_error": self.last_error,
+            "runs": self.runs,
+            "failures": self.failures,
+            "next_run": self.next_run,
+        }
+
+class Scheduler:
+    """ตัวตั้งเวลาแบบ asyncio ล้วน ๆ — หนึ่ง task ต่อหนึ่ง job"""
+
+    def __init__(self):
+        self.jobs: Dict[str, Job] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def add_job(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        *,
+        interval: Optional[float] = None,
+        next_delay: Optional[Callable[[], float]] = None,
+        timeout: float = 60,
+        jitter: float = 0.1,
+        run_at_start: bool = True,
+    ) -> Job:
+        if next_delay is None:
+            if interval is None:
+                raise ValueError(f"job '{name}' ต้องมี interval หรือ next_delay")
+            next_delay = lambda: interval
+        job = Job(name, func, next_delay, timeout, jitter, run_at_start)
+        self.jobs[name] = job
+        return job
+
+    async def _run_once(self, job: Job) -> None:
+        started = time.monotonic()
+        job.last_run = time.time()
+        try:
+            await asyncio.wait_for(job.func(), timeout=job.timeout)
+            job.last_error = None
+        except asyncio.TimeoutError:
+            job.failures += 1
+            job.last_error = f"timeout after {job.timeout}s"
+            logger.warning(f"⏱️ job '{job.name}' ใช้เวลาเกิน {job.timeout}s")
+        except Exception as e:
+            job.failures += 1
+            job.last_error = str(e)
+            logger.error(f"❌ job '{job.name}' ล้มเหลว: {e}")
+        finally:
+            job.runs += 1
+            job.last_duration = time.monotonic() - started
+            logger.debug(f"⏰ job '{job.name}' เสร็จใน {job.last_duration:.2f}s")
+
+    def _delay_with_jitter(self, job: Job) -> float:
+        delay = max(job.next_delay(), 0)
+        if job.jitter:
+            spread = min(delay * job.jitter, MAX_JITTER_SECONDS)
+            delay += random.uniform(-spread, spread)
+        return max(delay, 1)
+
+    async def _loop(self, job: Job) -> None:
+        if not job.run_at_start:
+            delay = self._delay_with_jitter(job)
+            job.next_run = time.time() + delay
+            await asyncio.sleep(delay)
+        while True:
+            await self._run_once(job)
+            delay = self._delay_with_jitter(job)
+            job.next_run = time.time() + delay
+            await asyncio.sleep(delay)
+
+    def start(self) -> None:
+        for job in self.jobs.values():
+            self._tasks.append(asyncio.create_task(self._loop(job), name=f"job:{job.name}"))
+        logger.info(f"⏰ scheduler started ({len(self.jobs)} jobs)")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        logger.info("🛑 scheduler stopped")
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        return {name: job.status() for name, job in self.jobs.items()}
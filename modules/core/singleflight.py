@@ -0,0 +1,36 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+from modules.core.logger import logger
+
+# 🛫 งานที่กำลังวิ่งอยู่ต่อ key — คนที่ขอ key เดียวกันระหว่างนี้จะรอผลจากงานเดียวกัน
+_inflight: Dict[str, asyncio.Task] = {}
+_stats = {"leader": 0, "shared": 0}
+
+def _on_done(key: str, task: asyncio.Task) -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    # กัน warning "exception was never retrieved" ถ้าคนรอถูก cancel ไปหมด
+    if not task.cancelled():
+        task.exception()
+
+async def single_flight(key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    รวมการเรียกที่ key ซ้ำกันให้เหลือ upstream call เดียว
+    ผลลัพธ์หรือ exception จะถูกแชร์ให้ทุกคนที่รออยู่
+    """
+    task = _inflight.get(key)
+    if task is None:
+        _stats["leader"] += 1
+        task = asyncio.create_task(fn())
+        _inflight[key] = task
+        task.add_done_callback(lambda t: _on_done(key, t))
+    else:
+        _stats["shared"] += 1
+        logger.debug(f"🛫 single-flight: รอผลจากงานเดิมของ '{key}'")
+
+    # shield ไว้ ถ้าคนใดคนหนึ่งถูก cancel งานหลักยังวิ่งต่อให้คนอื่น
+    return await asyncio.shield(task)
+
+def get_single_flight_stats() -> Dict[str, int]:
+    return dict(_stats, inflight=len(_inflight))
@@ -1,42 +1,51 @@
-import httpx
+from typing import Optional
+from redis.asyncio import Redis
+from modules.core.http_client import fetch_text
+from modules.core.openai_scheduler import PRIORITY_INTERACTIVE
+from modules.core.singleflight import single_flight
 from bs4 import BeautifulSoup
-from modules.nlp.openai_utils import summarize_with_gpt
+from modules.features.news_summary_cache import summarize_articles
 
-async def get_global_news(limit: int = 3) -> str:
+async def get_global_news(
+    limit: int = 3, redis_instance: Optional[Redis] = None, priority: int = PRIORITY_INTERACTIVE
+) -> str:
     """
     ดึงข่าวต่างประเทศจาก Google News RSS และสรุปด้วย GPT พร้อมลิงก์แบบย่อ
     """
+    # หลายคนขอข่าวพร้อมกัน → ดึง RSS + สรุปแค่รอบเดียว (แยกตาม priority: ผู้ใช้ไม่ต้องรอ refresh ที่ถูกเลื่อนคิว)
+    return await single_flight(f"global_news:{limit}:{priority}", lambda: _build_global_news(limit, redis_instance, priority))
+
+async def _build_global_news(limit: int, redis_instance: Optional[Redis], priority: int) -> str:
     url = "https://news.google.com/rss/search?q=ข่าวต่างประเทศ&hl=th&gl=TH&ceid=TH:th"
 
     try:
-        async with httpx.AsyncClient() as client:
-            res = await client.get(url, timeout=10)
-            res.raise_for_status()
-            soup = BeautifulSoup(res.text, "xml")
-
-            items = soup.find_all("item", limit=limit)
-            if not items:
-                return "❌ ไม่พบข่าวต่างประเทศในตอนนี้"
+        soup = BeautifulSoup(await fetch_text(url), "xml")
 
-            summarized_news = []
+        items = soup.find_all("item", limit=limit)
+        if not items:
+            return "❌ ไม่พบข่าวต่างประเทศในตอนนี้"
 
-            for item in items:
-                title = item.title.text.strip()
-                link = item.link.text.strip() if item.link else ""
-                raw_desc = item.description.text if item.description else ""
-                clean_desc = BeautifulSoup(raw_desc, "html.parser").get_text()
+        articles = []
+        for item in items:
+            title = item.title.text.strip()
+            link = item.link.text.strip() if item.link else ""
+            raw_desc = item.description.text if item.description else ""
+            clean_desc = BeautifulSoup(raw_desc, "html.parser").get_text()
 
-                # รวมหัวข้อและเนื้อหาข่าวเพื่อสรุป
-                full_text = f"{title}\n{clean_desc}"
-                summary = await summarize_with_gpt(full_text)
+            # รวมหัวข้อและเนื้อหาข่าวเพื่อสรุป
+            articles.append((link, title, clean_desc))
 
-                news_block = f"🌍 {summary}"
-                if link:
-                    news_block += f"\n🔗 [อ่านต่อ](<{link}>)"
+        # ข่าวที่เคยสรุปแล้วใช้จาก cache ที่เหลือสรุปรวมในคำขอเดียว
+        summaries = await summarize_articles(redis_instance, "global_news", articles, priority)
 
-                summarized_news.append(news_block)
+        summarized_news = []
+        for summary, (link, _, _) in zip(summaries, articles):
+            news_block = f"🌍 {summary}"
+            if link:
+                news_block += f"\n🔗 [อ่านต่อ](<{link}>)"
+            summarized_news.append(news_block)
 
-            return "🌐 ข่าวต่างประเทศเด่นวันนี้:\n\n" + "\n\n".join(summarized_news)
+        return "🌐 ข่าวต่างประเทศเด่นวันนี้:\n\n" + "\n\n".join(summarized_news)
 
     except Exception as e:
         return f"❌ พี่หลามดึงข่าวต่างประเทศไม่ได้เลย ({e})"
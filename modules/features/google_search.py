@@ -1,11 +1,29 @@
 import re
+import json
+import time
+import hashlib
 import httpx
 import logging
-from typing import Optional, List, Dict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Optional, List, Dict
+
+import pytz
 from redis.asyncio import Redis
 
+from modules.core.config import (
+    SEARCH_CACHE_TTL_WEB,
+    SEARCH_CACHE_TTL_IMAGE,
+    SEARCH_CACHE_STALE_SECONDS,
+    GOOGLE_DAILY_QUOTA,
+    GOOGLE_QUOTA_RESERVE,
+)
+from modules.core.http_client import fetch_json
+from modules.utils.text_normalize import normalize_query, strip_force_prefix
+
 logger = logging.getLogger(__name__)
 
+GOOGLE_CSE_URL = "https://www.googleapis.com/customsearch/v1"
+
 # ✅ ตรวจจับคำที่สื่อถึงสื่อ เช่น เพลง คลิป
 def is_media_query(query: str) -> bool:
     return re.search(r"(เพลง|mv|คลิป|video|op|ed|opening|ending|ตัวอย่าง|trailer|แนะนำ|ดู)", query, re.IGNORECASE) is not None
@@ -39,46 +57,127 @@ def format_google_results(results: List[Dict]) -> str:
             lines.append(f"{i}. {title}\n<{link}>")
     return "\n".join(lines)
 
+# 🗃️ cache ผลค้นหาใน Redis (key = คำค้นที่ normalize แล้ว) + นับโควต้ารายวัน
+_search_stats: Dict[str, int] = {"hit": 0, "miss": 0, "stale": 0, "quota_blocked": 0, "api_calls": 0}
+
+def search_cache_key(kind: str, query: str) -> str:
+    digest = hashlib.sha1(normalize_query(query).encode("utf-8")).hexdigest()[:20]
+    return f"google_search:{kind}:{digest}"
+
+def _quota_key() -> str:
+    # โควต้า Custom Search รีเซ็ตเที่ยงคืนเวลาแปซิฟิก
+    return f"google_quota:{datetime.now(pytz.timezone('America/Los_Angeles')):%Y-%m-%d}"
+
+async def _reserve_quota(redis_instance: Redis) -> bool:
+    """นับการเรียก API หนึ่งครั้ง คืน False ถ้าใกล้หมดโควต้าแล้ว (ให้ใช้ cache อย่างเดียว)"""
+    key = _quota_key()
+    used = await redis_instance.incr(key)
+    if used == 1:
+        await redis_instance.expire(key, 2 * 86400)
+    if used > GOOGLE_DAILY_QUOTA - GOOGLE_QUOTA_RESERVE:
+        await redis_instance.decr(key)
+        return False
+    return True
+
+async def get_search_quota_used(redis_instance: Redis) -> int:
+    return int(await redis_instance.get(_quota_key()) or 0)
+
+async def _cached_search(redis_instance: Optional[Redis], kind: str, query: str, ttl: int, fetch: Callable[[], Awaitable[Any]]):
+    if redis_instance is None:
+        _search_stats["api_calls"] += 1
+        return await fetch()
+
+    key = search_cache_key(kind, query)
+    entry = None
+    try:
+        raw = await redis_instance.get(key)
+        entry = json.loads(raw) if raw else None
+        if entry and time.time() - entry["t"] < ttl:
+            _search_stats["hit"] += 1
+            return entry["v"]
+        if not await _reserve_quota(redis_instance):
+            # ✅ โควต้าใกล้หมด: เสิร์ฟผลเก่าถ้ามี ไม่มีก็ไม่ยิง API
+            _search_stats["quota_blocked"] += 1
+            logger.warning(f"⚠️ โควต้า Google ใกล้หมด ใช้ cache อย่างเดียว ({kind}: {query})")
+            if entry:
+                _search_stats["stale"] += 1
+                return entry["v"]
+            return None
+    except Exception as e:
+        logger.warning(f"⚠️ search cache '{key}' ใช้ไม่ได้: {e}")
+
+    _search_stats["miss"] += 1
+    _search_stats["api_calls"] += 1
+    value = await fetch()
+    if value:
+        try:
+            payload = json.dumps({"v": value, "t": time.time()}, ensure_ascii=False)
+            await redis_instance.set(key, payload, ex=ttl + SEARCH_CACHE_STALE_SECONDS)
+        except Exception as e:
+            logger.warning(f"⚠️ เขียน search cache '{key}' ไม่ได้: {e}")
+    elif entry:
+        # API ล้มเหลว แต่ยังมีผลเก่าอยู่
+        _search_stats["stale"] += 1
+        return entry["v"]
+    return value
+
+def get_search_cache_stats() -> Dict[str, int]:
+    return dict(_search_stats)
+
+def log_search_cache_stats() -> None:
+    stats = _search_stats
+    logger.info(
+        f"🔎 search cache hit={stats['hit']} stale={stats['stale']} miss={stats['miss']} "
+        f"quota_blocked={stats['quota_blocked']} api_calls={stats['api_calls']}"
+    )
+
 # ✅ ค้นหาข้อมูลจาก Google แล้วส่งกลับ list ของ dict
-async def search_google(query: str, settings) -> List[Dict]:
+async def _fetch_google(query: str, settings) -> List[Dict]:
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                "https://www.googleapis.com/customsearch/v1",
-                params={
-                    "q": query,
-                    "key": settings.GOOGLE_API_KEY,
-                    "cx": settings.GOOGLE_CSE_ID,
-                },
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json().get("items", [])[:5]
-    except httpx.RequestError as e:
+        data = await fetch_json(
+            GOOGLE_CSE_URL,
+            params={
+                "q": query,
+                "key": settings.GOOGLE_API_KEY,
+                "cx": settings.GOOGLE_CSE_ID,
+            },
+        )
+        return data.get("items", [])[:5]
+    except httpx.HTTPError as e:
         logger.error(f"เกิดข้อผิดพลาดใน Google Search API: {e}")
         return []
 
+async def search_google(query: str, settings, redis_instance: Optional[Redis] = None) -> List[Dict]:
+    query = strip_force_prefix(query.strip())
+    results = await _cached_search(
+        redis_instance, "web", query, SEARCH_CACHE_TTL_WEB, lambda: _fetch_google(query, settings)
+    )
+    return results or []
+
 # ✅ ค้นหารูปภาพจาก Google
-async def search_image(query: str, settings) -> Optional[str]:
+async def _fetch_image(query: str, settings) -> Optional[str]:
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                "https://www.googleapis.com/customsearch/v1",
-                params={
-                    "q": query,
-                    "searchType": "image",
-                    "num": 5,
-                    "key": settings.GOOGLE_API_KEY,
-                    "cx": settings.GOOGLE_CSE_ID
-                },
-                timeout=10
-            )
-            response.raise_for_status()
-            results = response.json().get("items", [])
-            for result in results:
-                link = result.get("link", "")
-                if is_direct_image_link(link):
-                    return link
-    except httpx.RequestError as e:
+        data = await fetch_json(
+            GOOGLE_CSE_URL,
+            params={
+                "q": query,
+                "searchType": "image",
+                "num": 5,
+                "key": settings.GOOGLE_API_KEY,
+                "cx": settings.GOOGLE_CSE_ID
+            },
+        )
+        results = data.get("items", [])
+        for result in results:
+            link = result.get("link", "")
+            if is_direct_image_link(link):
+                return link
+    except httpx.HTTPError as e:
         logger.error(f"เกิดข้อผิดพลาดในการค้นหารูปภาพ: {e}")
     return None
+
+async def search_image(query: str, settings, redis_instance: Optional[Redis] = None) -> Optional[str]:
+    query = strip_force_prefix(query.strip())
+    return await _cached_search(
+        redis_instance, "image", query, SEARCH_CACHE_TTL_IMAGE, lambda: _fetch_image(query, settings)
+    )
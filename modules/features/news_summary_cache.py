@@ -0,0 +1,71 @@
+import hashlib
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from redis.asyncio import Redis
+
+from modules.core.config import NEWS_SUMMARY_TTL
+from modules.core.openai_scheduler import PRIORITY_BACKGROUND
+from modules.core.logger import logger
+from modules.nlp.openai_utils import summarize_news_batch
+
+_feed_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hit": 0, "miss": 0})
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+def article_cache_key(link: str, title: str, description: str) -> str:
+    """ลิงก์เดิมแต่หัวข้อ/เนื้อหาเปลี่ยน (ข่าวอัปเดต) ต้องสรุปใหม่"""
+    content = f"{title}\n{description}"
+    return f"news_summary:{_digest(link or title)}:{_digest(content)}"
+
+async def summarize_articles(
+    redis_instance: Optional[Redis],
+    feed: str,
+    articles: List[Tuple[str, str, str]],
+    priority: int = PRIORITY_BACKGROUND,
+) -> List[str]:
+    """
+    สรุปข่าวจาก (link, title, description) — ข่าวที่เคยสรุปแล้วดึงจาก Redis
+    ส่งไปให้ GPT เฉพาะข่าวที่ยังไม่เคยเห็น
+    """
+    texts = [f"{title}\n{description}" for _, title, description in articles]
+    if redis_instance is None:
+        return await summarize_news_batch(texts, priority)
+
+    keys = [article_cache_key(*article) for article in articles]
+    try:
+        cached = await redis_instance.mget(keys)
+    except Exception as e:
+        logger.warning(f"⚠️ อ่าน cache สรุปข่าวไม่ได้: {e}")
+        cached = [None] * len(keys)
+
+    missing = [i for i, summary in enumerate(cached) if not summary]
+    summaries = list(cached)
+
+    if missing:
+        fresh = await summarize_news_batch([texts[i] for i in missing], priority)
+        try:
+            async with redis_instance.pipeline(transaction=False) as pipe:
+                for i, summary in zip(missing, fresh):
+                    summaries[i] = summary
+                    if not summary.startswith("⚠️"):  # ข้อความ error ไม่ต้องเก็บ
+                        pipe.set(keys[i], summary, ex=NEWS_SUMMARY_TTL)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"⚠️ เขียน cache สรุปข่าวไม่ได้: {e}")
+            for i, summary in zip(missing, fresh):
+                summaries[i] = summary
+
+    stats = _feed_stats[feed]
+    stats["hit"] += len(keys) - len(missing)
+    stats["miss"] += len(missing)
+    total = stats["hit"] + stats["miss"]
+    logger.info(
+        f"📰 [{feed}] summary cache: {len(keys) - len(missing)}/{len(keys)} hit รอบนี้ "
+        f"(สะสม {stats['hit']}/{total} = {stats['hit'] / total:.0%})"
+    )
+    return summaries
+
+def get_news_summary_stats() -> Dict[str, Dict[str, int]]:
+    return {feed: dict(counters) for feed, counters in _feed_stats.items()}
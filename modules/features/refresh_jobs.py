@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pytz
+from redis.asyncio import Redis
+
+from modules.core.config import (
+    REFRESH_GOLD_SECONDS,
+    REFRESH_OIL_SECONDS,
+    REFRESH_NEWS_SECONDS,
+    REFRESH_LOTTO_LIVE_SECONDS,
+)
+from modules.core.feature_cache import (
+    refresh_feature,
+    log_cache_stats,
+    next_draw_time,
+    LOTTO_DRAW_DAYS,
+    LOTTO_DRAW_HOUR,
+)
+from modules.core.logger import logger
+from modules.core.openai_client import openai_breaker, openai_scheduler
+from modules.core.openai_scheduler import PRIORITY_BACKGROUND
+from modules.core.scheduler import Scheduler
+from modules.memory.chat_memory import report_chat_memory
+from modules.memory.chat_archive import ChatArchive
+from modules.utils.query_utils import log_search_route_stats
+from modules.features.gold_price import get_gold_price_today
+from modules.features.oil_price import get_oil_price_today
+from modules.features.lottery_checker import get_lottery_results
+from modules.features.daily_news import get_daily_news
+from modules.features.global_news import get_global_news
+from modules.features.google_search import log_search_cache_stats
+from modules.nlp.response_cache import response_cache
+from modules.utils.discord_utils import outbound
+from modules.tarot.tarot_reading import log_tarot_stats
+
+# ช่วงที่ poll ผลหวยถี่ ๆ ในวันหวยออก
+LOTTO_POLL_START = timedelta(minutes=30)
+LOTTO_POLL_END = timedelta(hours=2)
+
+def lotto_poll_delay(now: datetime = None) -> float:
+    """วันหวยออก 15:30–18:00 poll ทุก 5 นาที นอกนั้นนอนรอจนถึงช่วง poll ของงวดถัดไป"""
+    tz = pytz.timezone("Asia/Bangkok")
+    now = now.astimezone(tz) if now else datetime.now(tz)
+
+    if now.day in LOTTO_DRAW_DAYS:
+        draw_time = tz.localize(datetime(now.year, now.month, now.day, LOTTO_DRAW_HOUR))
+        if draw_time - LOTTO_POLL_START <= now < draw_time + LOTTO_POLL_END:
+            return REFRESH_LOTTO_LIVE_SECONDS
+
+    next_window = next_draw_time(now) - LOTTO_POLL_START
+    return max((next_window - now).total_seconds(), REFRESH_LOTTO_LIVE_SECONDS)
+
+def build_refresh_scheduler(redis_instance: Redis, archive: Optional[ChatArchive] = None) -> Scheduler:
+    """ลงทะเบียน job สำหรับ refresh ข้อมูล feature ล่วงหน้าลง feature cache"""
+    scheduler = Scheduler()
+
+    scheduler.add_job(
+        "gold",
+        lambda: refresh_feature(redis_instance, "gold", get_gold_price_today),
+        interval=REFRESH_GOLD_SECONDS,
+        timeout=30,
+    )
+    scheduler.add_job(
+        "oil",
+        lambda: refresh_feature(redis_instance, "oil", get_oil_price_today),
+        interval=REFRESH_OIL_SECONDS,
+        timeout=30,
+    )
+    scheduler.add_job(
+        "lotto",
+        lambda: refresh_feature(redis_instance, "lotto", get_lottery_results),
+        next_delay=lotto_poll_delay,
+        timeout=30,
+        jitter=0.05,
+    )
+    # ข่าวต้องดึง RSS + สรุปด้วย GPT → ทำล่วงหน้าไว้ ผู้ใช้ได้ของที่พร้อมเสิร์ฟ
+    scheduler.add_job(
+        "news",
+        lambda: refresh_feature(
+            redis_instance, "news", lambda: get_daily_news(redis_instance=redis_instance, priority=PRIORITY_BACKGROUND)
+        ),
+        interval=REFRESH_NEWS_SECONDS,
+        timeout=120,
+    )
+    scheduler.add_job(
+        "global_news",
+        lambda: refresh_feature(
+            redis_instance,
+            "global_news",
+            lambda: get_global_news(redis_instance=redis_instance, priority=PRIORITY_BACKGROUND),
+        ),
+        interval=REFRESH_NEWS_SECONDS,
+        timeout=120,
+    )
+    scheduler.add_job("stats", _log_stats(scheduler, redis_instance, archive), interval=3600, timeout=30, run_at_start=False)
+
+    return scheduler
+
+def _log_stats(scheduler: Scheduler, redis_instance: Redis, archive: Optional[ChatArchive]):
+    async def run():
+        log_cache_stats()
+        log_search_route_stats()
+        log_search_cache_stats()
+        logger.info(f"🔌 openai circuit: {openai_breaker.status()}")
+        openai_scheduler.log_status()
+        response_cache.log_status()
+        outbound.log_status()
+        log_tarot_stats()
+        await report_chat_memory(redis_instance)
+        if archive is not None:
+            archive.log_stats()
+        for name, status in scheduler.status().items():
+            logger.info(
+                f"⏰ job[{name}] runs={status['runs']} failures={status['failures']} "
+                f"last_duration={status['last_duration']} last_error={status['last_error']}"
+            )
+    return run
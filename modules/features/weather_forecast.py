@@ -1,4 +1,4 @@
-import httpx
+from modules.core.http_client import fetch_json
 import os
 
 API_KEY = os.getenv("OPENWEATHER_API_KEY")
@@ -12,23 +12,20 @@ async def get_weather(city: str) -> str:
         f"?q={city}&appid={API_KEY}&units=metric&lang=th"
     )
     try:
-        async with httpx.AsyncClient() as client:
-            res = await client.get(url, timeout=10)
-            res.raise_for_status()
-            data = res.json()
+        data = await fetch_json(url)
 
-            weather = data["weather"][0]["description"]
-            temp = data["main"]["temp"]
-            humidity = data["main"]["humidity"]
-            wind = data["wind"]["speed"]
+        weather = data["weather"][0]["description"]
+        temp = data["main"]["temp"]
+        humidity = data["main"]["humidity"]
+        wind = data["wind"]["speed"]
 
-            return (
-                f"📍 สภาพอากาศวันนี้ที่ {city.title()}\n"
-                f"🌤️ {weather}\n"
-                f"🌡️ อุณหภูมิ: {temp}°C\n"
-                f"💧 ความชื้น: {humidity}%\n"
-                f"💨 ลม: {wind} m/s"
-            )
+        return (
+            f"📍 สภาพอากาศวันนี้ที่ {city.title()}\n"
+            f"🌤️ {weather}\n"
+            f"🌡️ อุณหภูมิ: {temp}°C\n"
+            f"💧 ความชื้น: {humidity}%\n"
+            f"💨 ลม: {wind} m/s"
+        )
 
     except Exception as e:
         return f"❌ พี่หลามดึงพยากรณ์อากาศไม่ได้ ({e})"
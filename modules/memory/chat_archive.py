@@ -0,0 +1,157 @@
+import time
+import asyncio
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+from modules.core.config import (
+    CHAT_ARCHIVE_BATCH_SIZE,
+    CHAT_ARCHIVE_FLUSH_SECONDS,
+    CHAT_ARCHIVE_MAX_QUEUE,
+)
+from modules.core.logger import logger
+
+# ✅ ตาราง append-only หนึ่งแถวต่อหนึ่งรอบสนทนา (แทนการเขียนทับ array ทั้งก้อน)
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS chat_turns (
+    id BIGSERIAL PRIMARY KEY,
+    user_id BIGINT NOT NULL,
+    question TEXT NOT NULL,
+    response TEXT NOT NULL,
+    question_tokens INT,
+    response_tokens INT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS chat_turns_user_id_idx ON chat_turns (user_id, id DESC);
+"""
+
+INSERT_SQL = """
+INSERT INTO chat_turns (user_id, question, response, question_tokens, response_tokens, created_at)
+VALUES ($1, $2, $3, $4, $5, to_timestamp($6))
+"""
+
+SELECT_RECENT_SQL = """
+SELECT question, response, question_tokens, response_tokens
+FROM chat_turns
+WHERE user_id = $1
+ORDER BY id DESC
+LIMIT $2
+"""
+
+# (user_id, question, response, question_tokens, response_tokens, enqueued_at)
+ArchiveRow = Tuple[int, str, str, Optional[int], Optional[int], float]
+
+class ChatArchive:
+    """Cold tier ของความจำแชท — รับรอบสนทนาเข้าคิวแล้วค่อย flush ลง Postgres เป็น batch"""
+
+    def __init__(
+        self,
+        pool,
+        *,
+        batch_size: int = CHAT_ARCHIVE_BATCH_SIZE,
+        flush_interval: float = CHAT_ARCHIVE_FLUSH_SECONDS,
+        max_queue: int = CHAT_ARCHIVE_MAX_QUEUE,
+    ):
+        self.pool = pool
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self._queue: Deque[ArchiveRow] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {
+            "flushed_total": 0,
+            "dropped": 0,
+            "failures": 0,
+            "last_batch_size": 0,
+            "last_flush_lag": 0.0,
+        }
+
+    async def ensure_schema(self) -> None:
+        async with self.pool.acquire() as con:
+            await con.execute(SCHEMA_SQL)
+        logger.info("✅ chat_turns table ensured")
+
+    def enqueue(self, user_id: int, entry: dict) -> None:
+        """ไม่ block การตอบ — ถ้าคิวเต็ม (DB ล่มนาน) ทิ้งรายการเก่าสุด"""
+        if len(self._queue) >= self.max_queue:
+            self._queue.popleft()
+            self._stats["dropped"] += 1
+        self._queue.append((
+            user_id,
+            entry.get("question") or "",
+            entry.get("response") or "",
+            entry.get("question_tokens"),
+            entry.get("response_tokens"),
+            time.time(),
+        ))
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        if not self._queue:
+            return 0
+
+        batch: List[ArchiveRow] = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+        try:
+            async with self.pool.acquire() as con:
+                await con.executemany(INSERT_SQL, batch)
+        except Exception as e:
+            # คืนกลับหัวคิว รอบหน้าลองใหม่
+            self._queue.extendleft(reversed(batch))
+            self._stats["failures"] += 1
+            logger.error(f"❌ flush chat_turns ล้มเหลว ({len(batch)} แถว): {e}")
+            return 0
+
+        self._stats["flushed_total"] += len(batch)
+        self._stats["last_batch_size"] = len(batch)
+        self._stats["last_flush_lag"] = time.time() - batch[0][5]
+        return len(batch)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            while await self.flush() == self.batch_size:
+                pass
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="chat-archive-flusher")
+
+    async def stop(self) -> None:
+        """หยุด flusher แล้ว flush ที่ค้างในคิวให้หมดก่อนปิด"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        while self._queue and await self.flush():
+            pass
+        logger.info(f"🛑 chat archive stopped (ค้างในคิว {len(self._queue)})")
+
+    async def load_recent(self, user_id: int, limit: int) -> List[dict]:
+        """ดึงรอบล่าสุดของผู้ใช้จาก Postgres เรียงเก่า → ใหม่"""
+        async with self.pool.acquire() as con:
+            rows = await con.fetch(SELECT_RECENT_SQL, user_id, limit)
+        return [
+            {
+                "question": row["question"],
+                "response": row["response"],
+                "question_tokens": row["question_tokens"],
+                "response_tokens": row["response_tokens"],
+            }
+            for row in reversed(rows)
+        ]
+
+    def stats(self) -> dict:
+        return dict(self._stats, queue_depth=len(self._queue))
+
+    def log_stats(self) -> None:
+        stats = self.stats()
+        logger.info(
+            f"🗄️ chat archive: queue={stats['queue_depth']} last_batch={stats['last_batch_size']} "
+            f"lag={stats['last_flush_lag']:.2f}s flushed={stats['flushed_total']} "
+            f"dropped={stats['dropped']} failures={stats['failures']}"
+        )
@@ -1,22 +1,223 @@
 import re
 import json
-from typing import List, Optional
+import zlib
+import base64
+import asyncio
+import weakref
+from typing import TYPE_CHECKING, List, Optional
 from redis.asyncio import Redis
 
-from modules.utils.token_counter import count_tokens  # ✅ นับ token ได้
+from modules.core.config import (
+    CHAT_HISTORY_MAX_ITEMS,
+    CHAT_HISTORY_MAX_BYTES,
+    CHAT_HISTORY_TTL,
+    CHAT_COMPRESS_MIN_BYTES,
+    CHAT_SUMMARY_RECENT_TURNS,
+    CHAT_SUMMARY_MAX_TOKENS,
+    CHAT_SUMMARY_FOLD_BATCH,
+)
+from modules.core.logger import logger
+from modules.nlp.openai_utils import summarize_conversation
+from modules.utils.token_counter import (  # ✅ นับ token ได้
+    REPLY_PRIMING,
+    count_message_tokens,
+    count_text_tokens,
+    message_tokens_from_content,
+)
 from modules.utils.cleaner import clean_output_text   # ✅ เก็บ raw แต่เวลาสร้าง context จะ clean เบา ๆ
 
-# ✅ เก็บแชทลง Redis (raw ไม่ clean ก่อนเก็บ)
-async def store_chat(redis_instance: Redis, user_id: int, message: dict) -> None:
+if TYPE_CHECKING:
+    from modules.memory.chat_archive import ChatArchive
+
+# 🔑 key แบบย่อที่เก็บจริงใน Redis ↔ ชื่อเต็มที่โค้ดส่วนอื่นใช้
+_SHORT_KEYS = {
+    "question": "q",
+    "response": "r",
+    "question_tokens": "qt",
+    "response_tokens": "rt",
+}
+_LONG_KEYS = {short: long for long, short in _SHORT_KEYS.items()}
+_COMPRESSED_PREFIX = "z:"
+
+# ✅ append + ตัดตามจำนวน/ขนาด + ต่อ TTL ในคำสั่งเดียว คืนรายการที่ถูกตัดออก
+_APPEND_AND_TRIM_LUA = """
+local key = KEYS[1]
+local max_items = tonumber(ARGV[2])
+local max_bytes = tonumber(ARGV[3])
+local evicted = {}
+
+redis.call('RPUSH', key, ARGV[1])
+local n = redis.call('LLEN', key)
+while n > max_items do
+    table.insert(evicted, redis.call('LPOP', key))
+    n = n - 1
+end
+
+local total = 0
+for _, item in ipairs(redis.call('LRANGE', key, 0, -1)) do
+    total = total + #item
+end
+while total > max_bytes and n > 1 do
+    local item = redis.call('LPOP', key)
+    total = total - #item
+    n = n - 1
+    table.insert(evicted, item)
+end
+
+redis.call('EXPIRE', key, tonumber(ARGV[4]))
+return evicted
+"""
+_scripts = {}
+
+def _append_script(redis_instance: Redis):
+    script = _scripts.get(id(redis_instance))
+    if script is None:
+        script = _scripts[id(redis_instance)] = redis_instance.register_script(_APPEND_AND_TRIM_LUA)
+    return script
+
+def encode_chat_entry(message: dict) -> str:
+    """JSON แบบ key สั้น ไม่ escape ภาษาไทย ถ้ายาวก็ zlib + base64 (ใช้เฉพาะเมื่อเล็กลงจริง)"""
+    compact = {_SHORT_KEYS.get(k, k): v for k, v in message.items()}
+    payload = json.dumps(compact, ensure_ascii=False, separators=(",", ":"))
+    raw = payload.encode("utf-8")
+    if len(raw) >= CHAT_COMPRESS_MIN_BYTES:
+        packed = _COMPRESSED_PREFIX + base64.b64encode(zlib.compress(raw, 6)).decode("ascii")
+        if len(packed) < len(raw):
+            return packed
+    return payload
+
+def decode_chat_entry(raw: str) -> dict:
+    """อ่านได้ทั้งแบบบีบอัด, แบบ key สั้น และแบบเก่า (question/response เต็ม)"""
+    if raw.startswith(_COMPRESSED_PREFIX):
+        raw = zlib.decompress(base64.b64decode(raw[len(_COMPRESSED_PREFIX):])).decode("utf-8")
+    data = json.loads(raw)
+    return {_LONG_KEYS.get(k, k): v for k, v in data.items()}
+
+def _with_token_counts(message: dict, model: str) -> dict:
+    message = dict(message)
+    message.setdefault("question_tokens", count_text_tokens(message.get("question") or "", model))
+    message.setdefault("response_tokens", count_text_tokens(message.get("response") or "", model))
+    return message
+
+# ✅ เก็บแชทลง Redis (raw ไม่ clean ก่อนเก็บ) พร้อมจำนวน token ของแต่ละฝั่ง นับครั้งเดียวตอนเก็บ
+async def store_chat(
+    redis_instance: Redis,
+    user_id: int,
+    message: dict,
+    model: str = "gpt-4o-mini",
+    max_items: int = CHAT_HISTORY_MAX_ITEMS,
+) -> List[dict]:
     key = f"chat:{user_id}"
-    await redis_instance.rpush(key, json.dumps(message))
-    await redis_instance.expire(key, 86400)
+    message = _with_token_counts(message, model)
+
+    evicted = await _append_script(redis_instance)(
+        keys=[key],
+        args=[encode_chat_entry(message), max_items, CHAT_HISTORY_MAX_BYTES, CHAT_HISTORY_TTL],
+    )
+    return [decode_chat_entry(item) for item in evicted]
 
 # ✅ ดึงแชทย้อนหลัง
 async def get_chat_history(redis_instance: Redis, user_id: int, limit: int = 20) -> List[dict]:
     key = f"chat:{user_id}"
     raw_messages = await redis_instance.lrange(key, -limit, -1)
-    return [json.loads(m) for m in raw_messages]
+    return [decode_chat_entry(m) for m in raw_messages]
+
+# 🧠 rolling summary — ข้อความที่หลุดจาก list ถูกพับเข้าสรุปเบื้องหลัง ไม่ถ่วงการตอบ
+_summary_locks: "weakref.WeakValueDictionary[int, asyncio.Lock]" = weakref.WeakValueDictionary()
+_background_tasks: set = set()
+
+def _summary_key(user_id: int) -> str:
+    return f"chat_summary:{user_id}"
+
+def _pending_key(user_id: int) -> str:
+    return f"chat_summary_pending:{user_id}"
+
+async def get_pending_turns(redis_instance: Redis, user_id: int) -> List[dict]:
+    """รอบที่หลุดจาก list แล้วแต่ยังไม่ถูกพับเข้าสรุป"""
+    return [decode_chat_entry(item) for item in await redis_instance.lrange(_pending_key(user_id), 0, -1)]
+
+async def fold_into_summary(redis_instance: Redis, user_id: int) -> None:
+    """พับรอบที่ค้างทั้งหมดเข้ากับสรุปเดิมในครั้งเดียว ถ้าล้มเหลวรอบที่ค้างยังอยู่ รอพับรอบหน้า"""
+    lock = _summary_locks.get(user_id)
+    if lock is None:
+        lock = _summary_locks[user_id] = asyncio.Lock()
+
+    async with lock:
+        try:
+            turns = await get_pending_turns(redis_instance, user_id)
+            if len(turns) < CHAT_SUMMARY_FOLD_BATCH:  # รอบก่อนหน้าที่รอ lock อยู่พับไปแล้ว
+                return
+            previous = await redis_instance.get(_summary_key(user_id))
+            summary = await summarize_conversation(previous, turns, max_tokens=CHAT_SUMMARY_MAX_TOKENS)
+
+            # ✅ ตัดเฉพาะรอบที่พับแล้ว รอบที่เข้ามาระหว่างสรุปยังค้างอยู่ให้รอบหน้า
+            async with redis_instance.pipeline(transaction=True) as pipe:
+                pipe.set(_summary_key(user_id), summary, ex=CHAT_HISTORY_TTL)
+                pipe.ltrim(_pending_key(user_id), len(turns), -1)
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"❌ สรุปความจำของ {user_id} ไม่สำเร็จ เก็บไว้รอรอบหน้า: {e}")
+
+async def remember_turn(
+    redis_instance: Redis,
+    user_id: int,
+    message: dict,
+    *,
+    model: str = "gpt-4o-mini",
+    memory_mode: str = "trim",
+    archive: Optional["ChatArchive"] = None,
+) -> List[dict]:
+    """
+    เก็บรอบสนทนาตามโหมดความจำ — โหมด summary เก็บแบบเต็มแค่ไม่กี่รอบ ที่หลุดออกไปค้างใน pending
+    แล้วพับเป็นสรุปทีละ CHAT_SUMMARY_FOLD_BATCH รอบ (ไม่เรียก GPT ทุกข้อความ)
+    ถ้ามี archive ทุกรอบจะถูกเข้าคิวเขียนลง Postgres แบบ write-behind ด้วย
+    """
+    message = _with_token_counts(message, model)
+    if archive is not None:
+        archive.enqueue(user_id, message)
+
+    if memory_mode != "summary":
+        return await store_chat(redis_instance, user_id, message, model=model)
+
+    evicted = await store_chat(redis_instance, user_id, message, model=model, max_items=CHAT_SUMMARY_RECENT_TURNS)
+    if not evicted:
+        return evicted
+
+    # ✅ ย้ายเข้า pending ทันที (ก่อนตอบข้อความถัดไป) context จึงไม่มีช่วงที่รอบนี้หายไป
+    async with redis_instance.pipeline(transaction=True) as pipe:
+        pipe.rpush(_pending_key(user_id), *[encode_chat_entry(turn) for turn in evicted])
+        pipe.ltrim(_pending_key(user_id), -CHAT_HISTORY_MAX_ITEMS, -1)
+        pipe.expire(_pending_key(user_id), CHAT_HISTORY_TTL)
+        pending_count, _, _ = await pipe.execute()
+
+    if pending_count >= CHAT_SUMMARY_FOLD_BATCH:
+        task = asyncio.create_task(fold_into_summary(redis_instance, user_id))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+    return evicted
+
+# 🗄️ ผู้ใช้ที่กลับมาหลัง Redis หมดอายุ → ดึงรอบล่าสุดจาก Postgres กลับเข้า Redis (ครั้งเดียวต่อ TTL)
+async def hydrate_from_archive(redis_instance: Redis, archive: "ChatArchive", user_id: int, limit: int) -> int:
+    key = f"chat:{user_id}"
+    if not await redis_instance.set(f"chat_hydrated:{user_id}", "1", nx=True, ex=CHAT_HISTORY_TTL):
+        return 0
+    if await redis_instance.exists(key):
+        return 0
+
+    try:
+        turns = await archive.load_recent(user_id, limit)
+    except Exception as e:
+        logger.warning(f"⚠️ ดึงประวัติแชทของ {user_id} จาก Postgres ไม่ได้: {e}")
+        return 0
+    if not turns:
+        return 0
+
+    async with redis_instance.pipeline(transaction=True) as pipe:
+        pipe.rpush(key, *[encode_chat_entry(turn) for turn in turns])
+        pipe.expire(key, CHAT_HISTORY_TTL)
+        await pipe.execute()
+    logger.info(f"🗄️ โหลดประวัติแชท {len(turns)} รอบของ {user_id} กลับเข้า Redis")
+    return len(turns)
 
 # ✅ สร้าง context แบบ "เหมือน ChatGPT" (คุม token limit ฉลาด)
 async def build_chat_context_smart(
@@ -28,27 +229,69 @@ async def build_chat_context_smart(
     model: str = "gpt-4o-mini",
     max_tokens_context: int = 1000,
     initial_limit: int = 6,
+    memory_mode: str = "trim",
+    archive: Optional["ChatArchive"] = None,
 ) -> List[dict]:
-    messages = [{"role": "system", "content": system_prompt}]
-    history = await get_chat_history(redis_instance, user_id, limit=initial_limit)
+    if archive is not None:
+        hydrate_limit = CHAT_SUMMARY_RECENT_TURNS if memory_mode == "summary" else CHAT_HISTORY_MAX_ITEMS
+        await hydrate_from_archive(redis_instance, archive, user_id, hydrate_limit)
+
+    system_message = {"role": "system", "content": system_prompt}
+    input_message = {"role": "user", "content": new_input}
+    prefix = [system_message]
+
+    # ✅ โหมด summary: ข้อความเก่าถูกพับเป็นสรุปเดียว + รอบที่ยังรอพับ + ไม่กี่รอบล่าสุดแบบเต็ม
+    # อ่านทั้งสามใน transaction เดียว กันรอบที่กำลังพับเสร็จหายหรือซ้ำ
+    if memory_mode == "summary":
+        initial_limit = min(initial_limit, CHAT_SUMMARY_RECENT_TURNS)
+        async with redis_instance.pipeline(transaction=True) as pipe:
+            pipe.get(_summary_key(user_id))
+            pipe.lrange(_pending_key(user_id), 0, -1)
+            pipe.lrange(f"chat:{user_id}", -initial_limit, -1)
+            summary, pending, recent = await pipe.execute()
+        if summary:
+            prefix.append({"role": "system", "content": f"📝 ความจำจากบทสนทนาก่อนหน้า: {summary}"})
+        history = [decode_chat_entry(raw) for raw in pending + recent]
+    else:
+        history = await get_chat_history(redis_instance, user_id, limit=initial_limit)
+
+    # ✅ งบ token ที่เหลือให้ประวัติ หลังหัก system (+สรุป) + ข้อความใหม่
+    budget = (
+        max_tokens_context
+        - REPLY_PRIMING
+        - sum(count_message_tokens(message, model) for message in prefix)
+        - count_message_tokens(input_message, model)
+    )
 
-    for entry in history:
+    # ✅ เดินจากใหม่สุด → เก่าสุดรอบเดียว ใช้ token ที่เก็บไว้ตอน store_chat ไม่ encode ซ้ำ
+    # (ได้ผลเหมือนการลบข้อความเก่าสุดทีละอันจนกว่าจะพอดีงบ)
+    kept: List[dict] = []
+    for entry in reversed(history):
         q = entry.get("question")
         r = entry.get("response")
-        if q and r:
-            messages.append({"role": "user", "content": q})
-            messages.append({"role": "assistant", "content": r})
+        if not (q and r):
+            continue
 
-    messages.append({"role": "user", "content": new_input})
+        r_cost = message_tokens_from_content("assistant", _content_tokens(entry, "response", model), model)
+        if r_cost > budget:
+            break
+        budget -= r_cost
+        kept.append({"role": "assistant", "content": r})
 
-    # ✅ ตัด context ถ้า token เกิน
-    while True:
-        token_used = count_tokens(messages, model=model)
-        if token_used <= max_tokens_context or len(messages) <= 2:
+        q_cost = message_tokens_from_content("user", _content_tokens(entry, "question", model), model)
+        if q_cost > budget:
             break
-        messages.pop(1)  # ลบข้อความที่ 1 ออก (หลัง system) เพื่อให้ยังคง "สั้น+ใหม่สุด"
+        budget -= q_cost
+        kept.append({"role": "user", "content": q})
+
+    kept.reverse()
+    return [*prefix, *kept, input_message]
 
-    return messages
+def _content_tokens(entry: dict, field: str, model: str) -> int:
+    tokens = entry.get(f"{field}_tokens")
+    if tokens is None:  # ข้อมูลเก่าที่เก็บก่อนมีการนับ token
+        tokens = count_text_tokens(entry[field], model)
+    return tokens
 
 # ✅ ดึงข้อความล่าสุด
 async def get_previous_message(redis_instance: Redis, user_id: int) -> Optional[str]:
@@ -58,7 +301,32 @@ async def get_previous_message(redis_instance: Redis, user_id: int) -> Optional[
         return None
 
     try:
-        last = json.loads(raw_messages[0])
+        last = decode_chat_entry(raw_messages[0])
         return last.get("question")
     except Exception:
         return None
+
+# 📏 หน่วยความจำ Redis ที่ใช้ต่อผู้ใช้ (ไว้ประเมินขนาด instance)
+async def get_chat_memory_usage(redis_instance: Redis, user_id: int) -> int:
+    return await redis_instance.memory_usage(f"chat:{user_id}") or 0
+
+async def report_chat_memory(redis_instance: Redis, sample_size: int = 200) -> dict:
+    """สุ่มวัด key chat:* ด้วย MEMORY USAGE แล้วประมาณรวมทั้งหมด"""
+    user_count, sampled = 0, []
+    async for key in redis_instance.scan_iter(match="chat:*", count=500):
+        user_count += 1
+        if len(sampled) < sample_size:
+            sampled.append(await redis_instance.memory_usage(key) or 0)
+
+    avg = sum(sampled) / len(sampled) if sampled else 0
+    report = {
+        "active_users": user_count,
+        "avg_bytes_per_user": int(avg),
+        "max_bytes_per_user": max(sampled, default=0),
+        "estimated_total_bytes": int(avg * user_count),
+    }
+    logger.info(
+        f"📏 chat memory: users={report['active_users']} avg={report['avg_bytes_per_user']}B "
+        f"max={report['max_bytes_per_user']}B total≈{report['estimated_total_bytes']}B"
+    )
+    return report
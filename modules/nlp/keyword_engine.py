@@ -0,0 +1,191 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# 🔤 Aho–Corasick: สร้าง automaton ครั้งเดียว แล้วสแกนข้อความรอบเดียวได้ทุกคำพร้อมกัน
+
+def _is_word_char(ch: str) -> bool:
+    """นิยามเดียวกับ \\w ของ re (str.isalnum() หรือ _) ใช้เช็ก \\b"""
+    return ch.isalnum() or ch == "_"
+
+@dataclass(frozen=True)
+class KeywordHit:
+    label: str
+    keyword: str
+    start: int
+    end: int
+    line: int
+
+@dataclass
+class SequenceRule:
+    """
+    เทียบเท่า regex แบบ A.*B.*C ในบรรทัดเดียวกัน โดยแต่ละ step เป็น label ของกลุ่มคำ
+    เช่น ข่าว.*แผ่นดินไหว → SequenceRule("important", ["imp:ข่าว", "imp:แผ่นดินไหว"])
+    """
+    name: str
+    steps: Sequence[str]
+
+    def matches(self, hits_by_label: Dict[str, List[KeywordHit]]) -> bool:
+        first = hits_by_label.get(self.steps[0])
+        if not first:
+            return False
+        for line in {hit.line for hit in first}:
+            position = -1
+            for step in self.steps:
+                # เลือกตัวที่จบเร็วที่สุด (greedy) หลังจาก step ก่อนหน้า ในบรรทัดเดียวกัน
+                ends = [h.end for h in hits_by_label.get(step, ()) if h.line == line and h.start >= position]
+                if not ends:
+                    break
+                position = min(ends)
+            else:
+                return True
+        return False
+
+@dataclass
+class ScanResult:
+    hits: List[KeywordHit] = field(default_factory=list)
+    _by_label: Optional[Dict[str, List[KeywordHit]]] = field(default=None, repr=False)
+
+    def by_label(self) -> Dict[str, List[KeywordHit]]:
+        if self._by_label is None:
+            grouped: Dict[str, List[KeywordHit]] = {}
+            for hit in self.hits:
+                grouped.setdefault(hit.label, []).append(hit)
+            self._by_label = grouped
+        return self._by_label
+
+    def labels(self) -> Set[str]:
+        return set(self.by_label())
+
+    def has(self, label: str) -> bool:
+        return label in self.by_label()
+
+    def keywords(self, label: str) -> List[str]:
+        return [hit.keyword for hit in self.by_label().get(label, ())]
+
+    def matches(self, rule: SequenceRule) -> bool:
+        return rule.matches(self.by_label())
+
+class KeywordEngine:
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # ทุก state เก็บ (label, keyword, ต้องเช็ก word boundary ไหม)
+        self._out: List[List[Tuple[str, str, bool]]] = [[]]
+        self._built = False
+
+    def add(self, keywords: Iterable[str], label: str, *, word_boundary: bool = False) -> "KeywordEngine":
+        """คำทั้งหมดถูกเก็บเป็นตัวพิมพ์เล็ก — ข้อความที่สแกนจะถูก lower ให้เอง"""
+        for keyword in keywords:
+            keyword = keyword.lower()
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((label, keyword, word_boundary))
+        self._built = False
+        return self
+
+    def build(self) -> "KeywordEngine":
+        queue = deque(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+        self._built = True
+        return self
+
+    def scan(self, text: str) -> ScanResult:
+        stream = self.stream()
+        stream.feed(text)
+        return stream.finish()
+
+    def stream(self) -> "KeywordStream":
+        if not self._built:
+            self.build()
+        return KeywordStream(self)
+
+class KeywordStream:
+    """สแกนข้อความที่ทยอยมาเป็นชิ้น ๆ (เช่น GPT stream) ต่อเนื่องจาก state เดิม"""
+
+    def __init__(self, engine: KeywordEngine):
+        self._engine = engine
+        self._state = 0
+        self._offset = 0
+        self._line = 0
+        self._window = ""  # ตัวอักษรท้าย ๆ ไว้ดูตัวก่อนหน้าคำ (เช็ก \b)
+        # รอดูตัวอักษรถัดไปก่อนยืนยัน \b ท้ายคำ (hit, ตัวท้ายเป็น word char ไหม)
+        self._pending: List[Tuple[KeywordHit, bool]] = []
+        self.result = ScanResult()
+
+    def _char_before(self, start: int, chunk: str, chunk_start: int) -> str:
+        index = start - 1
+        if index < 0:
+            return ""
+        if index >= chunk_start:
+            return chunk[index - chunk_start]
+        return self._window[index - (chunk_start - len(self._window))] if chunk_start - index <= len(self._window) else ""
+
+    def feed(self, chunk: str) -> List[KeywordHit]:
+        """สแกนชิ้นถัดไป คืนเฉพาะคำที่เพิ่งเจอในชิ้นนี้"""
+        chunk = chunk.lower()
+        goto, fail, out = self._engine._goto, self._engine._fail, self._engine._out
+        state = self._state
+        new_hits: List[KeywordHit] = []
+        chunk_start = self._offset
+
+        for i, ch in enumerate(chunk):
+            if self._pending:
+                is_word = _is_word_char(ch)
+                new_hits.extend(hit for hit, last_is_word in self._pending if is_word != last_is_word)
+                self._pending = []
+
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if ch == "\n":
+                self._line += 1
+            if not out[state]:
+                continue
+
+            end = chunk_start + i + 1
+            for label, keyword, word_boundary in out[state]:
+                start = end - len(keyword)
+                hit = KeywordHit(label, keyword, start, end, self._line)
+                if not word_boundary:
+                    new_hits.append(hit)
+                    continue
+                before = self._char_before(start, chunk, chunk_start)
+                if (bool(before) and _is_word_char(before)) == _is_word_char(keyword[0]):
+                    continue
+                self._pending.append((hit, _is_word_char(keyword[-1])))
+
+        self._state = state
+        self._offset += len(chunk)
+        self._window = (self._window + chunk)[-64:]
+        if new_hits:
+            self.result.hits.extend(new_hits)
+            self.result._by_label = None
+        return new_hits
+
+    def finish(self) -> ScanResult:
+        """จบ stream — ท้ายข้อความนับเป็น non-word เหมือน \\b ของ re"""
+        if self._pending:
+            self.result.hits.extend(hit for hit, last_is_word in self._pending if last_is_word)
+            self._pending = []
+            self.result._by_label = None
+        return self.result
@@ -1,4 +1,5 @@
 import re
+from dataclasses import dataclass, field
 from typing import Optional, Dict, List
 from modules.core.logger import logger
 
@@ -44,16 +45,79 @@ TOPIC_PATTERNS: Dict[str, List[re.Pattern]] = {
     }.items()
 }
 
-# ✅ ฟังก์ชันจับหัวข้อจากข้อความ
+# 🔀 หัวข้อที่ on_message เช็กต่อจาก TOPIC_PATTERNS (ลำดับความสำคัญต่ำกว่า)
+FOLLOWUP_PATTERNS: Dict[str, List[str]] = {
+    "tarot_reading": [r"\A(?:ความรัก|การงาน|การเงิน|สุขภาพ)(?:\s*\d+\s*ใบ)?\Z"],
+    "date": [r"วันนี้วันอะไร", r"วันอะไรวันนี้"],
+    "time": [r"กี่โมง", r"เวลากี่โมง"],
+}
+
+# ⚡ คำที่ต้องมีอย่างน้อยหนึ่งคำถ้าจะ match หัวข้อไหนได้ — ข้อความแชททั่วไปจะหลุดตรงนี้ทันที
+# (เพิ่ม pattern ใหม่ต้องแน่ใจว่ามีคำใดคำหนึ่งในนี้อยู่ด้วย)
+ROUTE_KEYWORDS = [
+    "น้ำมัน", "เบนซิน", "ดีเซล", "ทอง", "gold", "หวย", "สลากกินแบ่ง", "เลข",
+    "แลกเงิน", "อัตราแลกเปลี่ยน", "ค่าเงิน", "เรทเงิน", "exchange",
+    "อากาศ", "ฝนตก", "อุณหภูมิ", "ฟ้า", "weather", "ข่าว", "news", "เล่าเหตุการณ์วันนี้",
+    "ดูดวง", "ไพ่", "ทำนาย", "รูป", "ความรัก", "การงาน", "การเงิน", "สุขภาพ", "วันอะไร", "กี่โมง",
+]
+
+def _compile_router() -> re.Pattern:
+    """
+    รวมทุกหัวข้อเป็น regex เดียว: แต่ละหัวข้อเป็น lookahead เรียงตามลำดับความสำคัญ
+    alternation ที่ตำแหน่ง 0 จะเลือกหัวข้อแรกที่มี pattern ใดก็ได้ match ที่ไหนก็ได้ในข้อความ
+    (ได้ผลเหมือนวนเช็กทีละหัวข้อ) ต้องส่งข้อความตัวพิมพ์เล็กเข้ามา
+    """
+    topics = {
+        **{topic: [pattern.pattern for pattern in patterns] for topic, patterns in TOPIC_PATTERNS.items()},
+        **FOLLOWUP_PATTERNS,
+    }
+    alternatives = [
+        f"(?=[\\s\\S]*?(?P<{topic}>{'|'.join(patterns)}))" for topic, patterns in topics.items()
+    ]
+    return re.compile("^(?:" + "|".join(alternatives) + ")")
+
+ROUTER_PATTERN = _compile_router()
+ROUTE_PREFILTER = re.compile("|".join(map(re.escape, ROUTE_KEYWORDS)))
+WEATHER_CITY_PATTERN = re.compile(r"(ที่|จังหวัด|เมือง)\s+(.+)")
+IMAGE_PREFIX_PATTERN = re.compile(r"^(ดูรูป|ค้นรูป|หารูป|ขอรูป)[:,\s]*")
+TAROT_READING_PATTERN = re.compile(r"(ความรัก|การงาน|การเงิน|สุขภาพ)\s*(?:(\d+)\s*ใบ)?")
+
+@dataclass
+class Route:
+    topic: Optional[str] = None
+    args: Dict[str, str] = field(default_factory=dict)
+
+# ✅ จับหัวข้อ + ดึง argument (เมือง, คำค้นรูป, หัวข้อไพ่ + จำนวนใบ) ในการเรียกครั้งเดียว
+def route_message(text: str) -> Route:
+    text = text.strip().lower()
+    if not ROUTE_PREFILTER.search(text):
+        return Route()
+
+    match = ROUTER_PATTERN.match(text)
+    if not match:
+        return Route()
+
+    topic = match.lastgroup
+    args: Dict[str, str] = {}
+    if topic == "weather":
+        city = WEATHER_CITY_PATTERN.search(text)
+        if city:
+            args["city"] = city.group(2).strip()
+    elif topic == "image":
+        args["query"] = IMAGE_PREFIX_PATTERN.sub("", text)
+    elif topic == "tarot_reading":
+        reading = TAROT_READING_PATTERN.match(text)
+        args["tarot_topic"] = reading.group(1)
+        if reading.group(2):
+            args["tarot_cards"] = reading.group(2)
+
+    logger.debug(f"✅ route: '{topic}' args={args}")
+    return Route(topic, args)
+
+# ✅ ฟังก์ชันจับหัวข้อจากข้อความ (เฉพาะหัวข้อใน TOPIC_PATTERNS)
 def match_topic(text: str) -> Optional[str]:
-    text = text.strip()
-    for topic, patterns in TOPIC_PATTERNS.items():
-        for pattern in patterns:
-            if pattern.search(text):
-                logger.info(f"✅ หัวข้อที่ match: '{topic}' ด้วย pattern '{pattern.pattern}'")
-                return topic
-    logger.info("❌ ไม่พบหัวข้อที่ match กับข้อความ")
-    return None
+    topic = route_message(text).topic
+    return topic if topic in TOPIC_PATTERNS else None
 
 # ✅ DEBUG: ยืนยันว่าไฟล์โหลดสำเร็จ
 if __name__ == "__main__":
@@ -1,10 +1,13 @@
-from typing import Optional
+import json
+import asyncio
+from typing import List, Optional
 from modules.core.logger import logger
-from modules.core.openai_client import client
+from modules.core.openai_client import create_chat_completion
+from modules.core.openai_scheduler import PRIORITY_BACKGROUND
 from modules.utils.cleaner import clean_output_text
 
 # ✅ สรุปข้อความทั่วไปด้วย GPT
-async def summarize_with_gpt(text: str) -> str:
+async def summarize_with_gpt(text: str, priority: int = PRIORITY_BACKGROUND) -> str:
     messages = [
         {
             "role": "system",
@@ -21,7 +24,8 @@ async def summarize_with_gpt(text: str) -> str:
 
     try:
         logger.info("🔮 เริ่มสรุปข้อความด้วย GPT")
-        response = await client.chat.completions.create(
+        response = await create_chat_completion(
+            priority=priority,
             model="gpt-4o-mini",
             messages=messages,
             max_tokens=500,
@@ -33,8 +37,101 @@ async def summarize_with_gpt(text: str) -> str:
         logger.error(f"❌ สรุปข้อความด้วย GPT ล้มเหลว: {e}")
         return "⚠️ พี่หลามสรุปไม่ได้ตอนนี้ ขออภัยจ้า"
 
-# ✅ สรุปคำทำนายไพ่ยิปซีแบบกระชับ โดยใช้ GPT
-async def summarize_tarot_reading(text: str, topic: str) -> str:
+NEWS_BATCH_SIZE = 5              # ข่าวต่อหนึ่ง request (มากกว่านี้แบ่ง batch แล้วยิงพร้อมกัน)
+NEWS_SUMMARY_TOKENS_PER_ITEM = 200
+
+async def _summarize_news_chunk(texts: List[str], priority: int) -> List[str]:
+    numbered = "\n\n".join(f"[{i}]\n{text}" for i, text in enumerate(texts, start=1))
+    messages = [
+        {
+            "role": "system",
+            "content": (
+                "สรุปข่าวแต่ละข้อให้สั้น กระชับ ไม่เกิน 3-4 ประโยค "
+                "ใช้ภาษาพูดที่เข้าใจง่าย เป็นกันเอง "
+                'ตอบเป็น JSON เท่านั้น รูปแบบ {"summaries": [{"id": 1, "summary": "..."}]} '
+                "ให้ครบทุกข้อตามลำดับ id"
+            )
+        },
+        {
+            "role": "user",
+            "content": f"สรุปข่าวต่อไปนี้ทีละข้อ:\n\n{numbered}"
+        }
+    ]
+
+    response = await create_chat_completion(
+        priority=priority,
+        model="gpt-4o-mini",
+        messages=messages,
+        max_tokens=NEWS_SUMMARY_TOKENS_PER_ITEM * len(texts) + 100,
+        temperature=0.7,
+        response_format={"type": "json_object"},
+    )
+    data = json.loads(response.choices[0].message.content)
+    by_id = {
+        int(item["id"]): item["summary"].strip()
+        for item in data.get("summaries", [])
+        if isinstance(item, dict) and item.get("summary")
+    }
+
+    # ข้อไหนหายไปจากคำตอบ → สรุปเดี่ยวเฉพาะข้อนั้น (ยิงพร้อมกัน)
+    missing = [i for i in range(1, len(texts) + 1) if i not in by_id]
+    if missing:
+        logger.warning(f"⚠️ batch summary ขาด {len(missing)} ข้อ สรุปแยกแทน")
+        fallback = await asyncio.gather(*(summarize_with_gpt(texts[i - 1], priority) for i in missing))
+        by_id.update(zip(missing, fallback))
+
+    return [clean_output_text(by_id[i]) for i in range(1, len(texts) + 1)]
+
+# ✅ สรุปข่าวหลายข่าวในคำขอเดียว (ถ้าพังค่อยสรุปทีละข่าวแบบขนาน)
+# priority: ผู้ใช้รออยู่ (cache miss จาก on_message) ส่ง PRIORITY_INTERACTIVE, refresh เบื้องหลังใช้ค่า default
+async def summarize_news_batch(texts: List[str], priority: int = PRIORITY_BACKGROUND) -> List[str]:
+    if not texts:
+        return []
+
+    chunks = [texts[i:i + NEWS_BATCH_SIZE] for i in range(0, len(texts), NEWS_BATCH_SIZE)]
+    logger.info(f"🔮 สรุปข่าว {len(texts)} ข่าว ใน {len(chunks)} request")
+    results = await asyncio.gather(*(_summarize_news_chunk(chunk, priority) for chunk in chunks), return_exceptions=True)
+
+    summaries: List[str] = []
+    for chunk, result in zip(chunks, results):
+        if isinstance(result, Exception):
+            logger.error(f"❌ batch summary ล้มเหลว ({result}) สรุปทีละข่าวแทน")
+            result = await asyncio.gather(*(summarize_with_gpt(text, priority) for text in chunk))
+        summaries.extend(result)
+    return summaries
+
+# ✅ พับบทสนทนาเก่าเข้ากับสรุปเดิม ให้เหลือสรุปเดียวที่สั้นและคงที่
+async def summarize_conversation(previous_summary: Optional[str], turns: List[dict], max_tokens: int = 250) -> str:
+    dialogue = "\n".join(
+        f"ผู้ใช้: {turn.get('question', '')}\nพี่หลาม: {turn.get('response', '')}" for turn in turns
+    )
+    messages = [
+        {
+            "role": "system",
+            "content": (
+                "คุณช่วยจดบันทึกความจำของบทสนทนา รวมสรุปเดิมกับบทสนทนาใหม่ให้เป็นสรุปเดียว "
+                "เก็บเฉพาะข้อเท็จจริงเกี่ยวกับผู้ใช้ ความชอบ เรื่องที่คุยค้างไว้ และสิ่งที่รับปากไว้ "
+                "เขียนเป็นข้อความสั้น ๆ ไม่เกิน 120 คำ ไม่ต้องเกริ่น"
+            )
+        },
+        {
+            "role": "user",
+            "content": f"สรุปเดิม:\n{previous_summary or '-'}\n\nบทสนทนาใหม่:\n{dialogue}"
+        }
+    ]
+
+    logger.info(f"🧠 พับบทสนทนา {len(turns)} รอบเข้าสรุปความจำ")
+    response = await create_chat_completion(
+        priority=PRIORITY_BACKGROUND,
+        model="gpt-4o-mini",
+        messages=messages,
+        max_tokens=max_tokens,
+        temperature=0.3
+    )
+    return response.choices[0].message.content.strip()
+
+# ✅ สรุปคำทำนายไพ่ยิปซีแบบกระชับ โดยใช้ GPT (เสริมทีหลัง — ล้มเหลวคืน None ผู้ใช้ยังมีสรุปจาก template อยู่)
+async def summarize_tarot_reading(text: str, topic: str, priority: int = PRIORITY_BACKGROUND) -> Optional[str]:
     messages = [
         {
             "role": "system",
@@ -56,7 +153,8 @@ async def summarize_tarot_reading(text: str, topic: str) -> str:
 
     try:
         logger.info(f"🔮 เริ่มสรุปคำทำนายไพ่ยิปซี หัวข้อ: '{topic}' ด้วย GPT")
-        response = await client.chat.completions.create(
+        response = await create_chat_completion(
+            priority=priority,
             model="gpt-4o-mini",
             messages=messages,
             max_tokens=500,
@@ -65,5 +163,5 @@ async def summarize_tarot_reading(text: str, topic: str) -> str:
         result = response.choices[0].message.content.strip()
         return clean_output_text(result)
     except Exception as e:
-        logger.error(f"❌ สรุปคำทำนายไพ่ยิปซีด้วย GPT ล้มเหลว: {e}")
-        return "⚠️ แม่หมอขอพักแป๊บนึง ลองใหม่อีกครั้งนะลูก"
+        logger.warning(f"⚠️ สรุปคำทำนายไพ่ยิปซีด้วย GPT ล้มเหลว ใช้สรุปจาก template ต่อ: {e}")
+        return None
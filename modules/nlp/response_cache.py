@@ -0,0 +1,157 @@
+import re
+import time
+import random
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from modules.core.config import (
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_THRESHOLD,
+    RESPONSE_CACHE_TTL,
+)
+from modules.core.logger import logger
+from modules.utils.text_normalize import normalize_query
+
+# 🔢 MinHash 64 ค่า แบ่ง LSH เป็น 16 band × 4 row
+# คู่ที่ Jaccard 0.8 เป็น candidate เกือบแน่นอน (~99.9%) ส่วน 0.3 แทบไม่หลุดมา
+SHINGLE_SIZE = 3
+NUM_PERM = 64
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERM // LSH_BANDS
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_rng = random.Random(1350812185)  # seed คงที่ → signature เหมือนกันทุก process
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(NUM_PERM)]
+
+# คำลงท้ายสุภาพไม่เปลี่ยนความหมายของคำถาม
+_POLITE_ENDINGS = re.compile(r"(ครับผม|ครับ|คับ|ค่ะ|คะ|จ้า|จ้ะ|นะ|หน่อย|ป่ะ|อ่ะ)+$")
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> FrozenSet[str]:
+    """character shingle ของคำถามที่ normalize แล้ว (ภาษาไทยไม่มีช่องว่างระหว่างคำ ใช้ตัวอักษรดีกว่าคำ)"""
+    text = _POLITE_ENDINGS.sub("", normalize_query(text).replace(" ", ""))
+    if len(text) <= size:
+        return frozenset([text]) if text else frozenset()
+    return frozenset(text[i:i + size] for i in range(len(text) - size + 1))
+
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "little")
+
+def minhash(shingle_set: FrozenSet[str]) -> Tuple[int, ...]:
+    hashes = [_shingle_hash(s) for s in shingle_set]
+    if not hashes:
+        return tuple([_MAX_HASH] * NUM_PERM)
+    return tuple(
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+@dataclass
+class _Entry:
+    question: str
+    shingles: FrozenSet[str]
+    bands: Tuple[Tuple[int, ...], ...]
+    answer: str
+    created_at: float
+
+class ResponseCache:
+    """
+    cache คำตอบในหน่วยความจำ: หา candidate ด้วย LSH แล้วยืนยันด้วย Jaccard จริงของ shingle
+    จำกัดจำนวนด้วย LRU (ถูกใช้ล่าสุดอยู่ท้าย) และหมดอายุตาม ttl
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES, threshold: float = RESPONSE_CACHE_THRESHOLD, ttl: int = RESPONSE_CACHE_TTL):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._buckets: List[Dict[Tuple[int, ...], Set[int]]] = [{} for _ in range(LSH_BANDS)]
+        self._next_id = 0
+        self.stats = {"hit": 0, "miss": 0, "store": 0, "evict": 0, "expired": 0}
+
+    @staticmethod
+    def _bands(signature: Tuple[int, ...]) -> Tuple[Tuple[int, ...], ...]:
+        return tuple(signature[i * LSH_ROWS:(i + 1) * LSH_ROWS] for i in range(LSH_BANDS))
+
+    def _remove(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id)
+        for bucket, band in zip(self._buckets, entry.bands):
+            ids = bucket.get(band)
+            if ids is not None:
+                ids.discard(entry_id)
+                if not ids:
+                    del bucket[band]
+
+    def lookup(self, question: str) -> Optional[str]:
+        shingle_set = shingles(question)
+        bands = self._bands(minhash(shingle_set))
+        candidates: Set[int] = set()
+        for bucket, band in zip(self._buckets, bands):
+            candidates |= bucket.get(band, set())
+
+        best_id, best_score = None, 0.0
+        now = time.time()
+        for entry_id in candidates:
+            entry = self._entries[entry_id]
+            if now - entry.created_at > self.ttl:
+                self._remove(entry_id)
+                self.stats["expired"] += 1
+                continue
+            score = jaccard(shingle_set, entry.shingles)
+            if score > best_score:
+                best_id, best_score = entry_id, score
+
+        if best_id is None or best_score < self.threshold:
+            self.stats["miss"] += 1
+            return None
+
+        self._entries.move_to_end(best_id)
+        self.stats["hit"] += 1
+        entry = self._entries[best_id]
+        logger.info(f"♻️ response cache hit ({best_score:.2f}): '{question}' ≈ '{entry.question}'")
+        return entry.answer
+
+    def store(self, question: str, answer: str) -> None:
+        shingle_set = shingles(question)
+        if not shingle_set:
+            return
+        entry_id = self._next_id
+        self._next_id += 1
+        bands = self._bands(minhash(shingle_set))
+        self._entries[entry_id] = _Entry(question, shingle_set, bands, answer, time.time())
+        for bucket, band in zip(self._buckets, bands):
+            bucket.setdefault(band, set()).add(entry_id)
+        self.stats["store"] += 1
+
+        while len(self._entries) > self.max_entries:
+            oldest_id = next(iter(self._entries))
+            self._remove(oldest_id)
+            self.stats["evict"] += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def status(self) -> Dict[str, int]:
+        return dict(self.stats, size=len(self._entries))
+
+    def log_status(self) -> None:
+        status = self.status()
+        total = status["hit"] + status["miss"]
+        rate = status["hit"] / total if total else 0.0
+        logger.info(
+            f"♻️ response cache size={status['size']} hit={status['hit']} miss={status['miss']} "
+            f"({rate:.0%}) store={status['store']} evict={status['evict']} expired={status['expired']}"
+        )
+
+def is_cacheable_answer(answer: Optional[str]) -> bool:
+    """ไม่เก็บข้อความ error / คิวเต็ม / circuit เปิด"""
+    return bool(answer) and not answer.startswith(("⚠️", "⏳", "❌"))
+
+response_cache = ResponseCache()
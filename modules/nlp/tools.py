@@ -0,0 +1,106 @@
+import json
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from redis.asyncio import Redis
+
+from modules.core.feature_cache import get_cached_feature
+from modules.core.logger import logger
+from modules.features.gold_price import get_gold_price_today
+from modules.features.oil_price import get_oil_price_today
+from modules.features.exchange_rate import get_exchange_rate
+from modules.features.lottery_checker import get_lottery_results
+from modules.features.weather_forecast import get_weather
+from modules.features.google_search import search_google, summarize_google_results
+from modules.utils.cleaner import search_tool
+from modules.utils.thai_to_eng_city import convert_thai_to_english_city
+
+# 🛠️ เครื่องมือที่ GPT เรียกได้เอง (function calling) — หลายตัวในรอบเดียวรันพร้อมกัน
+def _feature_tool(name: str, description: str, properties: Optional[Dict] = None, required: Optional[List[str]] = None) -> Dict:
+    return {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": description,
+            "parameters": {
+                "type": "object",
+                "properties": properties or {},
+                "required": required or [],
+            },
+        },
+    }
+
+TOOL_SCHEMAS = [
+    search_tool,
+    _feature_tool("get_gold_price", "ราคาทองคำไทยวันนี้"),
+    _feature_tool("get_oil_price", "ราคาน้ำมันในไทยวันนี้"),
+    _feature_tool("get_exchange_rate", "อัตราแลกเปลี่ยนเงินบาทวันนี้"),
+    _feature_tool("get_lottery_results", "ผลสลากกินแบ่งรัฐบาลงวดล่าสุด"),
+    _feature_tool(
+        "get_weather",
+        "พยากรณ์อากาศของเมือง",
+        {"city": {"type": "string", "description": "ชื่อเมือง ภาษาไทยหรืออังกฤษ เช่น เชียงใหม่"}},
+        ["city"],
+    ),
+]
+
+async def _run_tool(name: str, args: Dict[str, Any], settings, redis_instance: Optional[Redis], search_plan=None) -> str:
+    if name == "search_google":
+        if search_plan is not None and search_plan.prefetch is not None and not search_plan.used:
+            # ✅ มีการค้นล่วงหน้า (route borderline) อยู่แล้ว → ใช้ผลนั้น ไม่ยิง Custom Search ซ้ำให้เสียโควต้า
+            results = await search_plan.results(settings)
+        else:
+            results = await search_google(args.get("query", ""), settings, redis_instance)
+        return summarize_google_results(results) or "ไม่พบผลการค้นหา"
+    if name == "get_gold_price":
+        return await get_cached_feature(redis_instance, "gold", get_gold_price_today)
+    if name == "get_oil_price":
+        return await get_cached_feature(redis_instance, "oil", get_oil_price_today)
+    if name == "get_exchange_rate":
+        return await get_cached_feature(redis_instance, "exchange", get_exchange_rate)
+    if name == "get_lottery_results":
+        return await get_cached_feature(redis_instance, "lotto", get_lottery_results)
+    if name == "get_weather":
+        eng_city = convert_thai_to_english_city(args.get("city", "Bangkok"))
+        return await get_cached_feature(
+            redis_instance, "weather", lambda: get_weather(eng_city), key_suffix=eng_city.lower()
+        )
+    return f"❌ ไม่รู้จักเครื่องมือ {name}"
+
+async def _run_tool_call(call: Dict[str, Any], settings, redis_instance: Optional[Redis], search_plan=None) -> Dict[str, str]:
+    name = call["function"]["name"]
+    try:
+        args = json.loads(call["function"].get("arguments") or "{}")
+        content = await _run_tool(name, args, settings, redis_instance, search_plan)
+    except Exception as e:
+        logger.error(f"❌ tool '{name}' ล้มเหลว: {e}")
+        content = f"❌ เรียก {name} ไม่สำเร็จ"
+    return {"role": "tool", "tool_call_id": call["id"], "content": content}
+
+async def run_tool_calls(
+    tool_calls: List[Dict[str, Any]], settings, redis_instance: Optional[Redis] = None, search_plan=None
+) -> List[Dict[str, str]]:
+    """
+    รันทุก tool call ที่ GPT ขอในรอบเดียวพร้อมกัน คืน message role=tool เรียงตามลำดับเดิม
+    search_plan (SearchPlan ของ query_utils) = search_google ตัวแรกใช้ผลที่ค้นล่วงหน้าไว้แทนการค้นใหม่
+    """
+    logger.info(f"🛠️ GPT เรียก tools: {', '.join(call['function']['name'] for call in tool_calls)}")
+    return await asyncio.gather(*(_run_tool_call(call, settings, redis_instance, search_plan) for call in tool_calls))
+
+def tool_call_message(tool_calls: List[Dict[str, Any]], content: Optional[str] = None) -> Dict[str, Any]:
+    """message ของ assistant ที่ต้องแนบกลับไปก่อนผลของ tool ตาม protocol"""
+    return {"role": "assistant", "content": content, "tool_calls": tool_calls}
+
+def merge_tool_call_deltas(calls: List[Dict[str, Any]], deltas) -> None:
+    """ประกอบ tool_calls ที่ stream มาเป็นชิ้น ๆ (ต่อ arguments ตาม index)"""
+    for delta in deltas:
+        while len(calls) <= delta.index:
+            calls.append({"id": "", "type": "function", "function": {"name": "", "arguments": ""}})
+        call = calls[delta.index]
+        if delta.id:
+            call["id"] = delta.id
+        if delta.function:
+            if delta.function.name:
+                call["function"]["name"] += delta.function.name
+            if delta.function.arguments:
+                call["function"]["arguments"] += delta.function.arguments
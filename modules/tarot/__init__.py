@@ -1 +1 @@
-from .tarot_reading import draw_cards_and_interpret_by_topic
+from .tarot_reading import draw_cards_and_interpret_by_topic, draw_tarot_reading, get_tarot_reply, enrich_in_background
@@ -0,0 +1,66 @@
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from modules.tarot.tarot_card import TarotCard
+from modules.tarot.tarot_meanings_by_topic import TAROT_MEANINGS_BY_TOPIC
+from modules.tarot.tarot_reversed_meanings_by_topic import TAROT_REVERSED_MEANINGS_BY_TOPIC
+
+TAROT_TOPICS = ("ความรัก", "การงาน", "การเงิน", "สุขภาพ")
+SUITS = ("Wands", "Cups", "Swords", "Pentacles")
+RANKS = {
+    "Ace": 1, "Two": 2, "Three": 3, "Four": 4, "Five": 5, "Six": 6, "Seven": 7,
+    "Eight": 8, "Nine": 9, "Ten": 10, "Page": 11, "Knight": 12, "Queen": 13, "King": 14,
+}
+
+def _build_card(index: int, name: str, topic: str) -> TarotCard:
+    upright = TAROT_MEANINGS_BY_TOPIC[name][topic]
+    reversed_meaning = TAROT_REVERSED_MEANINGS_BY_TOPIC[name][topic]
+    rank, _, suit = name.partition(" of ")
+    if suit in SUITS:
+        return TarotCard(name, upright, reversed_meaning, "Minor", suit, RANKS[rank])
+    return TarotCard(name, upright, reversed_meaning, "Major", number=index)
+
+# 🃏 สำรับแยกตามหัวข้อ สร้างครั้งเดียวตอน import — ตอนเปิดไพ่แค่หยิบตาม index ไม่ต้องค้น dict
+CARD_NAMES: Tuple[str, ...] = tuple(TAROT_MEANINGS_BY_TOPIC)
+DECK: Dict[str, Tuple[TarotCard, ...]] = {
+    topic: tuple(_build_card(index, name, topic) for index, name in enumerate(CARD_NAMES))
+    for topic in TAROT_TOPICS
+}
+
+@dataclass(frozen=True)
+class TarotSpread:
+    name: str
+    title: str
+    positions: Tuple[str, ...]
+
+    @property
+    def size(self) -> int:
+        return len(self.positions)
+
+# 🔮 รูปแบบการวางไพ่ — ใบสุดท้ายของทุก spread คือแนวโน้ม/ผลลัพธ์ (ใช้ตอนสรุป)
+SPREADS: Dict[int, TarotSpread] = {
+    spread.size: spread
+    for spread in (
+        TarotSpread("three", "ไพ่ 3 ใบ อดีต–ปัจจุบัน–อนาคต", ("อดีต", "ปัจจุบัน", "อนาคต")),
+        TarotSpread(
+            "five",
+            "ไพ่ 5 ใบ",
+            ("สถานการณ์ตอนนี้", "อุปสรรค", "สิ่งที่ซ่อนอยู่", "คำแนะนำ", "แนวโน้ม"),
+        ),
+        TarotSpread(
+            "celtic_cross",
+            "ไพ่ 10 ใบ แบบเซลติกครอส",
+            (
+                "สถานการณ์ตอนนี้", "สิ่งที่ขวางอยู่", "เป้าหมาย", "รากของเรื่อง", "อดีตที่เพิ่งผ่านไป",
+                "อนาคตอันใกล้", "ตัวคุณ", "คนรอบข้าง", "ความหวังและความกลัว", "ผลลัพธ์",
+            ),
+        ),
+    )
+}
+DEFAULT_SPREAD = SPREADS[3]
+
+def get_spread(size: Optional[int] = None) -> TarotSpread:
+    """เลือก spread ตามจำนวนใบ จำนวนที่ไม่มีจะได้ spread ที่ใกล้ที่สุด"""
+    if not size:
+        return DEFAULT_SPREAD
+    return SPREADS[min(SPREADS, key=lambda n: (abs(n - size), n))]
@@ -1,33 +1,205 @@
-import random
-from modules.tarot.tarot_meanings_by_topic import TAROT_MEANINGS_BY_TOPIC
-from modules.nlp.openai_utils import summarize_tarot_reading
-
-def draw_multiple_cards(n=3):
-    all_card_names = list(TAROT_MEANINGS_BY_TOPIC.keys())
-    selected_names = random.sample(all_card_names, k=n)
-    return [(name, random.choice([True, False])) for name in selected_names]
-
-async def draw_cards_and_interpret_by_topic(topic: str) -> str:
-    cards = draw_multiple_cards(3)
-
-    card_blocks = []
-    gpt_input_lines = []
-
-    for name, is_reversed in cards:
-        card_data = TAROT_MEANINGS_BY_TOPIC.get(name, {})
-        meaning = card_data.get(topic, "❌ ไม่พบคำทำนายในหัวข้อนี้")
-        direction = "กลับหัว" if is_reversed else "ปกติ"
-
-        card_blocks.append(
-            f"🔹 **{name}** ({direction})\n💬 _{meaning}_"
-        )
-        gpt_input_lines.append(f"{name} ({direction}): {meaning}")
-
-    reading_text = "\n".join(gpt_input_lines)
-    summary = await summarize_tarot_reading(reading_text, topic)
-
-    return (
-        f"🔮 **คำทำนายเรื่อง {topic} ของคุณ:**\n\n"
-        f"🃏 ไพ่ที่คุณได้:\n\n" + "\n\n".join(card_blocks) + "\n\n"
-        f"📝 **สรุปคำทำนาย:**\n{summary}"
-    )
+import asyncio
+import random
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import discord
+import pytz
+from redis.asyncio import Redis
+
+from modules.core.config import TAROT_MODE
+from modules.core.logger import logger
+from modules.nlp.openai_utils import summarize_tarot_reading
+from modules.tarot.tarot_card import TarotCard
+from modules.tarot.tarot_deck import CARD_NAMES, DECK, TarotSpread, get_spread
+from modules.utils.cleaner import format_reply
+from modules.utils.discord_utils import edit_reply
+
+# 🌗 ธาตุของไพ่แต่ละชุด ใช้บอกว่าเรื่องนี้หนักไปทางไหน
+SUIT_THEMES = {
+    "Wands": "ไฟ เรื่องนี้ขับเคลื่อนด้วยแรงผลักดันและการลงมือทำ",
+    "Cups": "น้ำ เรื่องนี้ผูกกับอารมณ์และความรู้สึกเป็นหลัก",
+    "Swords": "ลม เรื่องนี้อยู่ที่ความคิด การตัดสินใจ และการสื่อสาร",
+    "Pentacles": "ดิน เรื่องนี้วนอยู่กับเงิน งาน และความมั่นคง",
+}
+TOPIC_ADVICE = {
+    "ความรัก": "เปิดใจคุยกันตรง ๆ และให้เวลากับคนสำคัญ",
+    "การงาน": "วางแผนให้ชัด ทำทีละขั้น และอย่ารับงานเกินตัว",
+    "การเงิน": "จดรายรับรายจ่าย กันเงินสำรองไว้ก่อนคิดลงทุน",
+    "สุขภาพ": "นอนให้พอ กินให้ครบ และฟังสัญญาณจากร่างกาย",
+}
+TONE_OPENINGS = (
+    (2 / 3, "ภาพรวมเรื่อง{topic}ค่อนข้างสดใส ไพ่ส่วนใหญ่ออกมาในทางบวก"),
+    (1 / 3, "ภาพรวมเรื่อง{topic}มีทั้งเรื่องดีและเรื่องที่ต้องประคอง"),
+    (0.0, "ภาพรวมเรื่อง{topic}ยังติดขัดอยู่บ้าง หลายอย่างยังไม่ลงตัว"),
+)
+
+REPEAT_NOTICE = "🔁 วันนี้เปิดไพ่เรื่องนี้ไปแล้ว ไพ่ยังเป็นชุดเดิมนะ อยากเปิดใหม่รอหลังเที่ยงคืน\n\n"
+
+_background_tasks: set = set()
+_stats: Dict[str, int] = {"hit": 0, "miss": 0, "enriched": 0}
+
+@dataclass(frozen=True)
+class DrawnCard:
+    card: TarotCard
+    is_reversed: bool
+    position: str
+
+    @property
+    def meaning(self) -> str:
+        return self.card.get_meaning(self.is_reversed)
+
+    @property
+    def direction(self) -> str:
+        return "กลับหัว" if self.is_reversed else "ปกติ"
+
+@dataclass
+class TarotReading:
+    topic: str
+    spread: TarotSpread
+    cards: List[DrawnCard]
+    cache_key: Optional[str] = None  # โหมด daily: key ใน Redis ที่ต้องอัปเดตเมื่อได้สรุปจาก GPT
+
+    def render(self, summary: Optional[str] = None) -> str:
+        """คำทำนายพร้อมส่ง ไม่ส่ง summary มาจะใช้สรุปจาก template"""
+        blocks = [
+            f"🔹 {drawn.position}: **{drawn.card.name}** ({drawn.direction})\n💬 _{drawn.meaning}_"
+            for drawn in self.cards
+        ]
+        return (
+            f"🔮 **คำทำนายเรื่อง {self.topic} ของคุณ:**\n\n"
+            f"🃏 {self.spread.title}:\n\n" + "\n\n".join(blocks) + "\n\n"
+            f"📝 **สรุปคำทำนาย:**\n\n{summary or self.template_summary()}"
+        )
+
+    def template_summary(self) -> str:
+        """สรุปจากโทนของไพ่ที่เปิดได้ (ปกติ/กลับหัว, ไพ่ชุดใหญ่, ชุดที่เด่น) ไม่ต้องรอ GPT"""
+        total = len(self.cards)
+        upright = sum(not drawn.is_reversed for drawn in self.cards)
+        lines = [next(text for ratio, text in TONE_OPENINGS if upright / total >= ratio).format(topic=self.topic)]
+
+        majors = sum(drawn.card.arcana == "Major" for drawn in self.cards)
+        if majors * 2 >= total:
+            lines.append(f"ไพ่ชุดใหญ่ออกมา {majors} ใบ ช่วงนี้เป็นจังหวะสำคัญที่ส่งผลไปอีกนาน")
+
+        suits = Counter(drawn.card.suit for drawn in self.cards if drawn.card.suit).most_common(2)
+        if suits and suits[0][1] >= 2 and (len(suits) == 1 or suits[0][1] > suits[1][1]):
+            lines.append(f"ไพ่ชุด {suits[0][0]} เด่นที่สุด ธาตุ{SUIT_THEMES[suits[0][0]]}")
+
+        outcome = self.cards[-1]
+        lines.append(f"แนวโน้ม ({outcome.position}): {outcome.meaning}")
+
+        caution = next((drawn for drawn in self.cards[:-1] if drawn.is_reversed), None)
+        if caution:
+            lines.append(f"⚠️ ข้อควรระวัง: {caution.meaning}")
+        lines.append(f"💡 คำแนะนำ: {TOPIC_ADVICE.get(self.topic, 'ค่อย ๆ ไปทีละก้าว แล้วทุกอย่างจะคลี่คลาย')}")
+        return "\n".join(lines)
+
+    def gpt_input(self) -> str:
+        return "\n".join(
+            f"{drawn.position}: {drawn.card.name} ({drawn.direction}): {drawn.meaning}" for drawn in self.cards
+        )
+
+def draw_multiple_cards(n: int = 3, seed: Optional[str] = None) -> List[Tuple[int, bool]]:
+    """สุ่มไพ่ไม่ซ้ำ n ใบ คืน (index ในสำรับ, กลับหัวไหม) — ส่ง seed เดิมได้ไพ่ชุดเดิมเสมอ"""
+    rng = random.Random(seed) if seed is not None else random
+    return [(index, rng.random() < 0.5) for index in rng.sample(range(len(CARD_NAMES)), k=n)]
+
+def _bangkok_now(now: Optional[datetime] = None) -> datetime:
+    tz = pytz.timezone("Asia/Bangkok")
+    return now.astimezone(tz) if now else datetime.now(tz)
+
+def daily_seed(user_id: int, topic: str, spread: TarotSpread, now: Optional[datetime] = None) -> str:
+    """seed ของไพ่ประจำวัน: ผู้ใช้ + หัวข้อ + spread + วันที่ (เวลาไทย)"""
+    return f"{user_id}:{topic}:{spread.name}:{_bangkok_now(now):%Y-%m-%d}"
+
+def seconds_until_midnight(now: Optional[datetime] = None) -> int:
+    now = _bangkok_now(now)
+    midnight = now.tzinfo.localize(datetime(now.year, now.month, now.day) + timedelta(days=1))
+    return max(int((midnight - now).total_seconds()), 1)
+
+def draw_tarot_reading(topic: str, size: Optional[int] = None, seed: Optional[str] = None) -> TarotReading:
+    """เปิดไพ่และแปลความหมายในเครื่องทั้งหมด (ไม่เรียก GPT)"""
+    spread = get_spread(size)
+    deck = DECK[topic]
+    cards = [
+        DrawnCard(deck[index], is_reversed, position)
+        for (index, is_reversed), position in zip(draw_multiple_cards(spread.size, seed), spread.positions)
+    ]
+    return TarotReading(topic, spread, cards)
+
+async def get_tarot_reply(
+    redis_instance: Optional[Redis], user_id: int, topic: str, size: Optional[int] = None
+) -> Tuple[str, Optional[TarotReading]]:
+    """
+    คืน (ข้อความพร้อมส่ง, reading ที่ยังต้องเสริมสรุปจาก GPT)
+    โหมด daily เปิดซ้ำในวันเดียวกันได้ข้อความเดิมจาก cache (reading เป็น None → ไม่ต้องเรียก GPT อีก)
+    """
+    if TAROT_MODE != "daily":
+        reading = draw_tarot_reading(topic, size)
+        return format_reply(reading.render()), reading
+
+    seed = daily_seed(user_id, topic, get_spread(size))
+    key = f"tarot:{seed}"
+    if redis_instance is not None:
+        try:
+            cached = await redis_instance.get(key)
+        except Exception as e:
+            logger.warning(f"⚠️ อ่าน tarot cache '{key}' ไม่ได้: {e}")
+            cached = None
+        if cached:
+            _stats["hit"] += 1
+            return REPEAT_NOTICE + cached, None
+
+    _stats["miss"] += 1
+    reading = draw_tarot_reading(topic, size, seed)
+    text = format_reply(reading.render())
+    if redis_instance is not None:
+        try:
+            await redis_instance.set(key, text, ex=seconds_until_midnight())
+            reading.cache_key = key
+        except Exception as e:
+            logger.warning(f"⚠️ เขียน tarot cache '{key}' ไม่ได้: {e}")
+    return text, reading
+
+def draw_cards_and_interpret_by_topic(topic: str, size: Optional[int] = None) -> str:
+    if topic not in DECK:
+        return "❌ ไม่พบคำทำนายในหัวข้อนี้"
+    return draw_tarot_reading(topic, size).render()
+
+async def _enrich_reading(reading: TarotReading, sent: List[discord.Message], redis_instance: Optional[Redis]) -> None:
+    summary = await summarize_tarot_reading(reading.gpt_input(), reading.topic)
+    if not summary:
+        return
+    text = format_reply(reading.render(summary))
+    _stats["enriched"] += 1
+    try:
+        await edit_reply(sent, text)
+        logger.debug(f"🔮 แทนสรุปคำทำนาย '{reading.topic}' ด้วยฉบับ GPT แล้ว")
+    except Exception as e:
+        logger.warning(f"⚠️ แก้ข้อความคำทำนายไม่ได้: {e}")
+
+    # ✅ เปิดซ้ำวันนี้ได้ฉบับที่มีสรุปจาก GPT (xx + keepttl: เลยเที่ยงคืนไปแล้วไม่สร้าง key ใหม่)
+    if redis_instance is not None and reading.cache_key:
+        try:
+            await redis_instance.set(reading.cache_key, text, xx=True, keepttl=True)
+        except Exception as e:
+            logger.warning(f"⚠️ อัปเดต tarot cache '{reading.cache_key}' ไม่ได้: {e}")
+
+def enrich_in_background(
+    reading: TarotReading, sent: List[discord.Message], redis_instance: Optional[Redis] = None
+) -> None:
+    """ขอสรุปจาก GPT หลังส่งคำทำนายไปแล้ว มาถึงเมื่อไหร่ค่อย edit ข้อความเดิม (และ cache ของวันนี้)"""
+    if not sent:
+        return
+    task = asyncio.create_task(_enrich_reading(reading, sent, redis_instance))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+def log_tarot_stats() -> None:
+    logger.info(
+        f"🔮 tarot: mode={TAROT_MODE} daily_hit={_stats['hit']} daily_miss={_stats['miss']} "
+        f"gpt_enriched={_stats['enriched']}"
+    )
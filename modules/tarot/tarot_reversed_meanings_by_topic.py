@@ -0,0 +1,470 @@
+TAROT_REVERSED_MEANINGS_BY_TOPIC = {
+    "The Fool": {
+        "ความรัก": "รีบตัดสินใจเรื่องหัวใจเร็วเกินไป หรือยังไม่พร้อมผูกมัดจริงจัง",
+        "การงาน": "เสี่ยงแบบไม่มีแผน อาจพลาดเพราะประมาทหรือขาดประสบการณ์",
+        "การเงิน": "ใช้เงินตามอารมณ์ ระวังถูกหลอกหรือลงทุนแบบไม่ศึกษา",
+        "สุขภาพ": "ระวังอุบัติเหตุจากความประมาท พักผ่อนไม่เป็นเวลา"
+    },
+    "The Magician": {
+        "ความรัก": "มีคนพูดดีแต่ไม่จริงใจ ระวังถูกหลอกด้วยคำหวาน",
+        "การงาน": "มีฝีมือแต่ใช้ไม่ถูกทาง หรือมีคนเล่นเกมการเมืองในที่ทำงาน",
+        "การเงิน": "แผนหาเงินยังไม่ชัด ระวังข้อเสนอที่ดีเกินจริง",
+        "สุขภาพ": "พลังงานกระจัดกระจาย ร่างกายล้าเพราะทำหลายอย่างเกินไป"
+    },
+    "The High Priestess": {
+        "ความรัก": "มีเรื่องที่ยังไม่พูดกันตรง ๆ ความลับอาจถูกเปิดเผย",
+        "การงาน": "มองข้ามข้อมูลสำคัญ ไม่ฟังเสียงสัญชาตญาณตัวเอง",
+        "การเงิน": "มีค่าใช้จ่ายแอบแฝง ตรวจสัญญาและตัวเลขให้ละเอียด",
+        "สุขภาพ": "ฮอร์โมนหรือระบบภายในแปรปรวน ไม่ควรละเลยอาการเล็ก ๆ"
+    },
+    "The Empress": {
+        "ความรัก": "ดูแลอีกฝ่ายมากจนลืมตัวเอง หรือความสัมพันธ์ขาดความอบอุ่น",
+        "การงาน": "ไอเดียตัน งานสร้างสรรค์ไม่ไหลลื่น ขาดแรงบันดาลใจ",
+        "การเงิน": "ใช้จ่ายฟุ่มเฟือยเพื่อความสบาย รายรับไม่งอกเงย",
+        "สุขภาพ": "ร่างกายอ่อนเพลีย ระวังเรื่องระบบสืบพันธุ์และการกินไม่สมดุล"
+    },
+    "The Emperor": {
+        "ความรัก": "อีกฝ่ายเจ้ากี้เจ้าการ หรือควบคุมมากเกินไปจนอึดอัด",
+        "การงาน": "ขัดแย้งกับหัวหน้า หรือขาดวินัยในการบริหารงาน",
+        "การเงิน": "แผนการเงินไม่เป็นระบบ ระวังการตัดสินใจแบบดื้อดึง",
+        "สุขภาพ": "เครียดสะสมจากความรับผิดชอบ ระวังความดันและปวดหัว"
+    },
+    "The Hierophant": {
+        "ความรัก": "ไม่อยากทำตามกรอบเดิม หรือครอบครัวไม่เห็นด้วยกับความสัมพันธ์",
+        "การงาน": "ไม่เข้ากับกฎระเบียบขององค์กร อยากลองวิธีใหม่ของตัวเอง",
+        "การเงิน": "อย่าเชื่อคำแนะนำการเงินโดยไม่ตรวจสอบ แม้มาจากผู้ใหญ่",
+        "สุขภาพ": "ลองวิธีดูแลสุขภาพนอกกระแสได้ แต่ควรปรึกษาผู้เชี่ยวชาญด้วย"
+    },
+    "The Lovers": {
+        "ความรัก": "ความสัมพันธ์ไม่ลงรอย ค่านิยมต่างกัน หรือมีมือที่สาม",
+        "การงาน": "ลังเลกับทางเลือกสำคัญ หรือทีมงานไม่ไปในทางเดียวกัน",
+        "การเงิน": "ตัดสินใจการเงินด้วยอารมณ์ ระวังเงินร่วมกับคนอื่น",
+        "สุขภาพ": "ความเครียดจากความสัมพันธ์ส่งผลต่อการนอนและหัวใจ"
+    },
+    "The Chariot": {
+        "ความรัก": "ต่างคนต่างดึงไปคนละทาง ความสัมพันธ์ขาดทิศทาง",
+        "การงาน": "งานสะดุด เป้าหมายไม่ชัด หรือรีบเกินจนเสียการควบคุม",
+        "การเงิน": "เงินไหลออกเร็ว ควบคุมค่าใช้จ่ายไม่อยู่",
+        "สุขภาพ": "ระวังอุบัติเหตุบนท้องถนน และอาการจากการฝืนร่างกาย"
+    },
+    "Strength": {
+        "ความรัก": "ขาดความมั่นใจในตัวเอง หรือใช้อารมณ์ใส่กันมากเกินไป",
+        "การงาน": "หมดไฟ สงสัยในความสามารถตัวเอง ยอมแพ้ง่าย",
+        "การเงิน": "ควบคุมการใช้จ่ายไม่อยู่ ตามใจตัวเองเกินไป",
+        "สุขภาพ": "ภูมิคุ้มกันตก พลังใจอ่อนแรง ต้องพักฟื้นให้เต็มที่"
+    },
+    "The Hermit": {
+        "ความรัก": "ตัดขาดจากคนรอบข้างจนเหงา หรือปิดใจไม่ยอมให้ใครเข้าใกล้",
+        "การงาน": "ทำงานคนเดียวมากไป ขาดการสื่อสารกับทีม",
+        "การเงิน": "กลัวจนไม่กล้าตัดสินใจ พลาดโอกาสเพราะเก็บตัว",
+        "สุขภาพ": "ระวังภาวะซึมเศร้าจากการแยกตัว ควรออกไปพบผู้คนบ้าง"
+    },
+    "Wheel of Fortune": {
+        "ความรัก": "จังหวะไม่ตรงกัน เจอเรื่องเดิมวนซ้ำในความสัมพันธ์",
+        "การงาน": "ช่วงดวงตก สิ่งที่วางแผนไว้อาจเลื่อนหรือพลิกผัน",
+        "การเงิน": "รายรับไม่แน่นอน อย่าเสี่ยงโชคหรือเก็งกำไรช่วงนี้",
+        "สุขภาพ": "อาการเก่ากลับมา ควรดูแลต่อเนื่องอย่าหยุดกลางคัน"
+    },
+    "Justice": {
+        "ความรัก": "รู้สึกว่าความสัมพันธ์ไม่ยุติธรรม ฝ่ายหนึ่งให้มากกว่า",
+        "การงาน": "ถูกประเมินไม่เป็นธรรม ระวังปัญหาเอกสารหรือกฎหมาย",
+        "การเงิน": "ระวังข้อพิพาทเรื่องเงิน สัญญาเสียเปรียบ",
+        "สุขภาพ": "ร่างกายเสียสมดุลจากพฤติกรรมสุดโต่ง กินนอนไม่เป็นเวลา"
+    },
+    "The Hanged Man": {
+        "ความรัก": "เสียสละฝ่ายเดียวจนเหนื่อย ความสัมพันธ์หยุดนิ่งไม่ไปไหน",
+        "การงาน": "รอนานเกินไปจนเสียโอกาส หรือดื้อไม่ยอมเปลี่ยนมุมมอง",
+        "การเงิน": "เงินติดค้าง ลังเลจนตัดสินใจช้า",
+        "สุขภาพ": "เรื้อรังเพราะไม่ยอมเปลี่ยนพฤติกรรม ควรปรับวิธีดูแลตัวเอง"
+    },
+    "Death": {
+        "ความรัก": "ยึดติดกับความสัมพันธ์ที่ควรจบ กลัวการเปลี่ยนแปลง",
+        "การงาน": "ไม่ยอมปล่อยงานเก่าที่ไม่ไปต่อ ทำให้ชีวิตย่ำอยู่กับที่",
+        "การเงิน": "นิสัยการเงินเดิม ๆ ที่ไม่ดียังไม่ถูกแก้",
+        "สุขภาพ": "ฟื้นตัวช้าเพราะไม่ยอมเลิกพฤติกรรมที่ทำร้ายร่างกาย"
+    },
+    "Temperance": {
+        "ความรัก": "ทะเลาะกันบ่อย ขาดความพอดีและการประนีประนอม",
+        "การงาน": "งานล้นมือ จัดลำดับความสำคัญไม่ได้ ทีมไม่ประสานกัน",
+        "การเงิน": "ใช้จ่ายเกินตัว ไม่สมดุลระหว่างรายรับรายจ่าย",
+        "สุขภาพ": "กินดื่มเกินพอดี ระวังระบบย่อยอาหารและการนอน"
+    },
+    "The Devil": {
+        "ความรัก": "เริ่มหลุดจากความสัมพันธ์ที่เป็นพิษ กล้ายอมรับความจริง",
+        "การงาน": "กำลังจะหลุดจากงานที่กดดัน แต่ต้องกล้าตัดสินใจ",
+        "การเงิน": "เริ่มปลดหนี้หรือเลิกนิสัยใช้เงินที่เคยติด",
+        "สุขภาพ": "มีแรงเลิกสิ่งเสพติดหรือพฤติกรรมที่ไม่ดีต่อร่างกาย"
+    },
+    "The Tower": {
+        "ความรัก": "รู้ว่ามีปัญหาแต่พยายามเลี่ยง สุดท้ายต้องเผชิญอยู่ดี",
+        "การงาน": "หลบการเปลี่ยนแปลงไม่พ้น เตรียมแผนสำรองไว้ให้พร้อม",
+        "การเงิน": "รอดจากวิกฤตแบบหวุดหวิด แต่อย่าชะล่าใจ",
+        "สุขภาพ": "สัญญาณเตือนที่เคยมองข้าม ควรรีบตรวจก่อนจะรุนแรง"
+    },
+    "The Star": {
+        "ความรัก": "หมดหวังหรือไม่เชื่อในความรัก ต้องเยียวยาใจตัวเองก่อน",
+        "การงาน": "ขาดแรงบันดาลใจ มองไม่เห็นเป้าหมายชัดเจน",
+        "การเงิน": "คาดหวังสูงเกินจริง แผนการเงินยังไม่เป็นรูปธรรม",
+        "สุขภาพ": "ฟื้นตัวช้ากว่าที่หวัง ต้องอดทนและดูแลจิตใจด้วย"
+    },
+    "The Moon": {
+        "ความรัก": "ความจริงเริ่มปรากฏ ความสับสนค่อย ๆ คลี่คลาย",
+        "การงาน": "เรื่องที่ปิดบังถูกเปิดเผย เริ่มเห็นทางที่ชัดขึ้น",
+        "การเงิน": "เจอความผิดพลาดทางการเงินที่ซ่อนอยู่ ทันแก้ไข",
+        "สุขภาพ": "อาการที่ไม่รู้สาเหตุเริ่มวินิจฉัยได้ ความกังวลลดลง"
+    },
+    "The Sun": {
+        "ความรัก": "ความสุขลดลงชั่วคราว คาดหวังจากอีกฝ่ายมากเกินไป",
+        "การงาน": "ความสำเร็จมาช้ากว่าที่คิด หรือมั่นใจตัวเองจนเกินไป",
+        "การเงิน": "รายได้ยังพอไปได้ แต่ไม่หวือหวาอย่างที่หวัง",
+        "สุขภาพ": "พลังงานตก ขาดการออกกำลังกายและแสงแดด"
+    },
+    "Judgement": {
+        "ความรัก": "ตำหนิตัวเองหรืออีกฝ่ายกับเรื่องเก่า ไม่ยอมให้อภัย",
+        "การงาน": "ลังเลไม่กล้ารับโอกาสใหม่ เพราะกลัวผิดพลาดซ้ำ",
+        "การเงิน": "ทำผิดซ้ำเรื่องเดิม ควรทบทวนบทเรียนการเงินที่ผ่านมา",
+        "สุขภาพ": "ละเลยคำเตือนของร่างกาย ต้องตรวจติดตามอาการ"
+    },
+    "The World": {
+        "ความรัก": "ความสัมพันธ์ค้างคาไม่จบ ยังไม่ถึงปลายทางที่ต้องการ",
+        "การงาน": "งานใกล้สำเร็จแต่ยังขาดอีกนิด อย่าเพิ่งถอดใจ",
+        "การเงิน": "เป้าหมายการเงินยังไปไม่ถึง ต้องเก็บรายละเอียดให้ครบ",
+        "สุขภาพ": "การรักษายังไม่สุด ควรดูแลให้ต่อเนื่องจนหายดี"
+    },
+    "Ace of Wands": {
+        "ความรัก": "ความรู้สึกเริ่มจืด ขาดแรงดึงดูดหรือจังหวะไม่ใช่",
+        "การงาน": "โปรเจกต์ใหม่ล่าช้า ไอเดียดีแต่ยังไม่ได้เริ่ม",
+        "การเงิน": "โอกาสหาเงินใหม่ยังไม่มา อย่าเพิ่งรีบลงทุน",
+        "สุขภาพ": "แรงน้อย ขาดความกระตือรือร้นในการดูแลตัวเอง"
+    },
+    "Two of Wands": {
+        "ความรัก": "กลัวก้าวออกจากจุดเดิม ไม่กล้าวางแผนอนาคตร่วมกัน",
+        "การงาน": "วางแผนไม่รอบคอบ หรือลังเลไม่กล้าขยายงาน",
+        "การเงิน": "แผนการเงินระยะยาวยังไม่ชัด ควรทบทวนใหม่",
+        "สุขภาพ": "อยากเปลี่ยนพฤติกรรมแต่ยังไม่ลงมือจริง"
+    },
+    "Three of Wands": {
+        "ความรัก": "รอคอยความชัดเจนที่ยังไม่มา หรือความสัมพันธ์ทางไกลสะดุด",
+        "การงาน": "งานที่รออยู่ล่าช้า แผนขยายตัวติดอุปสรรค",
+        "การเงิน": "ผลตอบแทนมาช้ากว่าที่หวัง อย่าเพิ่งใช้เงินล่วงหน้า",
+        "สุขภาพ": "ฟื้นตัวช้า ควรวางแผนการดูแลให้เป็นขั้นตอน"
+    },
+    "Four of Wands": {
+        "ความรัก": "ความสัมพันธ์มีความไม่มั่นคง หรือแผนแต่งงานสะดุด",
+        "การงาน": "บรรยากาศในทีมไม่ราบรื่น ความสำเร็จยังไม่ได้ฉลอง",
+        "การเงิน": "ค่าใช้จ่ายในบ้านหรืองานรื่นเริงบานปลาย",
+        "สุขภาพ": "ความเครียดจากเรื่องในบ้านกระทบการพักผ่อน"
+    },
+    "Five of Wands": {
+        "ความรัก": "เลี่ยงการทะเลาะจนเก็บกด หรือเริ่มคลี่คลายความขัดแย้ง",
+        "การงาน": "ความขัดแย้งในทีมเริ่มลดลง แต่ยังต้องระวังคำพูด",
+        "การเงิน": "การแข่งขันด้านรายได้ลดลง ค่อย ๆ ตั้งหลักได้",
+        "สุขภาพ": "ความตึงเครียดเริ่มคลาย ควรหากิจกรรมระบายพลัง"
+    },
+    "Six of Wands": {
+        "ความรัก": "ไม่มั่นใจในตัวเอง หรือความรักไม่เป็นที่ยอมรับจากคนรอบข้าง",
+        "การงาน": "ผลงานไม่ถูกมองเห็น หรือความสำเร็จล่าช้า",
+        "การเงิน": "รายได้ที่คาดไว้ไม่เป็นไปตามเป้า อย่าอวดรวย",
+        "สุขภาพ": "พลังใจตก ร่างกายฟื้นช้ากว่าที่คิด"
+    },
+    "Seven of Wands": {
+        "ความรัก": "เหนื่อยกับการต้องปกป้องความสัมพันธ์ อยากยอมแพ้",
+        "การงาน": "ถูกกดดันจนท้อ ต้านแรงปะทะไม่ไหว",
+        "การเงิน": "รับภาระทางการเงินมากเกินจนตั้งรับไม่ทัน",
+        "สุขภาพ": "อ่อนล้าจากการฝืนสู้ ควรลดภาระลงบ้าง"
+    },
+    "Eight of Wands": {
+        "ความรัก": "การสื่อสารติดขัด ข่าวที่รอล่าช้า หรือรีบร้อนเกินไป",
+        "การงาน": "งานชะงัก ติดต่อประสานงานไม่ราบรื่น",
+        "การเงิน": "เงินเข้าช้า หรือรีบตัดสินใจจนพลาด",
+        "สุขภาพ": "ระวังการเดินทาง และอาการที่เกิดจากความเร่งรีบ"
+    },
+    "Nine of Wands": {
+        "ความรัก": "ระแวงจนปิดใจ เหนื่อยกับบาดแผลเดิม",
+        "การงาน": "หมดแรงใกล้เส้นชัย ระวังถอดใจก่อนสำเร็จ",
+        "การเงิน": "ปกป้องเงินมากเกินไปจนไม่กล้าใช้ในสิ่งจำเป็น",
+        "สุขภาพ": "ร่างกายล้าสะสม ภูมิคุ้มกันต่ำ ต้องพักจริงจัง"
+    },
+    "Ten of Wands": {
+        "ความรัก": "แบกความสัมพันธ์ไว้คนเดียว ถึงเวลาวางภาระลงบ้าง",
+        "การงาน": "งานล้นจนรับไม่ไหว ต้องกระจายงานหรือปฏิเสธบ้าง",
+        "การเงิน": "หนี้หรือภาระทางการเงินหนักเกินไป ควรจัดการใหม่",
+        "สุขภาพ": "ปวดหลังปวดไหล่จากความเครียด ควรพักผ่อน"
+    },
+    "Page of Wands": {
+        "ความรัก": "ความรักแบบฉาบฉวย ตื่นเต้นแป๊บเดียวแล้วหาย",
+        "การงาน": "ไอเดียเยอะแต่ไม่ลงมือ หรือขาดความต่อเนื่อง",
+        "การเงิน": "ใช้เงินตามกระแส ระวังการลงทุนที่ยังไม่เข้าใจ",
+        "สุขภาพ": "เริ่มออกกำลังกายแล้วเลิกกลางคัน ขาดวินัย"
+    },
+    "Knight of Wands": {
+        "ความรัก": "ใจร้อน ขี้หึง หรือเข้ามาเร็วแล้วไปเร็ว",
+        "การงาน": "ทำงานหุนหันพลันแล่น ระวังความผิดพลาดจากความรีบ",
+        "การเงิน": "ใช้เงินตามอารมณ์ชั่ววูบ ระวังการลงทุนเสี่ยง",
+        "สุขภาพ": "ระวังอุบัติเหตุจากความใจร้อน และอาการอักเสบ"
+    },
+    "Queen of Wands": {
+        "ความรัก": "หึงหวง ขาดความมั่นใจ หรือเรียกร้องความสนใจมากไป",
+        "การงาน": "ทำงานหนักจนหมดไฟ หรือมีคนอิจฉาในที่ทำงาน",
+        "การเงิน": "ใช้เงินเพื่อภาพลักษณ์ ระวังใช้เกินตัว",
+        "สุขภาพ": "พักผ่อนน้อย อารมณ์แปรปรวนกระทบสุขภาพ"
+    },
+    "King of Wands": {
+        "ความรัก": "อีกฝ่ายเอาแต่ใจ ชอบควบคุม หรือขาดความอดทน",
+        "การงาน": "ผู้นำที่สั่งการแบบเผด็จการ หรือตั้งเป้าสูงเกินจริง",
+        "การเงิน": "ตัดสินใจการเงินแบบมั่นใจเกินเหตุ ระวังขาดทุน",
+        "สุขภาพ": "ความเครียดจากการแบกความรับผิดชอบ ระวังความดันสูง"
+    },
+    "Ace of Cups": {
+        "ความรัก": "ปิดกั้นความรู้สึก หรือความรักที่หวังยังไม่ได้รับการตอบรับ",
+        "การงาน": "ไม่มีความสุขกับงาน ขาดแรงบันดาลใจ",
+        "การเงิน": "ใช้เงินเพื่อเติมเต็มใจ ระวังจ่ายเพราะอารมณ์",
+        "สุขภาพ": "อารมณ์ซึมเศร้า ระวังระบบน้ำในร่างกายและไต"
+    },
+    "Two of Cups": {
+        "ความรัก": "ความสัมพันธ์ไม่สมดุล ทะเลาะกันหรือเริ่มห่างเหิน",
+        "การงาน": "หุ้นส่วนหรือเพื่อนร่วมงานไม่ลงรอย",
+        "การเงิน": "ระวังเรื่องเงินกับคู่หรือหุ้นส่วน ตกลงกันให้ชัด",
+        "สุขภาพ": "ความเครียดจากความสัมพันธ์ส่งผลต่อหัวใจและการนอน"
+    },
+    "Three of Cups": {
+        "ความรัก": "มีมือที่สาม หรือเพื่อนฝูงเข้ามายุ่งกับความสัมพันธ์",
+        "การงาน": "ทีมแตกแยก นินทากันในที่ทำงาน",
+        "การเงิน": "หมดเงินไปกับงานสังสรรค์มากเกินไป",
+        "สุขภาพ": "ดื่มกินเกินพอดีจากการปาร์ตี้ ระวังตับและน้ำหนัก"
+    },
+    "Four of Cups": {
+        "ความรัก": "เริ่มเปิดใจมองคนที่อยู่ตรงหน้า หลังจากเบื่อหน่ายมานาน",
+        "การงาน": "ตื่นตัวกลับมารับโอกาสใหม่ ที่เคยมองข้าม",
+        "การเงิน": "เริ่มเห็นช่องทางรายได้ที่เคยมองข้ามไป",
+        "สุขภาพ": "หลุดจากความเฉื่อยชา เริ่มกลับมาดูแลตัวเอง"
+    },
+    "Five of Cups": {
+        "ความรัก": "เริ่มยอมรับความผิดหวังและก้าวต่อไปได้",
+        "การงาน": "เรียนรู้จากความผิดพลาด กลับมาตั้งหลักใหม่",
+        "การเงิน": "ฟื้นจากการสูญเสียทางการเงิน ค่อย ๆ เก็บใหม่",
+        "สุขภาพ": "ความเศร้าคลายลง สุขภาพใจเริ่มดีขึ้น"
+    },
+    "Six of Cups": {
+        "ความรัก": "ติดอยู่กับอดีต เปรียบเทียบกับแฟนเก่า ควรมองไปข้างหน้า",
+        "การงาน": "ยึดติดวิธีเดิม ๆ จนไม่พัฒนา",
+        "การเงิน": "ใช้เงินตามความเคยชิน ควรปรับแผนให้ทันสมัย",
+        "สุขภาพ": "ปัญหาเก่าจากอดีตยังส่งผลอยู่ ควรเยียวยาให้จบ"
+    },
+    "Seven of Cups": {
+        "ความรัก": "เริ่มเห็นความจริง เลิกฝันลม ๆ แล้ง ๆ และเลือกได้ชัดขึ้น",
+        "การงาน": "โฟกัสได้ชัดขึ้น ตัดทางเลือกที่ไม่จำเป็นออก",
+        "การเงิน": "เลิกหวังรวยทางลัด หันมาวางแผนจริงจัง",
+        "สุขภาพ": "เริ่มรู้สาเหตุอาการ เลือกวิธีรักษาที่เหมาะสมได้"
+    },
+    "Eight of Cups": {
+        "ความรัก": "กลัวการจากไป ทั้งที่รู้ว่าความสัมพันธ์ไม่ไปต่อ",
+        "การงาน": "อยากลาออกแต่ยังไม่กล้า หรือกลับไปทำสิ่งเดิม",
+        "การเงิน": "ลังเลจะทิ้งการลงทุนที่ไม่ได้ผล จนเสียมากขึ้น",
+        "สุขภาพ": "เหนื่อยใจแต่ไม่ยอมพัก ควรเปลี่ยนสภาพแวดล้อมบ้าง"
+    },
+    "Nine of Cups": {
+        "ความรัก": "ได้สิ่งที่ต้องการแต่ไม่รู้สึกพอใจ หรือคาดหวังเกินจริง",
+        "การงาน": "ความสำเร็จยังไม่ตรงกับที่หวัง หรือหลงระเริงกับผลงาน",
+        "การเงิน": "ใช้เงินเพื่อความสุขชั่วครู่มากไป",
+        "สุขภาพ": "กินดื่มตามใจ ระวังน้ำหนักและน้ำตาล"
+    },
+    "Ten of Cups": {
+        "ความรัก": "ครอบครัวไม่ลงรอย หรือภาพความสุขไม่ตรงกับความจริง",
+        "การงาน": "บรรยากาศในทีมไม่อบอุ่น ค่านิยมไม่ตรงกัน",
+        "การเงิน": "เรื่องเงินในครอบครัวทำให้ผิดใจกัน",
+        "สุขภาพ": "ความเครียดในบ้านกระทบสุขภาพจิต"
+    },
+    "Page of Cups": {
+        "ความรัก": "อารมณ์อ่อนไหว ใจน้อย หรือความรักแบบเด็ก ๆ",
+        "การงาน": "ใช้อารมณ์ทำงาน ไอเดียสร้างสรรค์ยังไม่ตกผลึก",
+        "การเงิน": "ใช้เงินตามอารมณ์ ซื้อของเพราะอยากได้ชั่ววูบ",
+        "สุขภาพ": "อารมณ์แปรปรวน ระวังการกินตามอารมณ์"
+    },
+    "Knight of Cups": {
+        "ความรัก": "คำหวานที่ไม่จริงใจ หรือคนที่เข้ามาแล้วหายไป",
+        "การงาน": "ข้อเสนอที่ดูดีแต่ไม่เป็นจริง ระวังผิดหวัง",
+        "การเงิน": "อย่าหลงกับข้อเสนอการเงินที่ฟังดูโรแมนติกเกินจริง",
+        "สุขภาพ": "ระวังการดื่มแอลกอฮอล์ และอารมณ์ที่ขึ้นลงง่าย"
+    },
+    "Queen of Cups": {
+        "ความรัก": "อ่อนไหวเกินไป พึ่งพาอีกฝ่ายทางอารมณ์มากเกิน",
+        "การงาน": "รับอารมณ์คนอื่นมาจนเหนื่อย ขาดขอบเขตที่ชัดเจน",
+        "การเงิน": "ใจอ่อนให้คนยืมเงิน ระวังเงินไม่คืน",
+        "สุขภาพ": "ความเครียดทางอารมณ์สะสม ควรดูแลสุขภาพใจ"
+    },
+    "King of Cups": {
+        "ความรัก": "เก็บกดอารมณ์ ไม่ยอมเปิดใจพูดคุย หรือใช้อารมณ์ควบคุมอีกฝ่าย",
+        "การงาน": "ตัดสินใจด้วยอารมณ์ ขาดความเป็นกลาง",
+        "การเงิน": "ใช้เงินเพื่อกลบความรู้สึก ระวังเสียเงินเพราะใจอ่อน",
+        "สุขภาพ": "เครียดสะสมจากการเก็บความรู้สึก ระวังการดื่ม"
+    },
+    "Ace of Swords": {
+        "ความรัก": "สื่อสารผิดพลาด พูดแรงจนทำร้ายกัน",
+        "การงาน": "ความคิดไม่ชัดเจน ตัดสินใจผิดเพราะข้อมูลไม่ครบ",
+        "การเงิน": "ตัดสินใจการเงินแบบสับสน ควรหาข้อมูลเพิ่ม",
+        "สุขภาพ": "ปวดหัว เครียด หรือต้องทบทวนแผนการรักษา"
+    },
+    "Two of Swords": {
+        "ความรัก": "ความอัดอั้นระเบิดออกมา ต้องเลือกเสียที",
+        "การงาน": "ถูกบีบให้ตัดสินใจ ข้อมูลที่ซ่อนอยู่ถูกเปิดเผย",
+        "การเงิน": "ไม่สามารถเลี่ยงการตัดสินใจเรื่องเงินได้อีกต่อไป",
+        "สุขภาพ": "ความเครียดสะสมจนแสดงอาการ ควรหาทางระบาย"
+    },
+    "Three of Swords": {
+        "ความรัก": "เริ่มหายจากความเจ็บปวด ให้อภัยและปล่อยวางได้",
+        "การงาน": "ความขัดแย้งเริ่มคลี่คลาย แผลใจจากงานค่อย ๆ หาย",
+        "การเงิน": "ฟื้นตัวจากความสูญเสียทางการเงิน",
+        "สุขภาพ": "ฟื้นตัวหลังการผ่าตัดหรือความเจ็บป่วย"
+    },
+    "Four of Swords": {
+        "ความรัก": "กลับมาเปิดใจหลังพักฟื้นใจ หรือพักนานจนห่างเหิน",
+        "การงาน": "พักน้อยเกินไปจนหมดไฟ หรือเริ่มกลับมาทำงานเต็มที่",
+        "การเงิน": "ถึงเวลากลับมาจัดการเรื่องเงินที่พักไว้",
+        "สุขภาพ": "ร่างกายต้องการพักแต่ยังฝืน ระวังหมดแรง"
+    },
+    "Five of Swords": {
+        "ความรัก": "อยากคืนดีหลังทะเลาะ หรือยังมีความแค้นค้างในใจ",
+        "การงาน": "ความขัดแย้งจบลง แต่ยังต้องสร้างความไว้ใจใหม่",
+        "การเงิน": "เสียเงินเพื่อยุติปัญหา ยอมเสียน้อยดีกว่าเสียมาก",
+        "สุขภาพ": "ความเครียดจากความขัดแย้งเริ่มคลาย"
+    },
+    "Six of Swords": {
+        "ความรัก": "ยังหนีปัญหาเดิมไม่พ้น หรือไม่ยอมก้าวออกจากความสัมพันธ์ที่ไม่ดี",
+        "การงาน": "การย้ายหรือเปลี่ยนงานสะดุด ต้องเตรียมตัวมากขึ้น",
+        "การเงิน": "ยังหลุดจากปัญหาการเงินเดิมไม่ได้",
+        "สุขภาพ": "ฟื้นตัวช้า ต้องเปลี่ยนวิธีดูแลตัวเอง"
+    },
+    "Seven of Swords": {
+        "ความรัก": "ความลับถูกเปิดเผย หรือสารภาพความจริงกัน",
+        "การงาน": "แผนที่ไม่โปร่งใสถูกจับได้ ควรเล่นตามกติกา",
+        "การเงิน": "ได้เงินที่เสียไปคืนบางส่วน ตรวจเอกสารให้ดี",
+        "สุขภาพ": "เลิกหลอกตัวเองเรื่องอาการ ยอมรับและรักษาตรง ๆ"
+    },
+    "Eight of Swords": {
+        "ความรัก": "เริ่มหลุดจากความกลัว กล้าออกจากกรอบที่ขังตัวเอง",
+        "การงาน": "เห็นทางออกจากสถานการณ์ที่อึดอัด",
+        "การเงิน": "เริ่มหาทางออกจากปัญหาเงินที่ติดขัด",
+        "สุขภาพ": "ความวิตกกังวลลดลง สุขภาพจิตดีขึ้น"
+    },
+    "Nine of Swords": {
+        "ความรัก": "เริ่มคลายความกังวล เห็นว่าเรื่องไม่ได้แย่อย่างที่คิด",
+        "การงาน": "ความเครียดเริ่มลดลง หรือถึงจุดที่ต้องขอความช่วยเหลือ",
+        "การเงิน": "ความกังวลเรื่องเงินเกินจริง ลองนั่งคำนวณดูใหม่",
+        "สุขภาพ": "นอนไม่หลับเรื้อรัง ควรปรึกษาผู้เชี่ยวชาญ"
+    },
+    "Ten of Swords": {
+        "ความรัก": "ผ่านจุดที่แย่ที่สุดมาแล้ว เริ่มฟื้นฟูใจ",
+        "การงาน": "รอดจากวิกฤต ค่อย ๆ กลับมายืนได้",
+        "การเงิน": "เริ่มฟื้นตัวหลังความเสียหายทางการเงิน",
+        "สุขภาพ": "อาการหนักผ่านไปแล้ว อยู่ในช่วงพักฟื้น"
+    },
+    "Page of Swords": {
+        "ความรัก": "พูดจาไม่คิด นินทาหรือสอดรู้เรื่องของอีกฝ่ายมากเกินไป",
+        "การงาน": "ข่าวลือในที่ทำงาน หรือพูดก่อนคิด",
+        "การเงิน": "ข้อมูลการเงินไม่ครบ ระวังข่าวลือเรื่องลงทุน",
+        "สุขภาพ": "คิดมากจนนอนไม่หลับ ระวังความเครียด"
+    },
+    "Knight of Swords": {
+        "ความรัก": "พูดแรงไม่ยั้งคิด ทะเลาะกันรุนแรง",
+        "การงาน": "รีบร้อนจนพลาด หรือปะทะกับคนในทีม",
+        "การเงิน": "ตัดสินใจการเงินรีบเกินไป ระวังขาดทุน",
+        "สุขภาพ": "ระวังอุบัติเหตุจากความรีบและความเครียดสูง"
+    },
+    "Queen of Swords": {
+        "ความรัก": "ปากร้าย เย็นชา หรือเก็บความเจ็บเก่ามาใช้ตัดสิน",
+        "การงาน": "วิจารณ์คนอื่นแรงเกินไป ขาดความเห็นใจ",
+        "การเงิน": "เข้มงวดจนเกินไป หรือตัดสินใจด้วยอคติ",
+        "สุขภาพ": "เก็บความเครียดไว้คนเดียวจนเป็นปัญหาสุขภาพ"
+    },
+    "King of Swords": {
+        "ความรัก": "ใช้เหตุผลกดอีกฝ่าย ขาดความอ่อนโยน",
+        "การงาน": "ใช้อำนาจไม่เป็นธรรม หรือเจอหัวหน้าที่เข้มงวดเกิน",
+        "การเงิน": "ระวังการโกงหรือสัญญาที่เอาเปรียบ",
+        "สุขภาพ": "เครียดจากการคิดมาก ระวังปวดหัวไมเกรน"
+    },
+    "Ace of Pentacles": {
+        "ความรัก": "ความสัมพันธ์ขาดความมั่นคง หรือมองคุณค่าแค่วัตถุ",
+        "การงาน": "โอกาสงานใหม่หลุดมือ หรือยังไม่เป็นรูปธรรม",
+        "การเงิน": "ระวังพลาดโอกาสทางการเงิน หรือใช้เงินก้อนแบบไม่วางแผน",
+        "สุขภาพ": "ละเลยพื้นฐานสุขภาพ เช่น การกินและการนอน"
+    },
+    "Two of Pentacles": {
+        "ความรัก": "แบ่งเวลาให้ความรักไม่ได้ ความสัมพันธ์ถูกละเลย",
+        "การงาน": "งานหลายอย่างพร้อมกันจนจัดการไม่ไหว",
+        "การเงิน": "รายรับรายจ่ายไม่สมดุล หมุนเงินไม่ทัน",
+        "สุขภาพ": "ใช้ชีวิตไม่สมดุล ร่างกายเริ่มส่งสัญญาณเตือน"
+    },
+    "Three of Pentacles": {
+        "ความรัก": "ไม่ช่วยกันสร้างความสัมพันธ์ ต่างคนต่างทำ",
+        "การงาน": "ทีมไม่ร่วมมือ งานคุณภาพต่ำเพราะขาดการประสาน",
+        "การเงิน": "การลงทุนร่วมกับคนอื่นมีปัญหา แบ่งผลประโยชน์ไม่ลงตัว",
+        "สุขภาพ": "ไม่ทำตามคำแนะนำของแพทย์ ทำให้อาการไม่ดีขึ้น"
+    },
+    "Four of Pentacles": {
+        "ความรัก": "เริ่มปล่อยวางความหึงหวง หรือใช้เงินแทนความใส่ใจ",
+        "การงาน": "ยอมเปิดรับความเสี่ยงใหม่ หรือสูญเสียตำแหน่งที่ยึดไว้",
+        "การเงิน": "ใช้เงินฟุ่มเฟือยหลังเก็บมานาน หรือสูญเสียเงินออม",
+        "สุขภาพ": "เริ่มคลายความเครียดที่กักไว้ ร่างกายผ่อนคลายขึ้น"
+    },
+    "Five of Pentacles": {
+        "ความรัก": "เริ่มฟื้นจากช่วงเหงาหรือลำบาก มีคนยื่นมือช่วย",
+        "การงาน": "ผ่านช่วงตกงานหรือวิกฤต เริ่มเห็นทางกลับมา",
+        "การเงิน": "สถานะการเงินเริ่มฟื้นตัว ได้รับความช่วยเหลือ",
+        "สุขภาพ": "อาการดีขึ้น เริ่มฟื้นตัวจากการเจ็บป่วย"
+    },
+    "Six of Pentacles": {
+        "ความรัก": "ความสัมพันธ์ไม่เท่าเทียม ฝ่ายหนึ่งให้อีกฝ่ายรับตลอด",
+        "การงาน": "ถูกเอาเปรียบ ค่าตอบแทนไม่ยุติธรรม",
+        "การเงิน": "ระวังให้ยืมเงินแล้วไม่ได้คืน หรือหนี้ที่มีเงื่อนไข",
+        "สุขภาพ": "ดูแลคนอื่นจนลืมดูแลตัวเอง"
+    },
+    "Seven of Pentacles": {
+        "ความรัก": "ทุ่มเทแต่ไม่เห็นผล หมดความอดทนกับการรอ",
+        "การงาน": "ลงแรงไปแต่ผลตอบแทนไม่คุ้ม ควรประเมินใหม่",
+        "การเงิน": "การลงทุนให้ผลช้าหรือขาดทุน ทบทวนแผนก่อนเติมเงิน",
+        "สุขภาพ": "ดูแลสุขภาพแบบไม่ต่อเนื่อง ผลจึงไม่ชัด"
+    },
+    "Eight of Pentacles": {
+        "ความรัก": "ทุ่มให้งานจนไม่มีเวลาให้ความรัก",
+        "การงาน": "ทำงานซ้ำซากจนเบื่อ หรือขาดความละเอียดในงาน",
+        "การเงิน": "ทำงานหนักแต่รายได้ไม่เพิ่ม ควรพัฒนาทักษะใหม่",
+        "สุขภาพ": "ทำงานหนักจนละเลยสุขภาพ ระวังออฟฟิศซินโดรม"
+    },
+    "Nine of Pentacles": {
+        "ความรัก": "พึ่งพาอีกฝ่ายมากเกินไป หรือเหงาแม้ชีวิตจะดูดี",
+        "การงาน": "ความสำเร็จสั่นคลอน ขาดความมั่นคงในตำแหน่ง",
+        "การเงิน": "ใช้เงินเพื่อภาพลักษณ์ ความมั่นคงทางการเงินลดลง",
+        "สุขภาพ": "ใช้ชีวิตสุขสบายจนละเลยการออกกำลังกาย"
+    },
+    "Ten of Pentacles": {
+        "ความรัก": "ครอบครัวไม่ยอมรับ หรือเรื่องเงินทำให้ความสัมพันธ์สั่นคลอน",
+        "การงาน": "ธุรกิจครอบครัวมีปัญหา หรือความมั่นคงในงานลดลง",
+        "การเงิน": "ข้อพิพาทเรื่องมรดกหรือทรัพย์สินในครอบครัว",
+        "สุขภาพ": "ระวังโรคทางพันธุกรรม ควรตรวจสุขภาพประจำปี"
+    },
+    "Page of Pentacles": {
+        "ความรัก": "ยังไม่จริงจังกับความสัมพันธ์ หรือขาดความพยายาม",
+        "การงาน": "ขาดสมาธิในการเรียนรู้ ผัดวันประกันพรุ่ง",
+        "การเงิน": "วางแผนการเงินไม่รอบคอบ ใช้เงินเกินงบ",
+        "สุขภาพ": "ไม่ดูแลตัวเองอย่างสม่ำเสมอ ขี้เกียจออกกำลังกาย"
+    },
+    "Knight of Pentacles": {
+        "ความรัก": "ความสัมพันธ์จืดชืด น่าเบื่อ ไม่มีความคืบหน้า",
+        "การงาน": "ทำงานช้าเกินไป หรือติดอยู่กับงานซ้ำซาก",
+        "การเงิน": "ระมัดระวังเกินจนพลาดโอกาส หรือเงินงอกเงยช้า",
+        "สุขภาพ": "ขาดการเคลื่อนไหว ระวังน้ำหนักเพิ่ม"
+    },
+    "Queen of Pentacles": {
+        "ความรัก": "ทุ่มให้ครอบครัวหรืองานจนลืมดูแลความรู้สึกของคู่",
+        "การงาน": "งานกับชีวิตส่วนตัวไม่สมดุล",
+        "การเงิน": "ใช้จ่ายเพื่อคนอื่นจนตัวเองขาดมือ",
+        "สุขภาพ": "ดูแลคนอื่นจนละเลยสุขภาพตัวเอง"
+    },
+    "King of Pentacles": {
+        "ความรัก": "ให้ความสำคัญกับเงินมากกว่าความรู้สึก หรือชอบควบคุม",
+        "การงาน": "บ้าอำนาจ ยึดติดความสำเร็จทางวัตถุ",
+        "การเงิน": "โลภหรือเสี่ยงเกินตัว ระวังการลงทุนผิดพลาด",
+        "สุขภาพ": "กินดีอยู่ดีเกินไป ระวังโรคจากพฤติกรรมการกิน"
+    },
+}
@@ -1,5 +1,6 @@
+import copy
 import re
-from typing import Optional
+from typing import List, Optional
 
 # ✅ ฟังก์ชัน search ที่ใช้ใน GPT tools (สำหรับ function calling)
 search_tool = {
@@ -20,103 +21,213 @@ search_tool = {
     }
 }
 
-def preserve_blocks(raw: str) -> tuple[str, dict]:
-    """เก็บโค้ดบล็อค, ตาราง, หรือ inline code ไว้ก่อน เพื่อไม่ให้โดนแก้ตอน clean"""
-    code_blocks = {}
+# ✍️ formatter รอบเดียว: อ่านทีละบรรทัดด้วย state machine แทน regex หลายสิบรอบทั้งข้อความ
+#    - code block (```) และตาราง (| ... |) ผ่านไปตามเดิมทุกตัวอักษร
+#    - ผลลัพธ์ format ซ้ำได้ผลเดิม (idempotent) และ feed ทีละชิ้นตอน stream ได้ผลเท่ากับ format ทีเดียว
+PARAGRAPH_WORDS = 40  # แบ่งย่อหน้าข้อความยาว ~40 คำ
 
-    def replacer(match):
-        key = f"__BLOCK_{len(code_blocks)}__"
-        code_blocks[key] = match.group(0)
-        return key
+_INLINE = re.compile(
+    r"(?P<code>`[^`\n]+`)"
+    r"|\[(?P<label>[^\[\]]+)\]\((?P<link><https?://[^\s>]+>|https?://[^\s)]+)\)"
+    r"|(?P<angle><https?://[^\s>]+>)"
+    r"|(?P<url>https?://[^\s*<>]+)"
+    r"|(?P<sources>📚 แหล่งอ้างอิง:\s*)"
+    r"|(?P<stars>\*+)"
+)
+_URL = re.compile(r"https?://[^\s*<>]+")
+_HEADING = re.compile(r"#{2,6}\s*(.+)")
+_BULLET = re.compile(r"[*\-\u2022]\s+")
+_LIST_ITEM = re.compile(r"\d+\.")
+_NUMBER_ONLY = re.compile(r"\d+\.$")
+_TABLE_ROW = re.compile(r"\|.+\|")
+_ONE_LINE_FENCE = re.compile(r"```.*```")  # ```ls -la``` เปิดและปิดในบรรทัดเดียว ไม่ใช่การเริ่ม code block
+_DOMAIN_LABEL = re.compile(r"[^\s<>]+\.(?:com|net|org|go\.th)\s+(?=<https?://)")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_SAFE_END = re.compile(r"[A-Za-z0-9\u0e01-\u0e59.!?)]")
 
-    raw = re.sub(r"```.*?```", replacer, raw, flags=re.DOTALL)
-    raw = re.sub(r"`[^`\n]+`", replacer, raw)
-    raw = re.sub(r"^\s*\|.+\|.*$", replacer, raw, flags=re.MULTILINE)
+def is_one_line_fence(line: str) -> bool:
+    return bool(_ONE_LINE_FENCE.match(line.strip()))
 
-    return raw, code_blocks
+def _split_paragraphs(text: str) -> List[str]:
+    """แบ่งย่อหน้ายาวตามประโยค ให้แต่ละย่อหน้าไม่เกิน ~PARAGRAPH_WORDS คำ"""
+    paragraphs, current, words = [], [], 0
+    for sentence in _SENTENCE_END.split(text):
+        count = len(sentence.split())
+        if current and words + count > PARAGRAPH_WORDS:
+            paragraphs.append(" ".join(current))
+            current, words = [], 0
+        current.append(sentence)
+        words += count
+    paragraphs.append(" ".join(current))
+    return paragraphs
 
-def restore_blocks(text: str, blocks: dict) -> str:
-    """ใส่โค้ดบล็อคและตารางที่เก็บไว้กลับเข้าที่เดิม"""
-    for key, value in blocks.items():
-        text = text.replace(key, value)
-    return text
+class ReplyFormatter:
+    """
+    จัดข้อความจาก GPT ให้ปลอดภัยกับ markdown ของ Discord ในรอบเดียว
+    strip_links=True สำหรับคำตอบ GPT (ตัดลิงก์/แหล่งอ้างอิงทิ้ง) ไม่งั้นลิงก์จะถูกครอบ <...> กัน embed
+    ใช้ได้ทั้ง format_reply(text) ทีเดียว หรือ feed() ทีละชิ้นแล้ว finish() ตอน stream
+    """
 
-def clean_output_text(text: str) -> str:
-    """จัดข้อความจาก GPT ให้อ่านง่ายและปลอดภัยจาก markdown error"""
-    text, saved_blocks = preserve_blocks(text)
+    def __init__(self, strip_links: bool = False):
+        self.strip_links = strip_links
+        self._lines: List[str] = []
+        self._buffer = ""              # บรรทัดที่ยังมาไม่ครบ
+        self._pending: Optional[str] = None  # บรรทัดล่าสุด รอดูบรรทัดถัดไปว่าต้องเชื่อมกันไหม
+        self._pending_kind = "text"
+        self._number: Optional[str] = None   # "1." ที่อยู่บรรทัดเดียว รอข้อความของข้อ
+        self._in_code = False
+        self._blank = False
+        self._last_kind: Optional[str] = None
 
-    # ✅ เชื่อมเลขข้อกับข้อความ ถ้ามีบรรทัดว่างแทรก
-    text = re.sub(r'(?m)^(\d+)\.\s*\n+(\S)', r'\1. \2', text)
-    # ✅ ถ้าไม่มีข้อความตามหลังเลขข้อ ให้เว้นว่างไว้เฉย ๆ เพื่อความสวยงาม
-    text = re.sub(r'(?m)^(\d+)\.\s*$', r'\1.\n', text)
+    def feed(self, chunk: str) -> None:
+        self._buffer += chunk
+        start = 0
+        while True:
+            end = self._buffer.find("\n", start)
+            if end == -1:
+                break
+            self._push_line(self._buffer[start:end])
+            start = end + 1
+        self._buffer = self._buffer[start:]
 
-    # ✅ ลบช่องว่างท้ายบรรทัด และลดการขึ้นบรรทัดใหม่เกินจำเป็น
-    text = re.sub(r'[ \t]+\n', '\n', text)
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    def finish(self) -> str:
+        self._close()
+        return "\n".join(self._lines)
 
-    # ✅ แปลง heading markdown เช่น ### หัวข้อ → **หัวข้อ**
-    text = re.sub(r'^#{2,6}\s*(.+)', r'**\1**', text, flags=re.MULTILINE)
+    def preview(self) -> str:
+        """ข้อความที่ format แล้วถ้าจบตรงนี้ (ไม่เปลี่ยน state) — code block ที่ยังไม่ปิดจะถูกปิดชั่วคราว"""
+        draft = copy.copy(self)
+        draft._lines = []
+        draft._close()
+        return "\n".join(self._lines + draft._lines)
 
-    # ✅ bullet: *, -, • → • (ถ้าขึ้นต้นบรรทัด)
-    text = re.sub(r'(?m)^[\*\-\u2022]\s+', '• ', text)
+    def _close(self) -> None:
+        if self._buffer:
+            self._push_line(self._buffer)
+            self._buffer = ""
+        self._flush()
+        if self._in_code:
+            self._lines.append("```")
+            self._in_code = False
 
-    # ✅ ลบ * เดี่ยว ๆ ที่อาจทำ markdown พัง
-    text = re.sub(r'(?<!\*)\*(?!\*)', '', text)
+    def _push_line(self, raw: str) -> None:
+        if self._in_code:
+            if raw.strip().startswith("```"):
+                self._emit(raw.strip(), "code")
+                self._in_code = False
+            else:
+                self._lines.append(raw.rstrip("\r"))
+            return
 
-    # ✅ ลบ ** เดี่ยว ๆ ที่ไม่มีคำติด เช่น "** ", " **", หรือ "**\n"
-    text = re.sub(r'\*\*(\s|$)', r'\1', text)
-    text = re.sub(r'(^|\s)\*\*(?=\s)', r'\1', text)
+        line = raw.strip()
+        if not line:
+            if self._number is None:
+                self._flush()
+                self._blank = True
+            return
+        if line.startswith("```"):
+            self._flush()
+            self._emit(line, "code")
+            self._in_code = not is_one_line_fence(line)
+            return
+        if _TABLE_ROW.match(line):
+            self._flush()
+            self._emit(line, "table")
+            return
+        if _NUMBER_ONLY.match(line):
+            self._flush()
+            self._number = line
+            return
 
-    # ✅ แก้ลิงก์ markdown: [text](url) → text <url>
-    text = re.sub(r'$begin:math:display$([^\\[$end:math:display$]+?)\]$begin:math:text$(https?://[^\\s$end:math:text$]+)\)', r'\1 <\2>', text)
+        text = self._normalize(line)
+        if text != line:
+            # หัวข้อ/ดอกจัน/ลิงก์ที่ถูกเอาออกอาจทำให้บรรทัดกลายเป็นแบบอื่น → จัดใหม่จนนิ่ง (ให้ format ซ้ำได้ผลเดิม)
+            return self._push_line(text)
 
-    # ✅ เอา label หน้า URL ที่ซ้ำออก เช่น tnnthailand.com <https://tnnthailand.com/...> → <...>
-    text = re.sub(r'(?m)^(\s*)[^\s<>]+\.(com|net|org|go\.th)\s+<((https?://)[^>\s]+)>', r'\1<\3>', text)
+        if self._number is not None:
+            if text.startswith("• ") or _LIST_ITEM.match(text):
+                self._flush()  # ข้อถัดไปมาเลย ไม่มีข้อความของข้อนี้
+            else:
+                text = f"{self._number} {text}"
+                self._number = None
 
-    # ✅ ป้องกัน markdown error ลิงก์หลุด
-    text = re.sub(r'(?<!<)(https?://\S+)(?!>)', r'<\1>', text)
+        kind = "list" if text.startswith("• ") or _LIST_ITEM.match(text) else "text"
+        # ✅ เชื่อมบรรทัดที่ถูกตัดกลางประโยค (บรรทัดก่อนไม่ได้จบด้วยตัวอักษร/เครื่องหมายจบ และบรรทัดนี้เริ่มด้วยตัวอักษร)
+        if (
+            kind == "text" and self._pending is not None
+            and text[0].isalpha() and not _SAFE_END.match(self._pending[-1])
+        ):
+            joined = f"{self._pending} {text}"
+            # กันกรณีบรรทัดก่อนเป็นแค่เครื่องหมาย เช่น "-" หรือ "##" เชื่อมแล้วจะกลายเป็น bullet/หัวข้อ
+            if self._normalize(joined) == joined and not (joined.startswith("• ") or _LIST_ITEM.match(joined)):
+                self._pending = joined
+                return
+        self._flush()
+        self._pending, self._pending_kind = text, kind
 
-    # ✅ เชื่อมบรรทัดที่ไม่ควรตัด
-    safe_starts = r'[\-\*\u2022#>\|0-9]|<:|:.*?:'
-    safe_ends = r'[A-Za-z0-9ก-๙\.\!\?\)]'
-    text = re.sub(fr'(?<!{safe_ends})\n(?!{safe_starts}|\n)', ' ', text)
+    def _normalize(self, line: str) -> str:
+        """heading → ข้อความธรรมดา, bullet ทุกแบบ → •, แล้วจัด inline"""
+        heading = _HEADING.match(line)
+        if heading:
+            return heading.group(1).strip()
+        bullet = _BULLET.match(line)
+        if bullet:
+            return "• " + self._inline(line[bullet.end():]).strip()
+        return self._inline(line).strip()
 
-    # ✅ แบ่งย่อหน้า (~40 คำ/ย่อหน้า)
-    sentences = re.split(r'(?<=[.!?])\s+', text)
-    new_text, current_length = '', 0
-    for sentence in sentences:
-        sentence_length = len(sentence.split())
-        if current_length + sentence_length > 40:
-            new_text = new_text.strip() + "\n\n" + sentence.strip() + " "
-            current_length = sentence_length
-        else:
-            new_text += sentence.strip() + " "
-            current_length += sentence_length
+    def _inline(self, line: str) -> str:
+        def replace(match: re.Match) -> str:
+            group = "label" if match.group("label") is not None else match.lastgroup
+            if group == "code":
+                return match.group(0)
+            if group == "stars":
+                return ""
+            if group == "sources":
+                return "" if self.strip_links else match.group(0)
+            if group == "label":
+                label, link = match.group("label"), match.group("link")
+                if self.strip_links:
+                    return _URL.sub("", label)
+                return match.group(0) if link.startswith("<") else f"{label} <{link}>"
+            if self.strip_links:
+                return ""
+            return match.group(0) if group == "angle" else f"<{match.group(0)}>"
 
-    text = restore_blocks(new_text, saved_blocks)
+        text = _INLINE.sub(replace, line)
+        # เอา label หน้า URL ที่ซ้ำออก เช่น tnnthailand.com <https://tnnthailand.com/...> → <...>
+        label = _DOMAIN_LABEL.match(text)
+        return text[label.end():] if label else text
 
-    # ✅ ย้ายเนื้อหาขึ้นมาหลังข้อเลขที่ว่าง
-    text = re.sub(r'(?m)^(\d+\.)\n+(\S)', r'\1 \2', text)
+    def _flush(self) -> None:
+        if self._number is not None:
+            self._emit(self._number, "list")
+            self._number = None
+        if self._pending is None:
+            return
+        if self._pending_kind == "text":
+            for index, paragraph in enumerate(_split_paragraphs(self._pending)):
+                self._blank = self._blank or index > 0
+                self._emit(paragraph, "text")
+        else:
+            self._emit(self._pending, self._pending_kind)
+        self._pending = None
 
-    # ✅ หลังรายการ list (1. 2. 3. หรือ •) → ถ้าเจอข้อความใหม่ที่ไม่ใช่ list ให้เว้นบรรทัด
-    lines = text.splitlines()
-    final_lines = []
-    inside_list = False
+    def _emit(self, text: str, kind: str) -> None:
+        if self._last_kind is not None and (self._blank or (self._last_kind == "list" and kind != "list")):
+            self._lines.append("")
+        self._blank = False
+        self._lines.append(text)
+        self._last_kind = kind
 
-    for line in lines:
-        stripped = line.strip()
-        if re.match(r'^\d+\.', stripped) or stripped.startswith('•'):
-            inside_list = True
-            final_lines.append(stripped)
-        elif stripped:
-            if inside_list:
-                final_lines.append('')  # เว้นบรรทัด
-                inside_list = False
-            final_lines.append(stripped)
-        else:
-            final_lines.append('')
+def format_reply(text: str, strip_links: bool = False) -> str:
+    """format ข้อความทั้งก้อนในรอบเดียว"""
+    formatter = ReplyFormatter(strip_links)
+    formatter.feed(text)
+    return formatter.finish()
 
-    return '\n'.join(final_lines).strip()
+def clean_output_text(text: str) -> str:
+    """จัดข้อความจาก GPT ให้อ่านง่ายและปลอดภัยจาก markdown error"""
+    return format_reply(text)
 
 def clean_url(url: Optional[str]) -> str:
     """ลบ \n \r ออกจาก URL"""
@@ -1,5 +1,26 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+
 import discord
 
+from modules.core.config import (
+    STREAM_FIRST_CHUNK_CHARS,
+    STREAM_EDIT_INTERVAL,
+    STREAM_MESSAGE_LIMIT,
+    DISCORD_MESSAGE_LIMIT,
+    DISCORD_CHANNEL_MESSAGES,
+    DISCORD_CHANNEL_WINDOW,
+    OUTBOUND_MERGE_WINDOW,
+)
+from modules.core.logger import logger
+from modules.utils.cleaner import ReplyFormatter, is_one_line_fence
+
+FENCE_CLOSE = "\n```"
+FENCE_TAG_MAX = 20  # ```python ยาวกว่านี้ไม่ใช่ชื่อภาษา เปิดใหม่ด้วย ``` เปล่า
+
 async def send_message_to_channel(bot: discord.Client, channel_id: int, message: str):
     """
     ส่งข้อความไปยังห้อง Discord โดยรับ bot จากภายนอก (ไม่ import main)
@@ -7,6 +28,394 @@ async def send_message_to_channel(bot: discord.Client, channel_id: int, message:
     try:
         channel = bot.get_channel(channel_id)
         if channel:
-            await channel.send(message)
+            await outbound.send(channel, message)
     except Exception as e:
         print(f"[ERROR] ไม่สามารถส่งข้อความไปยัง Discord Channel: {e}")
+
+def _wrap_line(line: str, room: int) -> List[str]:
+    """ตัดบรรทัดที่ยาวเกิน room ที่ช่องว่างสุดท้าย ถ้าไม่มีช่องว่างตัดตรง ๆ แต่ไม่ผ่ากลาง URL"""
+    pieces = []
+    while len(line) > room:
+        cut = line.rfind(" ", 0, room + 1)
+        if cut <= 0:
+            cut = room
+            url = line.rfind("http", 0, cut)  # ไม่มีช่องว่างก่อนหน้า → URL นี้ยาวคร่อมจุดตัดแน่
+            if url > 0:
+                start = url - 1 if line[url - 1] == "<" else url
+                cut = start or cut
+        pieces.append(line[:cut].rstrip())
+        line = line[cut:].lstrip(" ")
+    pieces.append(line)
+    return pieces
+
+def _fence_opener(line: str) -> str:
+    """บรรทัดเปิด code block ที่ใช้เปิดใหม่ในชิ้นถัดไป: ``` + ชื่อภาษา (ไม่เอาเนื้อหาที่ตามมาในบรรทัด)"""
+    tag = line.strip()[3:].split(maxsplit=1)
+    if tag and len(tag[0]) <= FENCE_TAG_MAX and "`" not in tag[0]:
+        return "```" + tag[0]
+    return "```"
+
+def split_message(text: str, limit: int = DISCORD_MESSAGE_LIMIT) -> List[str]:
+    """
+    ตัดข้อความยาวเป็นชิ้นไม่เกิน limit ในรอบเดียว: ตัดที่ย่อหน้าก่อน ไม่งั้นตัดที่บรรทัด (list/URL ไม่ขาดกลาง)
+    บรรทัดที่ยาวเกินชิ้นเดียวตัดที่ช่องว่าง ถ้าตัดกลาง code block จะปิด ``` แล้วเปิดใหม่ในชิ้นถัดไป
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    fence: Optional[str] = None  # บรรทัดเปิด code block ที่ยังไม่ปิด
+    blank_at, blank_size = -1, 0  # บรรทัดว่างล่าสุดนอก code block ใน chunk นี้
+
+    def emit(lines: List[str], open_fence: Optional[str]) -> None:
+        body = "\n".join(lines).strip("\n")
+        if body.strip() and body != open_fence:
+            chunks.append(body + FENCE_CLOSE if open_fence else body)
+
+    for line in text.split("\n"):
+        # ```ls -la``` ที่เปิด-ปิดในบรรทัดเดียวไม่เปลี่ยนสถานะ (ถ้าอยู่ใน code block บรรทัด ``` ไหนก็คือปิด)
+        toggles = line.lstrip().startswith("```") and (fence is not None or not is_one_line_fence(line))
+        fence_after = (None if fence else _fence_opener(line)) if toggles else fence
+        reserve = len(FENCE_CLOSE) if fence_after else 0
+        prefix = len(fence) + 1 if fence else 0
+        room = max(limit - reserve - prefix, 1)
+        pieces = _wrap_line(line, room) if len(line) > room else [line]
+
+        for piece in pieces:
+            if current and size + 1 + len(piece) + reserve > limit:
+                if blank_at >= 0 and blank_size >= limit // 2:
+                    # ✅ ตัดที่ย่อหน้าสุดท้าย ส่วนที่เหลือยกไปชิ้นถัดไป
+                    emit(current[:blank_at], None)
+                    current = current[blank_at + 1:]
+                    size = len("\n".join(current))
+                if current and size + 1 + len(piece) + reserve > limit:
+                    emit(current, fence)
+                    current = [fence] if fence else []
+                    size = len(fence) if fence else 0
+                blank_at = -1
+            size += len(piece) + (1 if current else 0)
+            current.append(piece)
+
+        if not line.strip() and fence is None:
+            blank_at, blank_size = len(current) - 1, size
+        fence = fence_after
+
+    emit(current, fence)
+    return chunks
+
+@dataclass
+class _Outgoing:
+    content: str
+    reference: Optional[discord.Message]
+    future: asyncio.Future
+    target: Optional[discord.Message] = None  # มีค่า = edit ข้อความนี้แทนการส่งใหม่
+
+class _Outbox:
+    """คิวของห้องเดียว: ส่งตามลำดับทีละข้อความ"""
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.queue: Deque[_Outgoing] = deque()
+        self.sent_at: Deque[float] = deque()
+        self.task: Optional[asyncio.Task] = None
+        # ข้อความ feature ที่เพิ่งส่ง/กำลังรอส่ง → (future ของผลส่ง, เวลาเข้าคิว)
+        self.recent: "OrderedDict[str, Tuple[asyncio.Future, float]]" = OrderedDict()
+
+class OutboundQueue:
+    """
+    ทุกข้อความที่บอทส่ง/edit ในห้องผ่านที่นี่ แต่ละห้องมี worker ทำตามลำดับ
+    และเว้นจังหวะไม่ให้เกิน DISCORD_CHANNEL_MESSAGES ข้อความต่อ DISCORD_CHANNEL_WINDOW วินาที (rate limit ของห้อง)
+    ข้อความ feature ที่เหมือนกันเป๊ะในห้องเดียวกันภายใน merge_window ส่งครั้งเดียว
+    """
+
+    def __init__(
+        self,
+        messages_per_window: int = DISCORD_CHANNEL_MESSAGES,
+        window: float = DISCORD_CHANNEL_WINDOW,
+        merge_window: float = OUTBOUND_MERGE_WINDOW,
+    ):
+        self.messages_per_window = messages_per_window
+        self.window = window
+        self.merge_window = merge_window
+        self._outboxes: Dict[int, _Outbox] = {}
+        self._stats = {"sent": 0, "merged": 0, "coalesced": 0, "paced": 0, "rate_limited": 0, "failed": 0}
+
+    async def send(
+        self,
+        channel,
+        content: str,
+        *,
+        reference: Optional[discord.Message] = None,
+        merge: bool = False,
+    ) -> List[discord.Message]:
+        """ส่งข้อความ (ยาวเกินจะตัดเป็นหลายข้อความ ชิ้นแรกตอบกลับ reference) คืนข้อความที่ส่งแล้ว"""
+        outbox = self._outbox(channel)
+        if merge:
+            shared = self._recent(outbox, content)
+            if shared is not None:
+                self._stats["merged"] += 1
+                logger.debug(f"📤 คำตอบซ้ำในห้อง {outbox.channel.id} ภายใน {self.merge_window:.0f}s → ใช้ข้อความเดิม")
+                if reference is not None:
+                    await _point_to_answer(reference)
+                return list(await asyncio.shield(shared))
+
+        futures = [
+            self._enqueue(outbox, piece, reference if index == 0 else None)
+            for index, piece in enumerate(split_message(content))
+        ]
+        done = asyncio.gather(*futures)
+        if merge:
+            # key เดิม (หมดอายุ/ส่งพลาด) ต้องย้ายไปท้าย ไม่งั้น recent ไม่เรียงตามเวลาเข้าคิว
+            outbox.recent.pop(content, None)
+            outbox.recent[content] = (done, time.monotonic())
+        return list(await asyncio.shield(done))
+
+    async def send_one(self, channel, content: str, *, reference: Optional[discord.Message] = None) -> discord.Message:
+        """ส่งข้อความเดียว (ต้องไม่เกิน DISCORD_MESSAGE_LIMIT) ผ่านคิวของห้อง"""
+        return await self._enqueue(self._outbox(channel), content, reference)
+
+    async def edit(self, message: discord.Message, content: str) -> discord.Message:
+        """
+        edit ข้อความเดิม (ต้องไม่เกิน DISCORD_MESSAGE_LIMIT) ผ่านคิวของห้อง นับรวมใน rate limit เดียวกับการส่ง
+        ถ้ามี edit ของข้อความเดียวกันรอคิวอยู่ ใช้เนื้อหาล่าสุดแทนที่ตัวเดิม (ไม่ edit ทีละขั้นตามหลัง)
+        """
+        return await asyncio.shield(self.queue_edit(message, content))
+
+    def queue_edit(self, message: discord.Message, content: str) -> asyncio.Future:
+        """เหมือน edit แต่ไม่รอ คืน future ของ edit ในคิว (preview ตอน stream ไม่ต้องหยุดอ่าน stream รอจังหวะห้อง)"""
+        outbox = self._outbox(message.channel)
+        for item in outbox.queue:
+            if item.target is message and not item.future.done():
+                item.content = content
+                self._stats["coalesced"] += 1
+                return item.future
+        return self._enqueue(outbox, content, None, target=message)
+
+    def _outbox(self, channel) -> _Outbox:
+        outbox = self._outboxes.get(channel.id)
+        if outbox is None:
+            outbox = self._outboxes[channel.id] = _Outbox(channel)
+        return outbox
+
+    def _recent(self, outbox: _Outbox, content: str) -> Optional[asyncio.Future]:
+        now = time.monotonic()
+        # recent เรียงตามเวลาเข้าคิว → ทิ้งของหมดอายุจากหัว
+        while outbox.recent:
+            future, queued_at = next(iter(outbox.recent.values()))
+            if not future.done() or now - queued_at <= self.merge_window:
+                break
+            outbox.recent.popitem(last=False)
+        entry = outbox.recent.get(content)
+        if entry is None:
+            return None
+        future, queued_at = entry
+        if future.done() and (future.cancelled() or future.exception() or now - queued_at > self.merge_window):
+            return None
+        return future
+
+    def _enqueue(
+        self,
+        outbox: _Outbox,
+        content: str,
+        reference: Optional[discord.Message],
+        target: Optional[discord.Message] = None,
+    ) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        outbox.queue.append(_Outgoing(content, reference, future, target))
+        if outbox.task is None:
+            outbox.task = asyncio.create_task(self._drain(outbox))
+        return future
+
+    def _pace(self, outbox: _Outbox) -> float:
+        """วินาทีที่ต้องรอก่อนส่งข้อความถัดไปในห้องนี้"""
+        now = time.monotonic()
+        while outbox.sent_at and now - outbox.sent_at[0] >= self.window:
+            outbox.sent_at.popleft()
+        if len(outbox.sent_at) < self.messages_per_window:
+            return 0.0
+        return outbox.sent_at[0] + self.window - now
+
+    async def _drain(self, outbox: _Outbox) -> None:
+        try:
+            while outbox.queue:
+                wait = self._pace(outbox)
+                if wait > 0:
+                    self._stats["paced"] += 1
+                    await asyncio.sleep(wait)
+                    continue
+                item = outbox.queue.popleft()
+                if item.future.done():
+                    continue
+                try:
+                    sent = await self._deliver(outbox.channel, item)
+                    self._stats["sent"] += 1
+                    if not item.future.done():
+                        item.future.set_result(sent)
+                except Exception as e:
+                    self._stats["failed"] += 1
+                    action = "edit" if item.target is not None else "ส่ง"
+                    logger.warning(f"⚠️ {action}ข้อความในห้อง {outbox.channel.id} ไม่ได้: {e}")
+                    if not item.future.done():
+                        item.future.set_exception(e)
+                outbox.sent_at.append(time.monotonic())
+        finally:
+            outbox.task = None
+
+    async def _deliver(self, channel, item: _Outgoing) -> discord.Message:
+        retried = False
+        while True:
+            try:
+                if item.target is not None:
+                    return await item.target.edit(content=item.content)
+                if item.reference is not None:
+                    try:
+                        return await item.reference.reply(item.content)
+                    except discord.HTTPException as e:
+                        if e.status == 429:
+                            raise
+                        # ข้อความต้นทางถูกลบไปแล้ว ฯลฯ → ส่งธรรมดาแทน
+                return await channel.send(item.content)
+            except discord.RateLimited as e:
+                # discord.py รอ bucket ให้เองอยู่แล้ว จะมาถึงตรงนี้เมื่อต้องรอนานเกินที่ตั้งไว้
+                self._stats["rate_limited"] += 1
+                if retried:
+                    raise
+                retried = True
+                await asyncio.sleep(e.retry_after)
+
+    async def stop(self) -> None:
+        tasks = [outbox.task for outbox in self._outboxes.values() if outbox.task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def status(self) -> Dict[str, int]:
+        return dict(self._stats, queued=sum(len(outbox.queue) for outbox in self._outboxes.values()))
+
+    def log_status(self) -> None:
+        status = self.status()
+        logger.info(
+            f"📤 outbound: sent={status['sent']} merged={status['merged']} coalesced={status['coalesced']} paced={status['paced']} "
+            f"rate_limited={status['rate_limited']} failed={status['failed']} queued={status['queued']}"
+        )
+
+async def _point_to_answer(message: discord.Message) -> None:
+    """คำถามซ้ำกับที่เพิ่งตอบไป → กด reaction ชี้ไปที่คำตอบด้านบนแทนการส่งซ้ำ"""
+    try:
+        await message.add_reaction("👆")
+    except discord.HTTPException as e:
+        logger.debug(f"📤 กด reaction ไม่ได้: {e}")
+
+outbound = OutboundQueue()
+
+async def edit_reply(sent: List[discord.Message], content: str) -> List[discord.Message]:
+    """
+    แก้คำตอบที่ส่งไปแล้ว (ผลจาก outbound.send) เป็นข้อความใหม่ ตัดชิ้นแบบเดียวกับตอนส่ง
+    edit เฉพาะชิ้นที่เปลี่ยน ยาวขึ้นส่งชิ้นใหม่ต่อท้าย สั้นลงลบชิ้นที่เกิน
+    """
+    if not sent:
+        return sent
+    pieces = split_message(content)
+    result = list(sent)
+    for index, piece in enumerate(pieces):
+        if index >= len(result):
+            result.append(await outbound.send_one(sent[0].channel, piece))
+        elif result[index].content != piece:
+            try:
+                result[index] = await outbound.edit(result[index], piece)
+            except discord.HTTPException as e:
+                logger.warning(f"⚠️ edit ข้อความไม่ได้: {e}")
+
+    for extra in result[len(pieces):]:
+        try:
+            await extra.delete()
+        except discord.HTTPException as e:
+            logger.warning(f"⚠️ ลบข้อความส่วนเกินไม่ได้: {e}")
+    return result[:len(pieces)]
+
+def _failed(future: Optional[asyncio.Future]) -> bool:
+    return future is not None and future.done() and not future.cancelled() and future.exception() is not None
+
+def _log_stream_edit(future: asyncio.Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning(f"⚠️ edit ข้อความ stream ไม่ได้: {future.exception()}")
+
+class StreamingReply:
+    """
+    แสดงคำตอบที่ทยอยมาเป็นชิ้น ๆ: โพสต์ทันทีที่มีข้อความพอ แล้ว edit ต่อไม่เกินรอบละ STREAM_EDIT_INTERVAL
+    ข้อความถูก format ทีละบรรทัดตามที่มา (ReplyFormatter) ไม่ต้อง clean ทั้งก้อนใหม่ทุกรอบ
+    ข้อความเกิน STREAM_MESSAGE_LIMIT จะขึ้นข้อความใหม่ต่อให้เอง
+    """
+
+    def __init__(self, message: discord.Message, strip_links: bool = True):
+        self.message = message
+        self.strip_links = strip_links
+        self.raw = ""
+        self.sent: List[discord.Message] = []
+        self.first_visible_after: Optional[float] = None  # วินาทีจากเริ่มจนผู้ใช้เห็นข้อความแรก
+        self._started = time.monotonic()
+        self._shown: List[str] = []
+        self._formatter = ReplyFormatter(strip_links)
+        self._last_flush = 0.0
+        self._edits: Dict[int, asyncio.Future] = {}  # edit ล่าสุดของแต่ละชิ้นที่เข้าคิวไว้ (ไม่ได้รอ)
+
+    def reset(self) -> None:
+        """ทิ้งข้อความที่สะสมไว้ (ข้อความที่โพสต์ไปแล้วจะถูก edit ทับรอบถัดไป)"""
+        self.raw = ""
+        self._formatter = ReplyFormatter(self.strip_links)
+
+    async def feed(self, delta: str) -> None:
+        self.raw += delta
+        self._formatter.feed(delta)
+        now = time.monotonic()
+        if not self.sent:
+            if len(self.raw.strip()) >= STREAM_FIRST_CHUNK_CHARS:
+                await self._flush(self._formatter.preview())
+        elif now - self._last_flush >= STREAM_EDIT_INTERVAL:
+            await self._flush(self._formatter.preview())
+
+    async def finish(self) -> str:
+        """format บรรทัดที่เหลือ (ผลเท่ากับ format ทีเดียวแบบไม่ stream) แล้วคืนข้อความที่แสดง"""
+        final = self._formatter.finish()
+        await self._flush(final, final=True)
+        return final
+
+    async def _flush(self, text: str, final: bool = False) -> None:
+        self._last_flush = time.monotonic()
+        pieces = split_message(text, STREAM_MESSAGE_LIMIT)
+        if not pieces:
+            return
+
+        for index, piece in enumerate(pieces):
+            if index < len(self.sent):
+                if self._shown[index] != piece or (final and _failed(self._edits.get(index))):
+                    self._queue_edit(index, piece)
+                continue
+
+            if not self.sent:
+                sent = await outbound.send_one(self.message.channel, piece, reference=self.message)
+                self.first_visible_after = time.monotonic() - self._started
+                logger.debug(f"⚡ ข้อความแรกขึ้นใน {self.first_visible_after:.2f}s")
+            else:
+                sent = await outbound.send_one(self.message.channel, piece)
+            self.sent.append(sent)
+            self._shown.append(piece)
+
+        # ✅ จบแล้วข้อความสั้นลง (เช่นหลัง fallback) → ลบข้อความส่วนเกิน
+        if final:
+            # รอ edit ที่ค้างคิวให้ขึ้นครบก่อน (edit สุดท้ายรวมเข้ากับ preview ที่ยังไม่ได้ส่งไปแล้ว)
+            await asyncio.gather(*self._edits.values(), return_exceptions=True)
+            self._edits.clear()
+            for extra in self.sent[len(pieces):]:
+                try:
+                    await extra.delete()
+                except discord.HTTPException as e:
+                    logger.warning(f"⚠️ ลบข้อความ stream ส่วนเกินไม่ได้: {e}")
+            del self.sent[len(pieces):]
+            del self._shown[len(pieces):]
+
+    def _queue_edit(self, index: int, piece: str) -> None:
+        future = outbound.queue_edit(self.sent[index], piece)
+        if future is not self._edits.get(index):
+            future.add_done_callback(_log_stream_edit)
+            self._edits[index] = future
+        self._shown[index] = piece
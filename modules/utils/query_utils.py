@@ -1,80 +1,335 @@
-import re
 import asyncio
-from typing import List, Optional
+import re
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Set, Union
 
-from modules.utils.cleaner import clean_output_text
+from redis.asyncio import Redis
+
+from modules.utils.cleaner import format_reply
+from modules.utils.text_normalize import FORCE_SEARCH_PREFIXES, strip_force_prefix
 from modules.features.google_search import (
+    get_search_quota_used,
     search_google,
     summarize_google_results,
 )
 from modules.core.logger import logger
-from modules.core.openai_client import client as openai_client
+from modules.core.config import GOOGLE_DAILY_QUOTA, GOOGLE_QUOTA_RESERVE, OPENAI_MAX_RETRIES
+from modules.core.openai_client import create_chat_completion, CIRCUIT_OPEN_REPLY, BUSY_REPLY
+from modules.core.openai_scheduler import OverloadedError
+from modules.core.resilience import CircuitOpenError, backoff_delay, is_retryable
+from modules.nlp.keyword_engine import KeywordEngine, ScanResult, SequenceRule
+from modules.nlp.tools import TOOL_SCHEMAS, run_tool_calls, tool_call_message, merge_tool_call_deltas
 
 # 🔧 Constants & Keywords
 COMMON_GREETINGS = [
     "สวัสดี", "หวัดดี", "ดีครับ", "ดีจ้า", "เฮลโหล", "hello", "hi", "ทัก", "ฮัลโหล", "โย่"
 ]
 
-IMPORTANT_QUERIES = [
-    r"ข่าว.*แผ่นดินไหว", r"แผ่นดินไหว.*ล่าสุด", r"ดินไหว.*ไทย",
-    r"ข่าวด่วน.*เหตุการณ์", r"สรุป.*เหตุการณ์", r"ข่าว.*ด่วน.*(ไทย|โลก)",
-    r"(เกิด|มี).*เหตุ.*แผ่นดินไหว", r"(รายงาน|ประกาศ).*แผ่นดินไหว"
+# 🧩 กฎแบบลำดับคำ: แต่ละ step คือกลุ่มคำที่ต้องเจอตามลำดับในบรรทัดเดียวกัน (เท่ากับ regex A.*(B|C).*D)
+IMPORTANT_QUERY_SEQUENCES = [
+    (("ข่าว",), ("แผ่นดินไหว",)),
+    (("แผ่นดินไหว",), ("ล่าสุด",)),
+    (("ดินไหว",), ("ไทย",)),
+    (("ข่าวด่วน",), ("เหตุการณ์",)),
+    (("สรุป",), ("เหตุการณ์",)),
+    (("ข่าว",), ("ด่วน",), ("ไทย", "โลก")),
+    (("เกิด", "มี"), ("เหตุ",), ("แผ่นดินไหว",)),
+    (("รายงาน", "ประกาศ"), ("แผ่นดินไหว",)),
 ]
 
-FORCE_SEARCH_PREFIXES = ["ค้นหา:", "หา:"]
-
+# 🔎 คำที่บอกว่าต้องใช้ข้อมูลสดแน่ ๆ → บังคับค้น Google (ใช้โควต้า) จึงต้องแคบ
+# คำกว้าง ๆ อย่าง "วันนี้" "ตอนนี้" "คืออะไร" ปนอยู่ในแชททั่วไป/คำถามเขียนโค้ด ไม่ใส่ที่นี่
+# (ถ้าเป็นคำถามจะไปทาง borderline อยู่แล้ว)
 MUST_SEARCH_KEYWORDS = [
-    "ล่าสุด", "วันนี้", "เมื่อวาน", "ตอนนี้", "อัปเดต", "ข่าว", "breaking", "real-time",
-    "search", "google", "ใครคือ", "คือใคร", "คืออะไร", "ข้อมูล", "เหตุการณ์",
-    "เหตุผล", "ที่มา", "อันดับ", "สด", "เทรนด์", "ยอดนิยม", "เปิดตัว", "ประกาศ", "โปรแกรม",
-    "บอลวันนี้", "ผลบอล", "หวยออก", "หุ้น", "ดัชนี", "ชื่อเต็มของ", "update"
+    "ล่าสุด", "ข่าว", "breaking", "ผลบอล", "บอลวันนี้", "หวยออก", "หุ้น",
+]
+
+QUESTION_HINTS = ["คือ", "อะไร", "ใคร", "ยังไง", "เพราะอะไร", "ทำไม", "หรอ", "?"]
+
+ABOUT_BOT_WORDS = ["พี่หลาม", "bot", "บอท", "gpt", "คุณหลาม"]  # ต้องเป็นคำเต็ม (\b)
+ABOUT_BOT_SEQUENCES = [
+    (("ชื่อ",), ("บอท", "พี่หลาม")),
+    (("พี่หลาม", "บอท"), ("ทำงาน", "ตอบ", "เรียนรู้", "เกิด", "สร้าง", "มีชีวิต", "พูด", "รู้", "รู้จัก", "คือ")),
+    (("ใคร",), ("สร้าง", "เขียน", "ตั้งชื่อ")),
+]
+
+BOT_NAMES = ["พี่หลาม", "พรี่หลาม", "คุณหลาม", "gpt", "บอท"]
+
+# 🕒 คำที่ทำให้คำตอบเปลี่ยนตามเวลา
+TIME_SENSITIVE_KEYWORDS = [
+    "ล่าสุด", "วันนี้", "เมื่อวาน", "ตอนนี้", "อัปเดต", "ข่าว", "breaking", "real-time", "เหตุการณ์",
+    "อันดับ", "สด", "เทรนด์", "ยอดนิยม", "เปิดตัว", "ประกาศ", "โปรแกรม", "ผลบอล", "หวย", "หุ้น",
+    "ดัชนี", "update", "พรุ่งนี้", "มะรืน", "ปีนี้", "เดือนนี้", "สัปดาห์นี้", "อาทิตย์นี้", "คืนนี้", "เมื่อกี้",
+    "กี่โมง", "วันที่", "ราคา", "ตอนเช้า", "ปัจจุบัน", "today", "tomorrow", "now", "latest", "current",
+]
+
+# 👤 คำที่อ้างถึงผู้ถาม/บอท/บทสนทนาก่อนหน้า → คำตอบขึ้นกับบริบท แชร์ข้ามคนไม่ได้
+CONTEXT_KEYWORDS = [
+    "ฉัน", "ผม", "หนู", "เรา", "กู", "เค้า", "คุณ", "แก", "มึง", "เธอ",
+    "เมื่อกี๊", "ที่แล้ว", "ข้างบน", "อันนั้น", "อันนี้", "เรื่องนี้", "เรื่องนั้น",
+    "ต่อจาก", "อีกที", "อีกครั้ง", "แล้วไง", "ล่ะ", "มันคือ", "ช่วย", "แนะนำ",
+    # คำถามต่อเนื่อง/ชี้กลับไปที่ข้อความก่อนหน้า ("แปลว่าอะไร", "หมายถึงอะไร", "ข้อ 2 คือ")
+    "แปลว่า", "หมายถึง", "หมายความว่า", "ความหมาย", "ขยายความ", "อธิบายเพิ่ม", "ยกตัวอย่าง", "ตัวอย่าง",
+    "มัน", "นั่น", "นี่", "ตัวนั้น", "ตัวนี้", "ข้อนี้", "ข้อนั้น", "ข้อที่", "อันไหน", "ตรงไหน", "แบบนั้น", "แบบนี้", "ต่อเลย",
+]
+CONTEXT_WORDS = ["i", "me", "my", "we", "our", "you", "your", "it", "this", "that", "again", "mean", "meaning"]
+
+# 🤷 วลีที่บอกว่า GPT ไม่มั่นใจ → ควร fallback ไปค้น Google
+FALLBACK_PHRASES = [
+    "ไม่แน่ใจ", "ไม่ทราบ", "ไม่รู้", "ยังไม่รู้", "ไม่สามารถตอบได้",
+    "ไม่มีข้อมูล", "ขอโทษ", "ตอบไม่ได้", "หาไม่เจอ", "ไม่พบคำตอบ",
+    "ไม่สามารถให้ข้อมูลได้", "ยังไม่มีข้อมูล", "ไม่มีคำตอบที่แน่ชัด",
+    "ขอเวลาค้นหาก่อน", "ยังไม่มีข้อมูลแน่นอน", "ต้องค้นเพิ่มเติม",
+    "ไม่สามารถคาดการณ์", "คาดการณ์ไม่ได้", "เป็นไปไม่ได้ที่จะรู้แน่ชัด",
+    "หากมีข้อมูลใหม่จะมีการประกาศ", "เป็นเหตุการณ์ที่ไม่สามารถคาดเดาได้",
+    "ขึ้นอยู่กับข้อมูลในอนาคต", "อาจจะ", "น่าจะ", "เป็นไปได้ว่า",
+    "ไม่มีใครทราบแน่ชัด", "ไม่มีแหล่งข่าวยืนยัน", "ข้อมูลยังไม่สมบูรณ์",
+    "ขออภัย", "ขออภัยด้วยครับ", "เกรงว่าจะไม่มีข้อมูลในขณะนี้",
+    "จากข้อมูลที่มีในตอนนี้", "ไม่พบข้อมูลเพิ่มเติม", "ไม่มีข้อมูลล่าสุด",
+    "ยังไม่มีเหตุการณ์เกิดขึ้นจริง ๆ", "ยังไม่สามารถคาดเดาเหตุการณ์ในอนาคตได้",
+    "แนะนำให้ติดตามข่าวสาร", "แนะนำให้ติดตามข่าว", "แนะนำให้ติดตามสื่อมวลชน",
+    "ควรติดตามจากหน่วยงานที่เกี่ยวข้อง", "ลองตรวจสอบกับกรมอุตุนิยมวิทยา",
+    "ตรวจสอบเว็บไซต์ข่าว", "ยังไม่สามารถยืนยันได้แน่ชัด",
+    "ถ้ามีอะไรเพิ่มเติมที่อยากรู้ บอกได้เลย",
+]
+
+def _alternation(words: Sequence[str]) -> str:
+    return "|".join(re.escape(word) for word in words)
+
+def _sequence_regex(steps: Sequence[Sequence[str]]) -> str:
+    return ".*".join(f"({_alternation(words)})" if len(words) > 1 else re.escape(words[0]) for words in steps)
+
+def _sequence_rule(name: str, steps: Sequence[Sequence[str]], engine: KeywordEngine) -> SequenceRule:
+    """ลงทะเบียนคำของแต่ละ step ใน engine แล้วคืนกฎที่เช็กลำดับ"""
+    labels = []
+    for i, words in enumerate(steps):
+        label = f"{name}:{i}"
+        engine.add(words, label)
+        labels.append(label)
+    return SequenceRule(name, labels)
+
+# regex ชุดเดียวกับกฎด้านบน (สร้างจากข้อมูลชุดเดียวกัน) สำหรับโค้ดที่ยังใช้ re
+IMPORTANT_QUERIES = [_sequence_regex(steps) for steps in IMPORTANT_QUERY_SEQUENCES]
+ABOUT_BOT_PATTERNS = [
+    rf"\b({_alternation(ABOUT_BOT_WORDS)})\b",
+    *[_sequence_regex(steps) for steps in ABOUT_BOT_SEQUENCES],
 ]
 
+# ⚡ automaton เดียวสำหรับทุกกลุ่มคำ — สแกนข้อความรอบเดียวได้ทุกสัญญาณ
+KEYWORDS = KeywordEngine()
+KEYWORDS.add(COMMON_GREETINGS, "greeting")
+KEYWORDS.add(MUST_SEARCH_KEYWORDS, "must_search")
+KEYWORDS.add(QUESTION_HINTS, "question_hint")
+KEYWORDS.add(BOT_NAMES, "bot_name")
+KEYWORDS.add(FALLBACK_PHRASES, "fallback")
+KEYWORDS.add(TIME_SENSITIVE_KEYWORDS, "time_sensitive")
+KEYWORDS.add(CONTEXT_KEYWORDS, "context_ref")
+KEYWORDS.add(CONTEXT_WORDS, "context_ref", word_boundary=True)
+KEYWORDS.add(ABOUT_BOT_WORDS, "about_bot_word", word_boundary=True)
+IMPORTANT_QUERY_RULES = [_sequence_rule(f"important{i}", steps, KEYWORDS) for i, steps in enumerate(IMPORTANT_QUERY_SEQUENCES)]
+ABOUT_BOT_RULES = [_sequence_rule(f"about_bot{i}", steps, KEYWORDS) for i, steps in enumerate(ABOUT_BOT_SEQUENCES, start=1)]
+KEYWORDS.build()
+
+def scan_text(text: str) -> ScanResult:
+    return KEYWORDS.scan(text)
+
+def _is_greeting(scan: ScanResult) -> bool:
+    return scan.has("greeting")
+
+def _is_question(scan: ScanResult) -> bool:
+    return scan.has("question_hint")
+
+def _matches_important_query(scan: ScanResult) -> bool:
+    return any(scan.matches(rule) for rule in IMPORTANT_QUERY_RULES)
+
+def _is_about_bot(scan: ScanResult) -> bool:
+    return scan.has("about_bot_word") or any(scan.matches(rule) for rule in ABOUT_BOT_RULES)
+
 def is_greeting(text: str) -> bool:
-    return any(greet in text.lower() for greet in COMMON_GREETINGS)
+    return _is_greeting(scan_text(text))
 
 def is_question(text: str) -> bool:
-    QUESTION_HINTS = ["คือ", "อะไร", "ใคร", "ยังไง", "เพราะอะไร", "ทำไม", "หรอ", "?"]
-    return any(hint in text for hint in QUESTION_HINTS) or text.strip().endswith("?")
+    return _is_question(scan_text(text))
 
 def matches_important_query(text: str) -> bool:
-    return any(re.search(pattern, text) for pattern in IMPORTANT_QUERIES)
+    return _matches_important_query(scan_text(text))
 
 def remove_force_prefix(text: str) -> str:
-    for prefix in FORCE_SEARCH_PREFIXES:
-        if text.lower().startswith(prefix):
-            return text[len(prefix):].strip()
-    return text
+    return strip_force_prefix(text)
 
 def is_about_bot(text: str) -> bool:
-    patterns = [
-        r"\b(พี่หลาม|bot|บอท|gpt|คุณหลาม)\b",
-        r"ชื่อ.*(บอท|พี่หลาม)",
-        r"(พี่หลาม|บอท).*(ทำงาน|ตอบ|เรียนรู้|เกิด|สร้าง|มีชีวิต|พูด|รู้|รู้จัก|คือ)",
-        r"(ใคร.*(สร้าง|เขียน|ตั้งชื่อ))",
-    ]
-    text = text.lower()
-    return any(re.search(p, text) for p in patterns)
-
-async def needs_web_search(text: str) -> bool:
+    return _is_about_bot(scan_text(text))
+
+def has_fallback_phrase(text: str) -> bool:
+    return scan_text(text).has("fallback")
+
+# 🧭 เส้นทางก่อนเรียก GPT: search = ค้นก่อนตอบเลย, borderline = ค้นล่วงหน้าคู่กับ GPT, direct = GPT ตอบเอง
+ROUTE_SEARCH = "search"
+ROUTE_BORDERLINE = "borderline"
+ROUTE_DIRECT = "direct"
+
+_route_stats: Dict[str, int] = {
+    ROUTE_SEARCH: 0,
+    ROUTE_BORDERLINE: 0,
+    ROUTE_DIRECT: 0,
+    "fallback": 0,               # GPT ตอบแล้วไม่มั่นใจ ต้องค้นเพิ่ม
+    "prefetch_used": 0,          # fallback ได้ผลค้นที่ยิงไว้ล่วงหน้า
+    "prefetch_unused": 0,        # ยิงค้นล่วงหน้าแต่ GPT ตอบเองได้
+    "prefetch_skipped": 0,       # โควต้าเหลือน้อย ไม่ค้นล่วงหน้า
+    "completions_saved": 0,      # ข้าม completion แรกที่จะถูกทิ้ง
+}
+
+def classify_search_route(text: str) -> str:
     text = text.lower().strip()
+    scan = scan_text(text)
 
-    if is_greeting(text) or is_about_bot(text):
-        return False
+    if _is_greeting(scan) or _is_about_bot(scan):
+        return ROUTE_DIRECT
 
     if any(text.startswith(prefix) for prefix in FORCE_SEARCH_PREFIXES):
-        return True
+        return ROUTE_SEARCH
+
+    if _matches_important_query(scan) or scan.has("must_search"):
+        return ROUTE_SEARCH
+
+    if len(text.split()) <= 2 and not _is_question(scan):
+        return ROUTE_DIRECT
+
+    return ROUTE_BORDERLINE if _is_question(scan) else ROUTE_DIRECT
 
-    if matches_important_query(text):
-        return True
+async def needs_web_search(text: str) -> bool:
+    return classify_search_route(text) != ROUTE_DIRECT
 
-    if any(keyword in text for keyword in MUST_SEARCH_KEYWORDS):
-        return True
+def is_context_free_question(text: str) -> bool:
+    """คำถามความรู้ทั่วไปที่คำตอบไม่ขึ้นกับผู้ถาม ประวัติแชท หรือเวลา — แชร์คำตอบข้ามคนได้"""
+    text = text.lower().strip()
+    scan = scan_text(text)
 
-    if len(text.split()) <= 2 and not is_question(text):
+    if not _is_question(scan) or _is_greeting(scan) or _is_about_bot(scan) or scan.has("bot_name"):
         return False
+    if any(text.startswith(prefix) for prefix in FORCE_SEARCH_PREFIXES) or _matches_important_query(scan):
+        return False
+    return not (scan.has("time_sensitive") or scan.has("context_ref"))
+
+@dataclass
+class SearchPlan:
+    route: str
+    query: str
+    redis_instance: Optional[Redis] = None
+    prefetch: Optional[asyncio.Task] = None
+    used: bool = False
+
+    async def results(self, settings) -> List[Dict]:
+        self.used = True
+        if self.prefetch is not None:
+            try:
+                results = await self.prefetch
+                if results is not None:
+                    _route_stats["prefetch_used"] += 1
+                    return results
+            except Exception as e:
+                logger.warning(f"⚠️ ผลค้นล่วงหน้าใช้ไม่ได้ ค้นใหม่: {e}")
+        return await search_google(self.query, settings, self.redis_instance)
+
+    def close(self) -> None:
+        if self.prefetch is not None and not self.used:
+            _route_stats["prefetch_unused"] += 1
+            self.prefetch.cancel()
+
+async def _prefetch_search(query: str, settings, redis_instance: Optional[Redis]) -> Optional[List[Dict]]:
+    """ค้นล่วงหน้าแบบเดา (GPT อาจตอบเองได้) — โควต้าเหลือไม่เกิน GOOGLE_QUOTA_RESERVE ไม่ค้น คืน None"""
+    if redis_instance is not None:
+        try:
+            remaining = GOOGLE_DAILY_QUOTA - await get_search_quota_used(redis_instance)
+        except Exception as e:
+            logger.warning(f"⚠️ อ่านโควต้า Google ไม่ได้ ข้ามการค้นล่วงหน้า: {e}")
+            return None
+        if remaining <= GOOGLE_QUOTA_RESERVE:
+            _route_stats["prefetch_skipped"] += 1
+            return None
+    return await search_google(query, settings, redis_instance)
+
+def plan_web_search(messages: List[dict], settings, redis_instance: Optional[Redis] = None) -> SearchPlan:
+    """จัดเส้นทางจากคำถามล่าสุด ถ้า borderline ให้เริ่มค้น Google คู่ขนานไปกับ GPT เลย"""
+    text = messages[-1]["content"]
+    # คำถามที่เรียกชื่อบอทไม่เคยไปค้น Google (เหมือนเงื่อนไข fallback เดิม)
+    route = ROUTE_DIRECT if scan_text(text).has("bot_name") else classify_search_route(text)
+    plan = SearchPlan(route, remove_force_prefix(text.strip()), redis_instance)
+    _route_stats[plan.route] += 1
+    if plan.route == ROUTE_BORDERLINE:
+        plan.prefetch = asyncio.create_task(_prefetch_search(plan.query, settings, redis_instance))
+    logger.info(f"🧭 route={plan.route}: {plan.query}")
+    return plan
+
+def get_search_route_stats() -> Dict[str, int]:
+    return dict(_route_stats)
+
+def log_search_route_stats() -> None:
+    stats = _route_stats
+    logger.info(
+        f"🧭 search route: search={stats[ROUTE_SEARCH]} borderline={stats[ROUTE_BORDERLINE]} "
+        f"direct={stats[ROUTE_DIRECT]} fallback={stats['fallback']} prefetch_used={stats['prefetch_used']} "
+        f"prefetch_unused={stats['prefetch_unused']} prefetch_skipped={stats['prefetch_skipped']} "
+        f"completions_saved={stats['completions_saved']}"
+    )
+
+# ⚡ ส่งออกจาก stream_openai_response เมื่อข้อความที่ส่งไปแล้วต้องทิ้ง (fallback / retry)
+STREAM_RESET = object()
+
+def finalize_openai_text(content: str) -> str:
+    """ตัดลิงก์/แหล่งอ้างอิงที่ GPT แนบมา แล้วจัดรูปข้อความ (format ครั้งเดียวของคำตอบ GPT)"""
+    return format_reply(content, strip_links=True)
+
+# คำถามที่ต้องค้นแน่ ๆ บังคับเรียก search_google ตัวเดียว ("required" เฉย ๆ GPT อาจเลือก tool อื่นแทน)
+SEARCH_TOOL_CHOICE = {"type": "function", "function": {"name": "search_google"}}
+
+def _completion_options(use_tools: bool, require_tool: bool = False) -> Dict:
+    options = {
+        "max_tokens": 1800,
+        "temperature": 0.6,
+        "top_p": 1.0,
+        "frequency_penalty": 0.2,
+        "presence_penalty": 0.3,
+    }
+    if use_tools:
+        options.update(tools=TOOL_SCHEMAS, tool_choice=SEARCH_TOOL_CHOICE if require_tool else "auto", parallel_tool_calls=True)
+    return options
+
+def _note_plan(live_sources: Optional[Set[str]], plan: SearchPlan) -> None:
+    if live_sources is not None and plan.used:
+        live_sources.add("search")
+
+def _note_tools(live_sources: Optional[Set[str]], tool_calls: List[Dict]) -> None:
+    if live_sources is not None:
+        live_sources.update(call["function"]["name"] for call in tool_calls)
+
+def _log_usage(usage) -> None:
+    logger.info(f"🧮 Tokens | Input: {usage.prompt_tokens} | Output: {usage.completion_tokens} | Total: {usage.total_tokens}")
+
+async def _answer_with_web_fallback(messages: List[dict], settings, fallback_model: str, plan: SearchPlan) -> str:
+    """ค้น Google (หรือใช้ผลที่ค้นไว้ล่วงหน้า) แล้วให้ fallback model ตอบจากผลค้นหา"""
+    logger.info(f"🔍 ค้น Google ด้วย: {plan.query}")
+    raw_results = await plan.results(settings)
+    summarized_text = summarize_google_results(raw_results) or "ไม่พบผลการค้นหา"
+
+    # ✅ แนบผลค้นหาเป็น system message ก่อนคำถามล่าสุด (search model ไม่รับ role tool/function)
+    logger.info(f"🔁 Fallback with model {fallback_model}")
+    # persona/เวลาใน system message แรกต้องอยู่เสมอ ตามด้วยบทสนทนาล่าสุดไม่กี่ข้อความ
+    head = messages[:1] if messages[0]["role"] == "system" else []
+    fallback_messages = head + messages[max(len(head), len(messages) - 4):-1] + [
+        {"role": "system", "content": f"ผลค้นหา Google สำหรับ \"{plan.query}\":\n{summarized_text}"},
+        messages[-1],
+    ]
+
+    second_response = await create_chat_completion(
+        model=fallback_model,
+        messages=fallback_messages,
+        max_tokens=1500
+    )
 
-    return is_question(text)
+    _log_usage(second_response.usage)
+    logger.info("🧠 Fallback ตอบจาก Google แล้ว")
+    return second_response.choices[0].message.content.strip()
 
 async def get_openai_response(
     messages: List[dict],
@@ -82,91 +337,231 @@ async def get_openai_response(
     model="gpt-4o-mini",
     use_web_fallback=False,
     fallback_model="gpt-4o-mini-search-preview",
-    max_retries=3,
-    delay=5
+    max_retries=OPENAI_MAX_RETRIES,
+    redis_instance: Optional[Redis] = None,
+    use_tools=True,
+    live_sources: Optional[Set[str]] = None,
 ) -> Optional[str]:
-    fallback_phrases = [
-        "ไม่แน่ใจ", "ไม่ทราบ", "ไม่รู้", "ยังไม่รู้", "ไม่สามารถตอบได้",
-        "ไม่มีข้อมูล", "ขอโทษ", "ตอบไม่ได้", "หาไม่เจอ", "ไม่พบคำตอบ",
-        "ไม่สามารถให้ข้อมูลได้", "ยังไม่มีข้อมูล", "ไม่มีคำตอบที่แน่ชัด",
-        "ขอเวลาค้นหาก่อน", "ยังไม่มีข้อมูลแน่นอน", "ต้องค้นเพิ่มเติม",
-        "ไม่สามารถคาดการณ์", "คาดการณ์ไม่ได้", "เป็นไปไม่ได้ที่จะรู้แน่ชัด",
-        "หากมีข้อมูลใหม่จะมีการประกาศ", "เป็นเหตุการณ์ที่ไม่สามารถคาดเดาได้",
-        "ขึ้นอยู่กับข้อมูลในอนาคต", "อาจจะ", "น่าจะ", "เป็นไปได้ว่า",
-        "ไม่มีใครทราบแน่ชัด", "ไม่มีแหล่งข่าวยืนยัน", "ข้อมูลยังไม่สมบูรณ์",
-        "ขออภัย", "ขออภัยด้วยครับ", "เกรงว่าจะไม่มีข้อมูลในขณะนี้",
-        "จากข้อมูลที่มีในตอนนี้", "ไม่พบข้อมูลเพิ่มเติม", "ไม่มีข้อมูลล่าสุด",
-        "ยังไม่มีเหตุการณ์เกิดขึ้นจริง ๆ", "ยังไม่สามารถคาดเดาเหตุการณ์ในอนาคตได้",
-        "แนะนำให้ติดตามข่าวสาร", "แนะนำให้ติดตามข่าว", "แนะนำให้ติดตามสื่อมวลชน",
-        "ควรติดตามจากหน่วยงานที่เกี่ยวข้อง", "ลองตรวจสอบกับกรมอุตุนิยมวิทยา",
-        "ตรวจสอบเว็บไซต์ข่าว", "ยังไม่สามารถยืนยันได้แน่ชัด", 
-        "ถ้ามีอะไรเพิ่มเติมที่อยากรู้ บอกได้เลย",
-    ]
+    """
+    live_sources: ถ้าส่ง set มา จะถูกเติมชื่อแหล่งข้อมูลสดที่คำตอบนี้ใช้ ("search" = ผลค้น Google, ชื่อ tool ที่ GPT เรียก)
+    คำตอบที่มีแหล่งข้อมูลสดไม่ควรเก็บลง cache ที่แชร์ข้ามคนนาน ๆ
+    """
+    plan = plan_web_search(messages, settings, redis_instance) if use_web_fallback else None
+
+    try:
+        # ✅ คำถามที่ต้องค้นแน่ ๆ ไม่ต้องเสีย completion แรก: บังคับเรียก tool หรือไปทาง search เลย
+        force_search = plan is not None and plan.route == ROUTE_SEARCH
+        if force_search:
+            _route_stats["completions_saved"] += 1
+            if not use_tools:
+                try:
+                    return finalize_openai_text(await _answer_with_web_fallback(messages, settings, fallback_model, plan))
+                except (CircuitOpenError, OverloadedError):
+                    raise
+                except Exception as e:
+                    logger.error(f"❌ ตอบจากผลค้นหาไม่ได้ ให้ GPT ตอบเอง: {e}")
+
+        logger.info(f"🧠 using model {model}")
+        response = await create_chat_completion(
+            model=model,
+            messages=messages,
+            max_retries=max_retries,
+            **_completion_options(use_tools, require_tool=force_search),
+        )
+
+        # ✅ Log token usage
+        _log_usage(response.usage)
+
+        reply = response.choices[0].message
+        if reply.tool_calls:
+            # ✅ GPT ขอข้อมูลหลายอย่างในรอบเดียว → รันพร้อมกันแล้วตอบในรอบที่สอง
+            tool_calls = [call.model_dump() for call in reply.tool_calls]
+            _note_tools(live_sources, tool_calls)
+            tool_messages = await run_tool_calls(tool_calls, settings, redis_instance, plan)
+            response = await create_chat_completion(
+                model=model,
+                messages=messages + [tool_call_message(tool_calls, reply.content)] + tool_messages,
+                max_retries=max_retries,
+                **_completion_options(False),
+            )
+            _log_usage(response.usage)
+            return finalize_openai_text(response.choices[0].message.content.strip())
 
-    did_fallback = False
+        content = reply.content.strip()
+        response_text = content.lower()
 
+        if use_web_fallback and not force_search and has_fallback_phrase(response_text):
+            if scan_text(messages[-1]["content"]).has("bot_name"):
+                logger.info("🧠 เป็นคำถามเกี่ยวกับบอท ไม่ fallback ไปหา Google")
+            else:
+                _route_stats["fallback"] += 1
+                try:
+                    content = await _answer_with_web_fallback(messages, settings, fallback_model, plan)
+                except Exception as e:
+                    logger.error(f"❌ fallback ไป Google ไม่สำเร็จ ใช้คำตอบเดิม: {e}")
+        else:
+            logger.info("🧠 GPT ตอบเองได้ ไม่ต้อง fallback")
+
+        # ✅ Clean output text
+        return finalize_openai_text(content)
+
+    except CircuitOpenError:
+        logger.warning("🔌 OpenAI circuit เปิดอยู่ ตอบข้อความสำรองทันที")
+        return CIRCUIT_OPEN_REPLY
+    except OverloadedError as e:
+        logger.warning(f"🚦 ตัดคำขอทิ้งเพราะคิวแน่น: {e}")
+        return BUSY_REPLY
+    except Exception as e:
+        logger.error(f"❌ get_openai_response error: {e}")
+        return "⚠️ พี่หลามงงเลย ตอบไม่ได้จริง ๆ จ้า"
+    finally:
+        if plan:
+            _note_plan(live_sources, plan)
+            plan.close()
+
+async def stream_openai_response(
+    messages: List[dict],
+    settings,
+    model="gpt-4o-mini",
+    use_web_fallback=False,
+    fallback_model="gpt-4o-mini-search-preview",
+    max_retries=OPENAI_MAX_RETRIES,
+    redis_instance: Optional[Redis] = None,
+    use_tools=True,
+    live_sources: Optional[Set[str]] = None,
+) -> AsyncIterator[Union[str, object]]:
+    """
+    เหมือน get_openai_response แต่ทยอยคืนข้อความดิบ (ยังไม่ clean) ทีละชิ้นตามที่ GPT stream มา
+    ถ้าเจอวลีไม่มั่นใจกลางทาง จะตัด stream แล้วส่ง STREAM_RESET ตามด้วยคำตอบจาก Google
+    """
+    can_fallback = use_web_fallback and not scan_text(messages[-1]["content"]).has("bot_name")
+    plan = plan_web_search(messages, settings, redis_instance) if use_web_fallback else None
+
+    try:
+        async for delta in _stream_with_plan(
+            messages, settings, model, fallback_model, plan, can_fallback, max_retries, redis_instance, use_tools,
+            live_sources,
+        ):
+            yield delta
+    finally:
+        if plan:
+            _note_plan(live_sources, plan)
+            plan.close()
+
+async def _stream_text(stream) -> AsyncIterator[str]:
+    async for chunk in stream:
+        if chunk.usage:
+            _log_usage(chunk.usage)
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+async def _stream_with_plan(
+    messages, settings, model, fallback_model, plan, can_fallback, max_retries, redis_instance, use_tools, live_sources
+):
+    # ✅ คำถามที่ต้องค้นแน่ ๆ ไม่ต้องเสีย completion แรก: บังคับเรียก tool หรือไปทาง search เลย
+    force_search = plan is not None and plan.route == ROUTE_SEARCH and can_fallback
+    if force_search:
+        can_fallback = False
+        _route_stats["completions_saved"] += 1
+
+    # retry ตรงนี้เฉพาะ stream ที่เปิดได้แล้วขาดกลางทาง — การเปิด stream/เรียกซ้ำอื่น ๆ
+    # มี retry ใน create_chat_completion อยู่แล้ว ล้มตรงนั้นแปลว่าลองครบแล้ว ไม่วนซ้อนอีกชั้น
     for attempt in range(max_retries):
+        emitted = False
+        reading = False
         try:
-            logger.info(f"🔁 Attempt {attempt + 1}: using model {model}")
-            response = await openai_client.chat.completions.create(
+            if force_search and not use_tools:
+                yield await _answer_with_web_fallback(messages, settings, fallback_model, plan)
+                return
+
+            logger.info(f"🔁 Attempt {attempt + 1}: streaming model {model}")
+            stream = await create_chat_completion(
                 model=model,
                 messages=messages,
-                max_tokens=1800,
-                temperature=0.6,
-                top_p=1.0,
-                frequency_penalty=0.2,
-                presence_penalty=0.3,
+                stream=True,
+                stream_options={"include_usage": True},
+                **_completion_options(use_tools, require_tool=force_search),
             )
 
-            # ✅ Log token usage
-            logger.info(f"🧮 Tokens | Input: {response.usage.prompt_tokens} | Output: {response.usage.completion_tokens} | Total: {response.usage.total_tokens}")
-
-            content = response.choices[0].message.content.strip()
-            response_text = content.lower()
-
-            if use_web_fallback and not did_fallback and any(phrase in response_text for phrase in fallback_phrases):
-                query = messages[-1]["content"]
-                if any(botname in query.lower() for botname in ["พี่หลาม", "พรี่หลาม", "คุณหลาม", "gpt", "บอท"]):
-                    logger.info("🧠 เป็นคำถามเกี่ยวกับบอท ไม่ fallback ไปหา Google")
-                else:
-                    logger.info(f"🔍 GPT ไม่มั่นใจ, ค้น Google ด้วย: {query}")
-                    raw_results = await search_google(query, settings)
-                    summarized_text = summarize_google_results(raw_results)
-
-                    messages.append({
-                        "role": "function",
-                        "name": "search_google",
-                        "content": summarized_text
-                    })
-
-                    logger.info(f"🔁 Fallback with model {fallback_model}")
-                    did_fallback = True
-
-                    fallback_messages = messages[-5:]
-
-                    second_response = await openai_client.chat.completions.create(
-                        model=fallback_model,
-                        messages=fallback_messages,
-                        max_tokens=1500
-                    )
-
-                    logger.info(f"🧮 Tokens | Input: {second_response.usage.prompt_tokens} | Output: {second_response.usage.completion_tokens} | Total: {second_response.usage.total_tokens}")
-
-                    content = second_response.choices[0].message.content.strip()
-                    logger.info("🧠 Fallback ตอบจาก Google แล้ว")
-            else:
+            # ✅ สแกนวลี fallback ไปพร้อมกับ stream ไม่ต้องรอข้อความครบ
+            keywords = KEYWORDS.stream()
+            needs_fallback = False
+            streamed: List[str] = []
+            tool_calls: List[Dict] = []
+            reading = True
+            async for chunk in stream:
+                if chunk.usage:
+                    _log_usage(chunk.usage)
+                if not chunk.choices:
+                    continue
+                choice_delta = chunk.choices[0].delta
+                if choice_delta.tool_calls:
+                    merge_tool_call_deltas(tool_calls, choice_delta.tool_calls)
+                    continue
+                if not choice_delta.content:
+                    continue
+                delta = choice_delta.content
+                if can_fallback and not tool_calls and any(hit.label == "fallback" for hit in keywords.feed(delta)):
+                    needs_fallback = True
+                    await stream.close()
+                    break
+                emitted = True
+                streamed.append(delta)
+                yield delta
+            reading = False
+
+            if tool_calls:
+                # ✅ GPT ขอข้อมูลหลายอย่างในรอบเดียว → รันพร้อมกันแล้ว stream คำตอบรอบที่สอง
+                # ข้อความเกริ่นที่ stream ไปก่อนเรียก tool ถูกส่งกลับให้ GPT แล้ว ไม่ต้องค้างไว้บนหน้าจอ
+                if emitted:
+                    emitted = False
+                    yield STREAM_RESET
+                _note_tools(live_sources, tool_calls)
+                tool_messages = await run_tool_calls(tool_calls, settings, redis_instance, plan)
+                follow_up = await create_chat_completion(
+                    model=model,
+                    messages=messages + [tool_call_message(tool_calls, "".join(streamed) or None)] + tool_messages,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                    **_completion_options(False),
+                )
+                reading = True
+                async for delta in _stream_text(follow_up):
+                    emitted = True
+                    yield delta
+                return
+
+            if not needs_fallback:
                 logger.info("🧠 GPT ตอบเองได้ ไม่ต้อง fallback")
-
-            # ✅ Clean output text
-            content = re.sub(r"\[([^\[\]]+?)\]\((https?://[^\s\)]+)\)", r"\1", content)
-            content = re.sub(r"https?://\S+", "", content)
-            content = re.sub(r"📚 แหล่งอ้างอิง:\s*", "", content)
-            
-            return clean_output_text(content)
-
+                return
+
+            if emitted:
+                emitted = False
+                yield STREAM_RESET
+            can_fallback = False  # fallback ได้ครั้งเดียวเหมือน get_openai_response
+            _route_stats["fallback"] += 1
+            yield await _answer_with_web_fallback(messages, settings, fallback_model, plan)
+            return
+
+        except CircuitOpenError:
+            logger.warning("🔌 OpenAI circuit เปิดอยู่ ตอบข้อความสำรองทันที")
+            if emitted:
+                yield STREAM_RESET
+            yield CIRCUIT_OPEN_REPLY
+            return
+        except OverloadedError as e:
+            logger.warning(f"🚦 ตัดคำขอทิ้งเพราะคิวแน่น: {e}")
+            if emitted:
+                yield STREAM_RESET
+            yield BUSY_REPLY
+            return
         except Exception as e:
-            logger.error(f"❌ get_openai_response error: {e}")
-            await asyncio.sleep(delay)
+            logger.error(f"❌ stream_openai_response error: {e}")
+            if emitted:
+                yield STREAM_RESET
+            if not reading or not is_retryable(e):
+                break
+            await asyncio.sleep(backoff_delay(attempt))
 
     logger.error("⚠️ เกินจำนวน retry ที่กำหนดสำหรับ OpenAI API")
-    return "⚠️ พี่หลามงงเลย ตอบไม่ได้จริง ๆ จ้า"
\ No newline at end of file
+    yield "⚠️ พี่หลามงงเลย ตอบไม่ได้จริง ๆ จ้า"
@@ -0,0 +1,25 @@
+import re
+import unicodedata
+
+FORCE_SEARCH_PREFIXES = ["ค้นหา:", "หา:"]
+
+_ZERO_WIDTH = re.compile(r"[\u200b\u200c\u200d\u2060\ufeff]")
+_SPACES = re.compile(r"\s+")
+# ภาษาไทยไม่เว้นวรรคระหว่างคำ → "ราคา ทอง" กับ "ราคาทอง" คือคำค้นเดียวกัน
+_THAI_GAP = re.compile(r"(?<=[\u0e00-\u0e7f]) (?=[\u0e00-\u0e7f])")
+_TRAILING_PUNCT = re.compile(r"[\s?\uff1f!\uff01.\u3002]+$")
+
+def strip_force_prefix(text: str) -> str:
+    for prefix in FORCE_SEARCH_PREFIXES:
+        if text.lower().startswith(prefix):
+            return text[len(prefix):].strip()
+    return text
+
+def normalize_query(text: str) -> str:
+    """ทำคำค้นให้เป็นรูปเดียวกัน (ใช้เป็น cache key): NFC, ตัด zero-width, casefold, ยุบช่องว่าง"""
+    text = unicodedata.normalize("NFC", text)
+    text = _ZERO_WIDTH.sub("", text)
+    text = strip_force_prefix(text.strip())
+    text = _SPACES.sub(" ", text.casefold()).strip()
+    text = _THAI_GAP.sub("", text)
+    return _TRAILING_PUNCT.sub("", text)
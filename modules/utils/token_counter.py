@@ -1,21 +1,36 @@
+from functools import lru_cache
+
 import tiktoken
 
-# นับจำนวน token ที่ใช้ใน messages list
-def count_tokens(messages: list, model: str = "gpt-4o-mini") -> int:
+TOKENS_PER_MESSAGE = 3  # แต่ละ message มี overhead ประมาณ 3 token
+TOKENS_PER_NAME = 1     # ถ้ามี name= ใน message ต้องบวกเพิ่ม
+REPLY_PRIMING = 3       # เพิ่ม system prompt ตรง start / end
+
+# โหลด encoder ครั้งเดียวต่อ model (encoding_for_model ช้าถ้าเรียกทุกครั้ง)
+@lru_cache(maxsize=None)
+def get_encoding(model: str = "gpt-4o-mini"):
     try:
-        encoding = tiktoken.encoding_for_model(model)
+        return tiktoken.encoding_for_model(model)
     except KeyError:
-        encoding = tiktoken.get_encoding("cl100k_base")  # fallback encoding
+        return tiktoken.get_encoding("cl100k_base")  # fallback encoding
 
-    tokens_per_message = 3  # แต่ละ message มี overhead ประมาณ 3 token
-    tokens_per_name = 1     # ถ้ามี name= ใน message ต้องบวกเพิ่ม
+# ข้อความซ้ำ ๆ (system prompt, role) ไม่ต้อง encode ใหม่
+@lru_cache(maxsize=1024)
+def count_text_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    return len(get_encoding(model).encode(text))
 
-    num_tokens = 0
-    for message in messages:
-        num_tokens += tokens_per_message
-        for key, value in message.items():
-            num_tokens += len(encoding.encode(value))
-            if key == "name":
-                num_tokens += tokens_per_name
-    num_tokens += 3  # เพิ่ม system prompt ตรง start / end
-    return num_tokens
\ No newline at end of file
+def count_message_tokens(message: dict, model: str = "gpt-4o-mini") -> int:
+    num_tokens = TOKENS_PER_MESSAGE
+    for key, value in message.items():
+        num_tokens += count_text_tokens(value, model)
+        if key == "name":
+            num_tokens += TOKENS_PER_NAME
+    return num_tokens
+
+def message_tokens_from_content(role: str, content_tokens: int, model: str = "gpt-4o-mini") -> int:
+    """ต้นทุนของ message เมื่อรู้จำนวน token ของเนื้อหาอยู่แล้ว (ไม่ต้อง encode ซ้ำ)"""
+    return TOKENS_PER_MESSAGE + count_text_tokens(role, model) + content_tokens
+
+# นับจำนวน token ที่ใช้ใน messages list
+def count_tokens(messages: list, model: str = "gpt-4o-mini") -> int:
+    return sum(count_message_tokens(message, model) for message in messages) + REPLY_PRIMING